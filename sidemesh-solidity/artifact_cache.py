@@ -0,0 +1,255 @@
+"""
+Compact cache of the Truffle build artifacts
+
+A build/contracts/*.json artifact carries the AST, source maps, sources and
+compiler metadata next to the ABI and bytecode: NetworkTransactionManager
+is ~850 KB, of which the deploy tooling uses only `abi` and `bytecode`.
+load_artifact() parses a full artifact once, keeps just
+
+- abi and bytecode
+- events: event signature -> topic hash (keccak256 of the signature)
+- functions: function signature -> 4-byte selector
+
+and writes them to build/.artifact-cache/<Name>.json, stamped with the
+source artifact's size, mtime and sha256. Later loads read only the small
+file. A changed stamp with an unchanged sha256 (a fresh checkout) just
+restamps the entry; a changed artifact is re-extracted. Entries are loaded
+on first use and memoized, so tools that need two contracts never touch
+the other artifacts.
+
+keccak256 is implemented here in pure Python, so the cache adds no
+dependency; it only runs when an entry is (re)built.
+
+Usage:
+    python artifact_cache.py [Name ...]   # build entries, print selectors
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+ARTIFACTS_DIR = "./build/contracts"
+CACHE_DIR = "./build/.artifact-cache"
+CACHE_FORMAT = 1
+
+
+# ============================================================================
+# keccak256
+# ============================================================================
+
+_MASK = (1 << 64) - 1
+_ROUND_CONSTANTS = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+# _ROTATIONS[x][y]: rho offset of lane (x, y)
+_ROTATIONS = [
+    [0, 36, 3, 41, 18],
+    [1, 44, 10, 45, 2],
+    [62, 6, 43, 15, 61],
+    [28, 55, 25, 21, 56],
+    [27, 20, 39, 8, 14],
+]
+_RATE = 136  # bytes absorbed per permutation for a 256-bit output
+
+
+def _rotl(value: int, shift: int) -> int:
+    return ((value << shift) | (value >> (64 - shift))) & _MASK
+
+
+def _keccak_f(lanes: List[int]) -> List[int]:
+    """Keccak-f[1600] on 25 lanes indexed x + 5*y"""
+    for round_constant in _ROUND_CONSTANTS:
+        columns = [lanes[x] ^ lanes[x + 5] ^ lanes[x + 10] ^ lanes[x + 15] ^ lanes[x + 20]
+                   for x in range(5)]
+        theta = [columns[(x - 1) % 5] ^ _rotl(columns[(x + 1) % 5], 1) for x in range(5)]
+        lanes = [lane ^ theta[i % 5] for i, lane in enumerate(lanes)]
+        moved = [0] * 25
+        for x in range(5):
+            for y in range(5):
+                moved[y + 5 * ((2 * x + 3 * y) % 5)] = _rotl(lanes[x + 5 * y], _ROTATIONS[x][y])
+        lanes = [moved[i] ^ (~moved[(i + 1) % 5 + i - i % 5] & moved[(i + 2) % 5 + i - i % 5])
+                 for i in range(25)]
+        lanes[0] ^= round_constant
+    return lanes
+
+
+def keccak256(data: bytes) -> bytes:
+    """Ethereum's keccak256 (original Keccak padding, not SHA3-256)"""
+    padded = bytearray(data)
+    padded.append(0x01)
+    padded.extend(b"\x00" * (-len(padded) % _RATE))
+    padded[-1] |= 0x80
+    lanes = [0] * 25
+    for start in range(0, len(padded), _RATE):
+        block = padded[start:start + _RATE]
+        for i in range(_RATE // 8):
+            lanes[i] ^= int.from_bytes(block[8 * i:8 * i + 8], "little")
+        lanes = _keccak_f(lanes)
+    return b"".join(lane.to_bytes(8, "little") for lane in lanes[:4])
+
+
+# ============================================================================
+# ABI signatures
+# ============================================================================
+
+
+def canonical_type(param: Dict[str, Any]) -> str:
+    """ABI parameter type as it appears in a signature (tuples expanded)"""
+    param_type = param["type"]
+    if param_type.startswith("tuple"):
+        inner = ",".join(canonical_type(component) for component in param.get("components", []))
+        return f"({inner}){param_type[len('tuple'):]}"
+    return param_type
+
+
+def signature(entry: Dict[str, Any]) -> str:
+    return f"{entry['name']}({','.join(canonical_type(p) for p in entry.get('inputs', []))})"
+
+
+def event_topics(abi: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Event signature -> topic0 hash, for every non-anonymous event"""
+    return {signature(entry): "0x" + keccak256(signature(entry).encode("utf-8")).hex()
+            for entry in abi if entry.get("type") == "event" and not entry.get("anonymous")}
+
+
+def function_selectors(abi: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Function signature -> 4-byte selector"""
+    return {signature(entry): "0x" + keccak256(signature(entry).encode("utf-8"))[:4].hex()
+            for entry in abi if entry.get("type") == "function"}
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+
+class ArtifactCache:
+    """
+    Lazily built, memoized compact artifacts
+
+    Args:
+        artifacts_dir: Truffle build output (build/contracts)
+        cache_dir: Where compact entries are written
+    """
+
+    def __init__(self, artifacts_dir: str = ARTIFACTS_DIR, cache_dir: str = CACHE_DIR) -> None:
+        self.artifacts_dir = artifacts_dir
+        self.cache_dir = cache_dir
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self.rebuilt: List[str] = []
+
+    def get(self, name: str) -> Dict[str, Any]:
+        """
+        Compact artifact of contract `name`
+
+        Returns:
+            {"contractName", "abi", "bytecode", "events", "functions", "source"}
+
+        Raises:
+            FileNotFoundError: build/contracts/<name>.json does not exist
+        """
+        if name not in self._entries:
+            self._entries[name] = self._load(name)
+        return self._entries[name]
+
+    def _load(self, name: str) -> Dict[str, Any]:
+        source_path = os.path.join(self.artifacts_dir, f"{name}.json")
+        cache_path = os.path.join(self.cache_dir, f"{name}.json")
+        stat = os.stat(source_path)
+        entry = self._read_entry(cache_path)
+        if entry is not None:
+            source = entry["source"]
+            if source["size"] == stat.st_size and source["mtime_ns"] == stat.st_mtime_ns:
+                return entry
+
+        with open(source_path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry is None or entry["source"]["sha256"] != digest:
+            artifact = _loads(raw)
+            abi = artifact.get("abi") or []
+            entry = {
+                "format": CACHE_FORMAT,
+                "contractName": artifact.get("contractName", name),
+                "abi": abi,
+                "bytecode": artifact.get("bytecode") or "",
+                "events": event_topics(abi),
+                "functions": function_selectors(abi),
+            }
+            self.rebuilt.append(name)
+        entry["source"] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        self._write_entry(cache_path, entry)
+        return entry
+
+    @staticmethod
+    def _read_entry(cache_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(cache_path, "rb") as f:
+                entry = _loads(f.read())
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("format") == CACHE_FORMAT else None
+
+    def _write_entry(self, cache_path: str, entry: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{cache_path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️  Artifact cache not written ({cache_path}): {e}")
+
+
+_default_cache: Optional[ArtifactCache] = None
+
+
+def load_artifact(name: str) -> Dict[str, Any]:
+    """Compact artifact of contract `name` from the default cache"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ArtifactCache()
+    return _default_cache.get(name)
+
+
+# ============================================================================
+# Main Execution Flow
+# ============================================================================
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build compact artifact cache entries")
+    parser.add_argument("names", nargs="*",
+                        help="contract names (default: every artifact in build/contracts)")
+    options = parser.parse_args()
+    names = options.names or sorted(file_name[:-len(".json")]
+                                    for file_name in os.listdir(ARTIFACTS_DIR)
+                                    if file_name.endswith(".json"))
+    cache = ArtifactCache()
+    for name in names:
+        entry = cache.get(name)
+        size = os.path.getsize(os.path.join(CACHE_DIR, f"{name}.json"))
+        print(f"\n📦 {name}: {entry['source']['size'] / 1024:.0f} KB -> {size / 1024:.0f} KB"
+              f"{' (rebuilt)' if name in cache.rebuilt else ''}")
+        for event, topic in entry["events"].items():
+            print(f"    event    {topic}  {event}")
+        for function, selector in entry["functions"].items():
+            print(f"    function {selector}  {function}")
+
+
+if __name__ == "__main__":
+    main()
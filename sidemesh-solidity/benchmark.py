@@ -1,14 +1,33 @@
-import requests
+import argparse
 import json
 import time
 import asyncio
+import itertools
 import websockets
 import random
 import string
-import threading
-from typing import Dict, Any, Optional
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+import http_client
+import results
+from crosschain_client import docross_payload, encode_tx_id
+from event_decoder import DECODE_ERRORS, ChainEvent, decode_event
+from event_matcher import DUPLICATE, LATE, MATCHED, EventMatcher
+from http_client import ApiResponse, REQUEST_ERRORS
+from instrumentation import HarnessMonitor, print_harness_report, profiled
+from journal import EventJournal
+from latency_histogram import LatencyHistogram
+from load_generator import ARRIVAL_DISTRIBUTIONS, OpenLoopStats, closed_loop, open_loop
+from reconcile import RECONCILE_CLASSES, reconcile
+from tx_records import COMPLETED, FAILED, TIMEOUT, TxRecord
+
 MACHINE_IP = "http://192.168.88.219"
 
 PRIMARY_NETWORK_BASE_URL = "http://localhost:5000/api/v1"
@@ -19,21 +38,64 @@ NAMESPACE = "default"
 
 SIMPLE_STORAGE_CONTRACT_ADDRESS = "0x8838fee34f4110d374235853b0cafe1877205dd5"
 
+# HTTP connection pool shared by all doCross calls
+HTTP_POOL_SIZE = 200
+HTTP_PER_HOST_LIMIT = 0  # 0 = no per-host limit
+
+# Default offered load for open-loop runs
+DEFAULT_TARGET_COMPLETED = 2500
+DEFAULT_SEND_RATE = 10.0  # tx/s
+DEFAULT_ARRIVAL = "constant"
+
+# Seconds a transaction may stay pending before it is marked as timeout
+PENDING_TIMEOUT = 10
+
+# Transaction ids are TX_ID_PREFIX + 8 random characters. Worker processes
+# use their own prefix and ignore events whose key carries another one.
+TX_ID_PREFIX = "tx-"
+TX_KEY_PREFIX: Optional[str] = None  # hex of TX_ID_PREFIX while filtering
+
+# Keep the raw blockchain event of every Nth completed transaction
+# (0 keeps none); results carry them as "event_samples"
+EVENT_SAMPLE_EVERY = 0
+
+# Per-event/per-transaction console output (--verbose); otherwise the hot
+# path only writes to the journal and the console gets periodic aggregates
+VERBOSE = False
+PROGRESS_INTERVAL = 5  # seconds between aggregate lines while sending
+
+# Backoff between WebSocket reconnect attempts (seconds, doubling)
+WS_RECONNECT_INITIAL_DELAY = 0.5
+WS_RECONNECT_MAX_DELAY = 10.0
+
+# Per-transaction latency phases: name -> (start timestamp, end timestamp)
+LATENCY_PHASES = {
+    "schedule": ("intended_time", "http_send_time"),   # generator lag
+    "rest": ("http_send_time", "http_ack_time"),       # FireFly REST round trip
+    "confirm": ("http_ack_time", "end_time"),          # ack -> event received
+    "chain": ("http_ack_time", "event_created_time"),  # block inclusion + FireFly processing
+    "delivery": ("event_created_time", "end_time"),    # WebSocket delivery
+}
+SEND_PHASES = ("schedule", "rest")
+EVENT_PHASES = ("confirm", "chain", "delivery")
+
 # Global variables to track active WebSocket connections and transaction results
-network_ws_connection = None
-transaction_events: Dict[str, Dict[str, Any]] = {}
-# Thread-safe lock for transaction_events
-transaction_events_lock = threading.Lock()
+network_ws_connections: Dict[str, Any] = {}  # Open WebSocket per connection name
+# Pending/finished indices over every TxRecord of the run, used to match events
+event_matcher = EventMatcher("Changed")
+# End-to-end latency of completed transactions, recorded as they complete
+latency_histogram = LatencyHistogram()
+# One histogram per LATENCY_PHASES entry
+phase_histograms = {phase: LatencyHistogram() for phase in LATENCY_PHASES}
 benchmark_start_time = None
-transaction_completion_event = None
-current_tx_id = None
-current_args = None
 events_received_count = 0
-events_received_count_lock = threading.Lock()  # Thread-safe lock for counter
 last_event_time = time.time()
-last_event_time_lock = threading.Lock()  # Thread-safe lock for last_event_time
-ws_thread = None  # Reference to WebSocket listener thread
-ws_thread_stop_event = threading.Event()  # Event to signal thread to stop
+# One listener task per WebSocket connection, on the benchmark's own loop
+ws_listener_tasks: List[asyncio.Task] = []
+# Per-connection reconnect count, gap durations, replayed and duplicate events
+ws_connection_stats: Dict[str, Dict[str, Any]] = {}
+# Structured per-event/per-transaction records (disabled unless --journal)
+journal = EventJournal()
 
 
 def log_request(method: str, url: str, data: Optional[Dict] = None) -> None:
@@ -45,7 +107,7 @@ def log_request(method: str, url: str, data: Optional[Dict] = None) -> None:
         print(f"Body:\n{json.dumps(data, indent=2)}")
 
 
-def log_response(response: requests.Response) -> None:
+def log_response(response: ApiResponse) -> None:
     """Log API response details"""
     print(f"\n📥 Response ({response.status_code})")
     try:
@@ -54,6 +116,46 @@ def log_response(response: requests.Response) -> None:
         print(f"Body:\n{response.text}")
 
 
+def signal_completion(tx_info: TxRecord) -> None:
+    """
+    Resolve a transaction's completion future, if something waits on it,
+    with its terminal status name. Everything runs on one event loop, so
+    the waiter wakes on the loop's next iteration.
+    """
+    future = tx_info.completion
+    if future is not None and not future.done():
+        future.set_result(tx_info.status_name)
+
+
+def parse_firefly_time(value: Optional[str]) -> Optional[float]:
+    """Convert a FireFly RFC3339 (nanosecond) timestamp to epoch seconds"""
+    if not value:
+        return None
+    try:
+        value = value.replace("Z", "+00:00")
+        if "." in value:
+            # datetime only takes microseconds; drop the extra digits
+            head, _, rest = value.partition(".")
+            digits = len(rest) - len(rest.lstrip("0123456789"))
+            value = f"{head}.{rest[:min(digits, 6)]}{rest[digits:]}"
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def record_phase_latencies(tx_info: TxRecord, phases: tuple) -> None:
+    """
+    Record the given phases of a transaction into phase_histograms,
+    skipping any phase whose timestamps are not both known.
+    """
+    for phase in phases:
+        start_field, end_field = LATENCY_PHASES[phase]
+        start = getattr(tx_info, start_field)
+        end = getattr(tx_info, end_field)
+        if start is not None and end is not None:
+            phase_histograms[phase].record(max(0.0, end - start))
+
+
 def generate_random_args() -> bytes:
     """Generate random bytes args"""
     return bytes([random.randint(0, 255) for _ in range(2)])
@@ -61,246 +163,239 @@ def generate_random_args() -> bytes:
 
 def generate_random_tx_id() -> str:
     """Generate random transaction ID"""
-    return "tx-" + ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+    return TX_ID_PREFIX + ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
 
 
-async def handle_ws_event(event_data: Dict[str, Any], connection_name: str) -> None:
+def handle_ws_event(event: ChainEvent, connection_name: str) -> None:
     """
     Handle incoming WebSocket events and match with transactions
-    Thread-safe version that can be called from a separate thread
+    Runs synchronously on the benchmark loop, so no locking is needed
 
     Args:
-        event_data: Event data received from WebSocket
+        event: Decoded event frame (see event_decoder)
         connection_name: Name of the connection (Primary/Network)
     """
-    global transaction_events, events_received_count, last_event_time
-
-    event_type = event_data.get("type")
+    global events_received_count, last_event_time
 
-    # Thread-safe counter increment and timestamp update
-    with events_received_count_lock:
-        events_received_count += 1
-    with last_event_time_lock:
-        last_event_time = time.time()  # Update last_event_time when event arrives
+    event_type = event.type
+    output_key = event.key
 
-    print(
-        f"\n📥 [{connection_name}] Event #{events_received_count} received (type: {event_type})")
+    if TX_KEY_PREFIX is not None and output_key and not output_key.startswith(TX_KEY_PREFIX):
+        # Another worker's transaction (every worker subscribes to every
+        # event) that got past the decoder's substring check; not ours to
+        # count or match
+        return
 
-    if event_type == "blockchain_event_received":
-        blockchain_event = event_data.get("blockchainEvent", {})
-        output_key = blockchain_event.get("output", {}).get("key")
-        output_value = blockchain_event.get("output", {}).get("value")
-        event_name = blockchain_event.get("name")
+    # Counter increment and timestamp update
+    events_received_count += 1
+    if connection_name in ws_connection_stats:
+        ws_connection_stats[connection_name]["events"] += 1
+    last_event_time = time.time()  # Update last_event_time when event arrives
 
+    if VERBOSE:
         print(
-            f"   Event Details - Key: {output_key}, Value: {output_value}, Name: {event_name}")
-
-        # Thread-safe matching with transaction_events
-        matched = False
-        with transaction_events_lock:
-            # Try exact match first
-            if output_key in transaction_events:
-                tx_info = transaction_events[output_key]
-                if (tx_info.get("status") == "pending" and
-                    output_value == tx_info["args_hex"] and
-                        event_name == "Changed"):
-
-                    completion_time = time.time()
-                    elapsed = completion_time - \
-                        tx_info.get("start_time", benchmark_start_time)
-
-                    transaction_events[output_key]["status"] = "completed"
-                    transaction_events[output_key]["end_time"] = completion_time
-                    transaction_events[output_key]["elapsed_time"] = elapsed
-                    transaction_events[output_key]["event_data"] = blockchain_event
+            f"\n📥 [{connection_name}] Event #{events_received_count} received (type: {event_type})")
 
+    if event.is_blockchain_event:
+        output_value = event.value
+        event_name = event.name
+
+        if VERBOSE:
+            print(
+                f"   Event Details - Key: {output_key}, Value: {output_value}, Name: {event_name}")
+
+        # O(1) matching against the pending index
+        outcome, tx_info = event_matcher.match(
+            output_key, output_value, event_name)
+        if outcome == MATCHED:
+            tx_info.mark_end(time.time())
+            elapsed = tx_info.elapsed_time
+            if EVENT_SAMPLE_EVERY and event_matcher.outcomes[MATCHED] % EVENT_SAMPLE_EVERY == 0:
+                tx_info.event_data = event.blockchain_event
+            tx_info.event_created_time = parse_firefly_time(event.created)
+            tx_info.block_number = event.block_number
+            tx_info.tx_hash = event.tx_hash
+            latency_histogram.record(elapsed)
+            # If the doCross response is still outstanding, run_transaction
+            # records these phases once the ack arrives
+            if tx_info.http_ack_time is not None:
+                record_phase_latencies(tx_info, EVENT_PHASES)
+            signal_completion(tx_info)
+        else:
+            tx_status = tx_info.status_name if tx_info else None
+            if outcome == LATE and tx_info.late_event_time is None:
+                tx_info.late_event_time = time.time()
+            elif outcome == DUPLICATE and connection_name in ws_connection_stats:
+                stats = ws_connection_stats[connection_name]
+                # A replay redelivers an event matched before this connection's
+                # subscription restarted; anything else is a plain duplicate
+                reconnected_at = stats["reconnected_at"]
+                if reconnected_at is not None and tx_info.end_time is not None \
+                        and tx_info.end_time < reconnected_at:
+                    stats["replayed"] += 1
+                else:
+                    stats["duplicates"] += 1
+
+        if outcome == MATCHED:
+            journal.record("event_matched", connection_name,
+                           output_key, output_value, elapsed)
+            if VERBOSE:
+                print(
+                    f"\n✅ [{connection_name}] Transaction {output_key} completed!")
+                print(f"   Key (TxId): {output_key}")
+                print(f"   Value (Args): {output_value}")
+                print(f"   Elapsed Time: {elapsed:.4f}s")
+        else:
+            journal.record("event_unmatched", connection_name, output_key, output_value,
+                           detail={"outcome": outcome, "name": event_name, "status": tx_status})
+            if VERBOSE:
+                print(
+                    f"   ⚠️  Event received but no matching pending transaction found ({outcome})")
+                print(
+                    f"   Looking for Key: {output_key}, Value: {output_value}")
+                if tx_status:
                     print(
-                        f"\n✅ [{connection_name}] Transaction {output_key} completed!")
-                    print(f"   Key (TxId): {output_key}")
-                    print(f"   Value (Args): {output_value}")
-                    print(f"   Elapsed Time: {elapsed:.4f}s")
-                    matched = True
-
-            # If exact match failed, try iterating through all transactions (fallback)
-            if not matched:
-                for tx_id, tx_info in transaction_events.items():
-                    if (tx_info.get("status") == "pending" and
-                        output_key == tx_id and
-                        output_value == tx_info["args_hex"] and
-                            event_name == "Changed"):
-
-                        completion_time = time.time()
-                        elapsed = completion_time - \
-                            tx_info.get("start_time", benchmark_start_time)
-
-                        transaction_events[tx_id]["status"] = "completed"
-                        transaction_events[tx_id]["end_time"] = completion_time
-                        transaction_events[tx_id]["elapsed_time"] = elapsed
-                        transaction_events[tx_id]["event_data"] = blockchain_event
-
-                        print(
-                            f"\n✅ [{connection_name}] Transaction {tx_id} completed!")
-                        print(f"   Key (TxId): {output_key}")
-                        print(f"   Value (Args): {output_value}")
-                        print(f"   Elapsed Time: {elapsed:.4f}s")
-                        matched = True
-                        break
-
-            if not matched:
-                # Get a snapshot for debugging (still within lock)
-                all_tx_keys = list(transaction_events.keys())
-                pending_tx = [tx_id for tx_id, tx_info in transaction_events.items()
-                              if tx_info.get('status') == 'pending']
-
-        # Print debugging info outside the lock to avoid blocking
-        if not matched:
-            print(f"   ⚠️  Event received but no matching pending transaction found")
-            print(f"   Looking for Key: {output_key}, Value: {output_value}")
-            print(f"   All registered transactions: {all_tx_keys}")
-            print(f"   Pending transactions: {pending_tx}")
-
-            # Try to match with any transaction (even completed/failed) for debugging
-            with transaction_events_lock:
-                for tx_id, tx_info in transaction_events.items():
-                    if output_key == tx_id:
-                        print(
-                            f"   🔍 Found matching tx_id but status is: {tx_info.get('status')}")
-                    if output_value == tx_info.get("args_hex"):
-                        print(
-                            f"   🔍 Found matching args_hex in tx: {tx_id} (status: {tx_info.get('status')})")
-
-                # Try case-insensitive and format variations
-                output_key_lower = output_key.lower() if output_key else None
-                for tx_id, tx_info in transaction_events.items():
-                    tx_id_lower = tx_id.lower() if tx_id else None
-                    if output_key_lower and tx_id_lower and output_key_lower == tx_id_lower:
-                        print(
-                            f"   🔍 Case-insensitive match found: {tx_id} (status: {tx_info.get('status')})")
+                        f"   🔍 Found matching tx_id but status is: {tx_status}")
     else:
-        print(f"   Event Type: {event_type}")
+        journal.record("event_other", connection_name, detail=event_type)
+        if VERBOSE:
+            print(f"   Event Type: {event_type}")
+
+
+async def ws_receive_loop(websocket, connection_name: str) -> None:
+    """
+    Receive and handle messages until the connection closes.
+    Each message is handled as soon as it arrives; the loop never polls.
+    An abnormal close raises ConnectionClosed so the caller can reconnect.
+
+    Args:
+        websocket: Open WebSocket connection
+        connection_name: Name of the connection (for logging)
+    """
+    print(f"\n🔊 [{connection_name}] Listening for events...")
+    message_count = 0
+    async for message in websocket:
+        message_count += 1
+        if VERBOSE:
+            print(
+                f"\n📨 [{connection_name}] Raw message #{message_count} received (length: {len(message)} bytes)")
+
+        try:
+            # Frames for other workers' transactions are dropped unparsed, and so
+            # are other frame types unless the journal or verbose output logs them
+            event = decode_event(message, TX_KEY_PREFIX,
+                                 keep_other=VERBOSE or journal.enabled)
+        except DECODE_ERRORS as e:
+            journal.record("bad_message", connection_name,
+                           detail=message[:200])
+            print(
+                f"⚠️  [{connection_name}] Received non-JSON message: {message[:200]}...")
+            print(f"   JSON decode error: {e}")
+            continue
+        if event is None:
+            continue
+        try:
+            handle_ws_event(event, connection_name)
+        except Exception as e:
+            print(
+                f"⚠️  [{connection_name}] Error handling event: {e}")
+            import traceback
+            traceback.print_exc()
 
 
 async def ws_listen_and_send(ws_url: str, connection_name: str, send_events: Optional[list] = None) -> None:
     """
     Connect to WebSocket, send multiple events, and listen for responses
 
+    When the connection drops, reconnect with exponential backoff and
+    re-send the events (the subscription "start" messages). FireFly durable
+    subscriptions resume from the last acknowledged event, so events
+    emitted during the gap are delivered once the subscription restarts.
+    Reconnects, gap durations, replayed events (redelivered after a
+    reconnect), other duplicate events and the number of events delivered
+    over this connection are kept in
+    ws_connection_stats[connection_name]. Runs until the task is
+    cancelled (stop_listener).
+
     Args:
         ws_url: WebSocket URL to connect to
         connection_name: Name of the connection (for logging)
         send_events: List of events to send back-to-back
     """
-    global network_ws_connection
+    stats = ws_connection_stats.setdefault(
+        connection_name, {"events": 0, "reconnects": 0, "gaps": [], "replayed": 0,
+                          "duplicates": 0, "reconnected_at": None})
+    delay = WS_RECONNECT_INITIAL_DELAY
+    disconnected_at = None
 
-    try:
-        print(f"\n🔌 [{connection_name}] Attempting to connect to {ws_url}...")
-        async with websockets.connect(ws_url, ping_interval=20, ping_timeout=10) as websocket:
-            # Store connection reference
-            network_ws_connection = websocket
+    while True:
+        try:
+            print(f"\n🔌 [{connection_name}] Attempting to connect to {ws_url}...")
+            async with websockets.connect(ws_url, ping_interval=20, ping_timeout=10) as websocket:
+                # Store connection reference
+                network_ws_connections[connection_name] = websocket
 
-            print(f"\n✅ [{connection_name}] WebSocket connected to {ws_url}")
-            print(f"   Connection state: {websocket.state}")
+                print(f"\n✅ [{connection_name}] WebSocket connected to {ws_url}")
+                print(f"   Connection state: {websocket.state}")
 
-            # Send events back-to-back if provided
-            if send_events:
-                print(
-                    f"\n📤 [{connection_name}] Sending {len(send_events)} events...")
-                for idx, event in enumerate(send_events, 1):
-                    message = json.dumps(event)
-                    await websocket.send(message)
+                # Send events back-to-back if provided
+                if send_events:
                     print(
-                        f"📤 [{connection_name}] Event {idx}/{len(send_events)} Sent:\n{json.dumps(event, indent=2)}")
-                    await asyncio.sleep(0.1)  # Small delay between messages
-
-            # Keep connection open and listen for events
-            print(f"\n🔊 [{connection_name}] Listening for events...")
-            message_count = 0
-            try:
-                while True:
-                    try:
-                        # Use timeout to periodically check connection and yield to event loop
-                        message = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                        message_count += 1
-                        print(
-                            f"\n📨 [{connection_name}] Raw message #{message_count} received (length: {len(message)} bytes)")
-
-                        try:
-                            event = json.loads(message)
-                            print(f"   Parsed JSON successfully")
-                            await handle_ws_event(event, connection_name)
-                        except json.JSONDecodeError as e:
-                            print(
-                                f"⚠️  [{connection_name}] Received non-JSON message: {message[:200]}...")
-                            print(f"   JSON decode error: {e}")
-                        except Exception as e:
+                        f"\n📤 [{connection_name}] Sending {len(send_events)} events...")
+                    for idx, event in enumerate(send_events, 1):
+                        message = json.dumps(event)
+                        await websocket.send(message)
+                        journal.record("ws_sent", connection_name,
+                                       detail=message)
+                        if VERBOSE:
                             print(
-                                f"⚠️  [{connection_name}] Error handling event: {e}")
-                            import traceback
-                            traceback.print_exc()
-
-                    except asyncio.TimeoutError:
-                        # Timeout is normal - just yield to event loop and continue
-                        # This allows other tasks to run and keeps the connection alive
-                        # Print heartbeat every 30 seconds to confirm listener is alive
-                        if message_count == 0 and int(time.time()) % 30 == 0:
-                            print(
-                                f"💓 [{connection_name}] WebSocket listener alive, waiting for messages... (no messages received yet)")
-                        await asyncio.sleep(0.1)
-                        continue
-                    except asyncio.CancelledError:
-                        # Task was cancelled - break out of loop
-                        print(
-                            f"\n🛑 [{connection_name}] WebSocket listener cancelled")
-                        raise  # Re-raise to be caught by outer handler
-                    except websockets.exceptions.ConnectionClosed as e:
-                        print(
-                            f"\n⚠️  [{connection_name}] WebSocket connection closed: {e}")
-                        break
-                    except Exception as e:
-                        print(
-                            f"\n❌ [{connection_name}] Unexpected error receiving message: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        # Continue listening unless it's a fatal error
-                        await asyncio.sleep(0.1)
-                        continue
-
-            except asyncio.CancelledError:
-                print(
-                    f"\n🛑 [{connection_name}] WebSocket listener task cancelled")
-                raise  # Re-raise to allow proper cleanup
-            except websockets.exceptions.ConnectionClosed as e:
-                print(
-                    f"\n⚠️  [{connection_name}] WebSocket connection closed: {e}")
-            except Exception as e:
-                print(f"\n❌ [{connection_name}] Error in message loop: {e}")
-                import traceback
-                traceback.print_exc()
-
-    except websockets.exceptions.InvalidURI as e:
-        print(f"❌ [{connection_name}] Invalid WebSocket URI: {e}")
-        raise
-    except websockets.exceptions.ConnectionClosed as e:
-        print(f"❌ [{connection_name}] Connection closed during setup: {e}")
-        raise
-    except Exception as e:
-        print(f"❌ [{connection_name}] WebSocket Error: {e}")
-        import traceback
-        traceback.print_exc()
-        raise
-    finally:
-        network_ws_connection = None
-        print(f"🔌 [{connection_name}] WebSocket connection closed and cleaned up")
+                                f"📤 [{connection_name}] Event {idx}/{len(send_events)} Sent:\n{json.dumps(event, indent=2)}")
+                        await asyncio.sleep(0.1)  # Small delay between messages
+
+                if disconnected_at is not None:
+                    gap = time.time() - disconnected_at
+                    stats["reconnects"] += 1
+                    stats["gaps"].append(gap)
+                    stats["reconnected_at"] = time.time()
+                    disconnected_at = None
+                    print(
+                        f"🔁 [{connection_name}] Reconnected after {gap:.2f}s, subscription restarted")
+                delay = WS_RECONNECT_INITIAL_DELAY
+
+                await ws_receive_loop(websocket, connection_name)
+                print(f"\n⚠️  [{connection_name}] WebSocket closed by server")
+
+        except asyncio.CancelledError:
+            print(
+                f"\n🛑 [{connection_name}] WebSocket listener task cancelled")
+            print(
+                f"🔌 [{connection_name}] WebSocket connection closed and cleaned up")
+            raise  # Re-raise to allow proper cleanup
+        except websockets.exceptions.InvalidURI as e:
+            print(f"❌ [{connection_name}] Invalid WebSocket URI: {e}")
+            raise
+        except (websockets.exceptions.WebSocketException, OSError, asyncio.TimeoutError) as e:
+            print(
+                f"\n⚠️  [{connection_name}] WebSocket connection lost: {e}")
+        finally:
+            network_ws_connections.pop(connection_name, None)
 
+        if disconnected_at is None:
+            disconnected_at = time.time()
+        print(f"🔁 [{connection_name}] Reconnecting in {delay:.1f}s...")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, WS_RECONNECT_MAX_DELAY)
 
-def api_call(
+
+async def api_call(
     base_url: str,
     method: str,
     endpoint: str,
     data: Optional[Dict] = None,
     params: Optional[Dict] = None,
-) -> requests.Response:
+) -> ApiResponse:
     """
-    Make an API call and handle errors
+    Make an API call over the shared connection pool and handle errors
 
     Args:
         method: HTTP method (GET, POST, DELETE)
@@ -312,420 +407,825 @@ def api_call(
         Response object
     """
     url = f"{base_url}{endpoint}"
-    headers = {"Content-Type": "application/json"}
 
     # log_request(method, url, data)
 
     try:
-        if method == "GET":
-            response = requests.get(url, headers=headers, params=params)
-        elif method == "POST":
-            response = requests.post(
-                url, json=data, headers=headers, params=params)
-        elif method == "DELETE":
-            response = requests.delete(url, headers=headers)
-        else:
+        if method not in ("GET", "POST", "DELETE"):
             raise ValueError(f"Unsupported HTTP method: {method}")
 
+        response = await http_client.get_client().request(
+            method, url, data=data, params=params)
+
         if response.status_code >= 400:
             log_response(response)
         response.raise_for_status()
         return response
 
-    except requests.exceptions.RequestException as e:
+    except REQUEST_ERRORS as e:
         print(f"\n❌ Error: {e}")
         raise
 
 
-def doCross(tx_id: str, args: bytes) -> None:
+async def doCross(tx_id: str, args: bytes) -> Dict[str, Any]:
     """
     Endpoint: POST /namespaces/{namespace}/apis/cross-chain/invoke/doCross
     Send two args as hex strings: first is tx_id, second is random arg
     """
+    payload = docross_payload(tx_id, args)
 
-    print(f"\n📤 Sending doCross - TxId: {tx_id}, Args: {args.hex()}")
-
-    # Convert tx_id and args to hex representation
-    tx_id_hex = '0x' + tx_id.encode('utf-8').hex()
-    args_hex = '0x' + args.hex()
-
-    print(f"   TxId (hex): {tx_id_hex}")
-    print(f"   Args (hex): {args_hex}")
-
-    payload = {
-        "input": {
-            "args": [tx_id_hex, args_hex],  # Two hex arguments
-            "invocationId": "iv-1",
-            "networkId": "20",
-            "primaryNetworkId": "10",
-            "txId": tx_id
-        }
-    }
+    if VERBOSE:
+        tx_id_hex, args_hex = payload["input"]["args"]
+        print(f"\n📤 Sending doCross - TxId: {tx_id}, Args: {args.hex()}")
+        print(f"   TxId (hex): {tx_id_hex}")
+        print(f"   Args (hex): {args_hex}")
 
-    response = api_call(
+    response = await api_call(
         PRIMARY_NETWORK_BASE_URL, "POST", f"/namespaces/{NAMESPACE}/apis/cross-chain/invoke/doCross", payload)
     data = response.json()
     return data
 
 
-async def run_transaction(tx_id: str, args: bytes) -> None:
+async def run_transaction(tx_id: str, args: bytes, intended_time: Optional[float] = None,
+                          track_completion: bool = False) -> str:
     """
     Run a single transaction and track it
-    Thread-safe version
+
+    Besides start/end, the record keeps the timestamps for every
+    LATENCY_PHASES entry and the FireFly operation id of the doCross call.
 
     Args:
         tx_id: Transaction ID
         args: Random bytes arguments
+        intended_time: Time the load generator scheduled this send for
+        track_completion: Give the record a completion future, for callers
+            that go on to wait_for_completion()
+
+    Returns:
+        Hex transaction key the transaction is registered under
     """
     # Record transaction start BEFORE making the API call
     # This ensures the transaction is registered before events can arrive
     args_hex = '0x' + args.hex()
-    tx_id_hex = '0x' + tx_id.encode('utf-8').hex()
+    tx_id_hex = encode_tx_id(tx_id)
 
-    # Thread-safe registration
-    with transaction_events_lock:
-        transaction_events[tx_id_hex] = {
-            "status": "pending",
-            "args": args,
-            "args_hex": args_hex,
-            "start_time": time.time(),
-            "end_time": None,
-            "elapsed_time": None,
-            "event_data": None
-        }
+    start_time = time.time()
 
-    print(f"📝 Registered transaction {tx_id_hex} with args {args_hex}")
+    # Registration is synchronous on the one loop, so it is complete
+    # before any event for this transaction can be handled
+    completion = asyncio.get_running_loop().create_future() if track_completion else None
+    tx_info = TxRecord(args_hex, len(args), start_time, intended_time, completion)
+    event_matcher.register(tx_id_hex, tx_info,
+                           deadline=start_time + PENDING_TIMEOUT)
 
-    # Small yield to ensure registration is complete
-    await asyncio.sleep(0.001)
+    journal.record("registered", tx=tx_id_hex, value=args_hex)
+    if VERBOSE:
+        print(f"📝 Registered transaction {tx_id_hex} with args {args_hex}")
 
     try:
-        # Run the blocking API call in a thread pool to avoid blocking the event loop
-        # This allows WebSocket events to be processed while waiting for the HTTP response
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, doCross, tx_id, args)
-        print(f"✅ doCross API call successful for {tx_id}")
+        # Non-blocking call over the pooled keep-alive client; no executor
+        # thread or fresh TCP handshake per transaction
+        http_send_time = time.time()
+        operation = await doCross(tx_id, args)
+        http_ack_time = time.time()
+
+        tx_info.http_send_time = http_send_time
+        tx_info.http_ack_time = http_ack_time
+        tx_info.operation_id = operation.get(
+            "id") if isinstance(operation, dict) else None
+        record_phase_latencies(tx_info, SEND_PHASES)
+        if tx_info.status == COMPLETED:
+            # Event beat the HTTP response
+            record_phase_latencies(tx_info, EVENT_PHASES)
+
+        journal.record("sent", tx=tx_id_hex,
+                       elapsed=http_ack_time - http_send_time)
+        if VERBOSE:
+            print(f"✅ doCross API call successful for {tx_id}")
         # Yield to event loop to allow WebSocket events to be processed
         await asyncio.sleep(0)
     except Exception as e:
-        print(f"⚠️  Error in doCross for {tx_id}: {e}")
-        with transaction_events_lock:
-            if tx_id_hex in transaction_events:
-                transaction_events[tx_id_hex]["status"] = "failed"
+        journal.record("send_failed", tx=tx_id_hex, detail=str(e))
+        if VERBOSE:
+            print(f"⚠️  Error in doCross for {tx_id}: {e}")
+        if event_matcher.finish(tx_id_hex, FAILED) is not None:
+            signal_completion(tx_info)
 
+    return tx_id_hex
 
-async def run_benchmark(num_transactions: int):
+
+async def wait_for_completion(tx_id_hex: str, timeout: float) -> str:
+    """
+    Wait until a transaction reaches a terminal status, marking it as
+    timeout if it is still pending `timeout` seconds after it started
+
+    Returns:
+        Terminal status (completed, failed or timeout)
+    """
+    tx_info = event_matcher.get(tx_id_hex)
+    remaining = tx_info.start_time + timeout - time.time()
+
+    try:
+        return await asyncio.wait_for(asyncio.shield(tx_info.completion), max(0.0, remaining))
+    except asyncio.TimeoutError:
+        current_time = time.time()
+        if event_matcher.finish(tx_id_hex, TIMEOUT) is not None:
+            tx_info.mark_end(current_time)
+            signal_completion(tx_info)
+        return tx_info.status_name
+
+
+async def report_send_progress(get_sent, transactions_to_send: Optional[int],
+                               interval: float = PROGRESS_INTERVAL) -> None:
+    """
+    Print one aggregate line every `interval` seconds while sending
+
+    Replaces the per-transaction console output in quiet mode.
+
+    Args:
+        get_sent: Callable returning the number of transactions sent so far
+        transactions_to_send: Total number of transactions the run will
+            send (None for a fixed-duration run)
+        interval: Seconds between lines
+    """
+    last_sent = get_sent()
+    last_time = time.time()
+    while True:
+        await asyncio.sleep(interval)
+        now = time.time()
+        sent = get_sent()
+        status_counts = dict(event_matcher.status_counts)
+        events_count = events_received_count
+        total = f"/{transactions_to_send}" if transactions_to_send is not None else ""
+        print(f"📊 Sent {sent}{total} ({(sent - last_sent) / (now - last_time):.1f} tx/s)  "
+              f"completed {status_counts.get('completed', 0)}  pending {status_counts.get('pending', 0)}  "
+              f"failed {status_counts.get('failed', 0)}  timeout {status_counts.get('timeout', 0)}  "
+              f"events {events_count}")
+        last_sent, last_time = sent, now
+
+
+async def run_benchmark(num_transactions: int, rate: float = DEFAULT_SEND_RATE,
+                        arrival: str = DEFAULT_ARRIVAL, seed: Optional[int] = None,
+                        concurrency: Optional[int] = None,
+                        histogram_out: Optional[str] = None,
+                        reconcile_unresolved: bool = True,
+                        report: bool = True,
+                        duration: Optional[float] = None) -> Dict[str, Any]:
     """
     Run benchmark until we get num_transactions completed transactions.
     Sends 20% more transactions to account for event drop rate.
 
+    By default transactions are sent open-loop: each send is released at an
+    absolute deadline derived from the target rate, independent of how long
+    earlier doCross calls take. With `concurrency` set, the run is
+    closed-loop instead: exactly that many transactions are kept in flight,
+    and each slot sends its next one only when the previous one's Changed
+    event arrives or it times out.
+
+    With `duration` set, sending stops after that many seconds instead of
+    after a fixed number of transactions, and the run ends once every sent
+    transaction has completed, failed or timed out.
+
     Args:
         num_transactions: Target number of completed transactions needed
+        rate: Offered load in transactions per second (open-loop)
+        arrival: Inter-arrival distribution ("constant" or "poisson")
+        seed: Random seed for Poisson inter-arrival gaps
+        concurrency: Transactions in flight for a closed-loop run
+        histogram_out: Path to save the latency histogram to (JSON)
+        reconcile_unresolved: After the run, look up what happened on chain
+            to every timed-out or failed transaction
+        report: Print the results (worker processes leave that to the
+            coordinator)
+        duration: Send for this many seconds (num_transactions is then
+            only reported, not waited for)
+
+    Returns:
+        Run results (see collect_results)
     """
-    global benchmark_start_time, transaction_events, events_received_count, last_event_time, ws_thread
-
-    # Thread-safe initialization
-    with transaction_events_lock:
-        transaction_events.clear()
-    with events_received_count_lock:
-        events_received_count = 0
-    with last_event_time_lock:
-        last_event_time = time.time()
+    global benchmark_start_time, events_received_count, last_event_time, latency_histogram, phase_histograms
+
+    event_matcher.clear()
+    latency_histogram = LatencyHistogram()
+    phase_histograms = {phase: LatencyHistogram()
+                        for phase in LATENCY_PHASES}
+    events_received_count = 0
+    last_event_time = time.time()
     benchmark_start_time = time.time()
 
     # Calculate transactions to send (20% more to account for drop rate)
-    transactions_to_send = int(num_transactions * 1.25)
+    transactions_to_send = int(
+        num_transactions * 1.25) if duration is None else None
 
     print(f"\n\n{'='*80}")
     print(
         f"🚀 Starting Benchmark")
-    print(f"  Target Completed: {num_transactions} transactions")
-    print(
-        f"  Sending: {transactions_to_send} transactions (20% extra for drop rate)")
+    if duration is None:
+        print(f"  Target Completed: {num_transactions} transactions")
+        print(
+            f"  Sending: {transactions_to_send} transactions (20% extra for drop rate)")
+    else:
+        print(f"  Duration: {duration:.1f}s")
+    if concurrency:
+        print(f"  Closed Loop: {concurrency} transactions in flight")
+    else:
+        print(f"  Offered Load: {rate:.2f} tx/s ({arrival} arrivals)")
     print(f"{'='*80}")
     print(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
+    # Measures the client itself: loop lag, CPU/RSS, queue depths
+    harness_monitor = HarnessMonitor({"journal": journal.backlog}).start()
+
     # Create tasks for all transactions
     tasks = []
     sent_count = 0
-    pending_timeout = 10  # seconds
+    pending_timeout = PENDING_TIMEOUT
     event_silence_timeout = 180  # If no events for 180s, consider connection stalled
 
-    while sent_count < transactions_to_send:
-        tx_id = generate_random_tx_id()
-        args = generate_random_args()
-        task = asyncio.create_task(run_transaction(tx_id, args))
-        tasks.append(task)
-        sent_count += 1
+    send_stats = OpenLoopStats()
+    rng = random.Random(seed) if seed is not None else None
+
+    progress_task = None
+    if not VERBOSE:
+        progress_task = asyncio.create_task(
+            report_send_progress(lambda: sent_count, transactions_to_send))
+
+    if concurrency:
+        async def run_slot_transaction(_index: int) -> None:
+            nonlocal sent_count
+            tx_id = generate_random_tx_id()
+            args = generate_random_args()
+            sent_count += 1
+            if VERBOSE:
+                print(
+                    f"📤 Sent transaction {sent_count}/{transactions_to_send}")
+            tx_id_hex = await run_transaction(tx_id, args, time.time(), track_completion=True)
+            await wait_for_completion(tx_id_hex, pending_timeout)
 
-        print(f"📤 Sent transaction {sent_count}/{transactions_to_send}")
+        send_phase_start = time.time()
+        await closed_loop(transactions_to_send, concurrency, run_slot_transaction, duration)
+        send_phase_time = time.time() - send_phase_start
+        print(
+            f"\n📤 Send phase done: {sent_count} transactions in {send_phase_time:.2f}s "
+            f"with {concurrency} in flight")
+    else:
+        async for _, intended_time in open_loop(transactions_to_send, rate, arrival, rng, send_stats,
+                                                duration):
+            tx_id = generate_random_tx_id()
+            args = generate_random_args()
+            task = asyncio.create_task(
+                run_transaction(tx_id, args, intended_time))
+            tasks.append(task)
+            sent_count += 1
+
+            if VERBOSE:
+                print(
+                    f"📤 Sent transaction {sent_count}/{transactions_to_send}")
 
-        # Small delay between API calls
-        await asyncio.sleep(0.1)
+        print(
+            f"\n📤 Send phase done: {send_stats.achieved_rate:.2f} tx/s achieved (target {rate:.2f}), "
+            f"schedule lag avg {send_stats.avg_lag * 1000:.1f}ms / max {send_stats.max_lag * 1000:.1f}ms")
 
     # Wait for all API calls to complete
     await asyncio.gather(*tasks)
+    if progress_task is not None:
+        progress_task.cancel()
 
     # Monitor pending transactions and mark as failed if they exceed timeout
     print(f"\n⏳ Waiting for transactions to complete...")
-    print(f"   Registered {len(transaction_events)} transactions")
+    print(f"   Registered {len(event_matcher)} transactions")
     start_wait = time.time()
     overall_timeout = 6000  # 10 minutes total timeout
     check_interval = 1
     last_status_print = 0
 
     while True:
-        # Thread-safe access to transaction_events
-        with transaction_events_lock:
-            completed = [tx for tx in transaction_events.values()
-                         if tx["status"] == "completed"]
-            pending = [tx for tx in transaction_events.values()
-                       if tx["status"] == "pending"]
+        # Incrementally maintained counts; no scan of the records
+        completed_count = event_matcher.status_counts["completed"]
+        pending_count = event_matcher.status_counts["pending"]
 
         # Check if we've reached target completed transactions
-        if len(completed) >= num_transactions:
+        if duration is None and completed_count >= num_transactions:
+            print(
+                f"\n✅ Reached target! {completed_count} transactions completed (target was {num_transactions}).")
+            break
+        if duration is not None and not pending_count:
             print(
-                f"\n✅ Reached target! {len(completed)} transactions completed (target was {num_transactions}).")
+                f"\n✅ All {sent_count} transactions resolved ({completed_count} completed).")
             break
 
         elapsed_overall = time.time() - start_wait
 
-        # Check for event silence (no new events arriving) - thread-safe
+        # Check for event silence (no new events arriving)
         current_time = time.time()
-        with last_event_time_lock:
-            time_since_last_event = current_time - last_event_time
+        time_since_last_event = current_time - last_event_time
 
-        if time_since_last_event > event_silence_timeout and pending:
+        if time_since_last_event > event_silence_timeout and pending_count:
             print(
-                f"\n⚠️  No events received for {event_silence_timeout}s. {len(pending)} transactions still pending.")
+                f"\n⚠️  No events received for {event_silence_timeout}s. {pending_count} transactions still pending.")
             print(f"   Events received so far: {events_received_count}")
-            print(f"   Expected: {num_transactions}, Got: {len(completed)}")
+            print(f"   Expected: {num_transactions if duration is None else sent_count}, "
+                  f"Got: {completed_count}")
             print(
-                f"   Marking {len(pending)} pending transactions as timeout...")
-
-            # Mark all remaining pending as timeout (thread-safe)
-            with transaction_events_lock:
-                for tx_id, tx_info in list(transaction_events.items()):
-                    if tx_info["status"] == "pending":
-                        tx_info["status"] = "timeout"
-                        tx_info["end_time"] = current_time
-                        tx_info["elapsed_time"] = current_time - \
-                            tx_info.get("start_time", benchmark_start_time)
+                f"   Marking {pending_count} pending transactions as timeout...")
+
+            # Mark all remaining pending as timeout
+            for tx_id, tx_info in event_matcher.expire_all():
+                tx_info.mark_end(current_time)
+                signal_completion(tx_info)
             break
 
         if elapsed_overall > overall_timeout:
             print(
-                f"⚠️  Overall timeout reached. {len(completed)} completed, {len(pending)} still pending.")
-            # Mark all remaining pending as timeout (thread-safe)
-            with transaction_events_lock:
-                for tx_id, tx_info in list(transaction_events.items()):
-                    if tx_info["status"] == "pending":
-                        tx_info["status"] = "timeout"
-                        tx_info["end_time"] = current_time
-                        tx_info["elapsed_time"] = current_time - \
-                            tx_info.get("start_time", benchmark_start_time)
+                f"⚠️  Overall timeout reached. {completed_count} completed, {pending_count} still pending.")
+            # Mark all remaining pending as timeout
+            for tx_id, tx_info in event_matcher.expire_all():
+                tx_info.mark_end(current_time)
+                signal_completion(tx_info)
             break
 
-        # Check for transactions that have been pending for too long (thread-safe)
-        timeout_count = 0
-        with transaction_events_lock:
-            for tx_id, tx_info in list(transaction_events.items()):
-                if tx_info["status"] == "pending":
-                    elapsed_since_start = current_time - \
-                        tx_info.get("start_time", benchmark_start_time)
-
-                    if elapsed_since_start > pending_timeout:
-                        timeout_count += 1
-                        tx_info["status"] = "timeout"
-                        tx_info["end_time"] = current_time
-                        tx_info["elapsed_time"] = elapsed_since_start
+        # Pop transactions whose pending deadline has passed off the
+        # deadline heap; cost scales with expiries only
+        expired = event_matcher.expire_due(current_time)
+        for tx_id, tx_info in expired:
+            tx_info.mark_end(current_time)
+            signal_completion(tx_info)
+        completed_count = event_matcher.status_counts["completed"]
+        pending_count = event_matcher.status_counts["pending"]
+        timeout_count = len(expired)
 
         # Only print timeout message once per batch to avoid spam
         if timeout_count > 0:
             print(
                 f"⏱️  {timeout_count} transaction(s) exceeded {pending_timeout}s timeout. Marking as timeout...")
             # Print diagnostic info
-            with events_received_count_lock:
-                events_count = events_received_count
-            with last_event_time_lock:
-                time_since_last = current_time - last_event_time
+            events_count = events_received_count
+            time_since_last = current_time - last_event_time
             print(
-                f"   📊 Status: {len(completed)} completed, {len(pending)} pending, {events_count} events received")
+                f"   📊 Status: {completed_count} completed, {pending_count} pending, {events_count} events received")
             print(f"   ⏰ Last event received: {time_since_last:.1f}s ago")
-            if ws_thread and not ws_thread.is_alive():
-                print(f"   ⚠️  WARNING: WebSocket thread is not running!")
+            if ws_listener_tasks and all(task.done() for task in ws_listener_tasks):
+                print(f"   ⚠️  WARNING: WebSocket listener is not running!")
 
         # Print periodic status updates every 10 seconds
         if int(elapsed_overall) != last_status_print and int(elapsed_overall) % 10 == 0:
             last_status_print = int(elapsed_overall)
-            with events_received_count_lock:
-                events_count = events_received_count
-            with last_event_time_lock:
-                time_since_last = current_time - last_event_time
+            events_count = events_received_count
+            time_since_last = current_time - last_event_time
             print(f"\n📊 Progress Update (after {elapsed_overall:.0f}s):")
-            print(f"   Completed: {len(completed)}/{num_transactions}")
-            print(f"   Pending: {len(pending)}")
+            print(f"   Completed: {completed_count}/"
+                  f"{num_transactions if duration is None else sent_count}")
+            print(f"   Pending: {pending_count}")
             print(f"   Events Received: {events_count}")
             print(f"   Last Event: {time_since_last:.1f}s ago")
-            if ws_thread:
-                print(f"   WebSocket Thread Alive: {ws_thread.is_alive()}")
-                if not ws_thread.is_alive():
+            if ws_listener_tasks:
+                alive = sum(not task.done() for task in ws_listener_tasks)
+                print(
+                    f"   WebSocket Listeners Alive: {alive}/{len(ws_listener_tasks)}")
+                if not alive:
                     print(
-                        f"   ⚠️  WARNING: WebSocket thread died! Events will not be received.")
+                        f"   ⚠️  WARNING: WebSocket listeners died! Events will not be received.")
             # Show sample of pending transactions
-            if pending:
+            if pending_count:
+                sample_pending = list(
+                    itertools.islice(event_matcher.pending, 3))
                 print(
-                    f"   Sample pending transactions: {[tx_id[:20] + '...' if len(tx_id) > 20 else tx_id for tx_id in list(transaction_events.keys())[:3] if transaction_events[tx_id].get('status') == 'pending']}")
+                    f"   Sample pending transactions: {[tx_id[:20] + '...' if len(tx_id) > 20 else tx_id for tx_id in sample_pending]}")
 
         await asyncio.sleep(check_interval)
 
     benchmark_end_time = time.time()
     total_time = benchmark_end_time - benchmark_start_time
+    harness = await harness_monitor.stop()
+
+    reconciled = None
+    if reconcile_unresolved:
+        unresolved = {tx_id: tx_info for tx_id, tx_info in event_matcher.finished.items()
+                      if tx_info.status in (TIMEOUT, FAILED)}
+        if unresolved:
+            print(
+                f"\n🔎 Reconciling {len(unresolved)} timed-out/failed transactions...")
+            reconciled = await reconcile(
+                unresolved, PRIMARY_NETWORK_BASE_URL, NETWORK_BASE_URL, NAMESPACE,
+                SIMPLE_STORAGE_CONTRACT_ADDRESS, benchmark_start_time)
+
+    result = collect_results(num_transactions, sent_count, total_time, rate, arrival,
+                             concurrency, send_stats, reconciled, duration, harness)
+    if report:
+        print_results(result)
+
+    if histogram_out:
+        latency_histogram.save(histogram_out)
+        print(f"\n💾 Latency histogram saved to {histogram_out}")
+
+    if journal.enabled:
+        print(f"\n📓 Journal: {journal.path}")
+
+    return result
+
+
+def collect_results(num_transactions: int, sent_count: int, total_time: float,
+                    rate: float, arrival: str, concurrency: Optional[int],
+                    send_stats: OpenLoopStats, reconciled: Optional[Counter],
+                    duration: Optional[float] = None,
+                    harness: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Snapshot the finished run as a plain, picklable/JSON-friendly dict
+
+    Histograms are stored with to_dict() so results from several worker
+    processes can be merged exactly; per-transaction records are stored
+    as columns (see results.TX_COLUMNS).
+    """
+    status_counts = dict(event_matcher.status_counts)
+    match_outcomes = event_matcher.summary()
+    unmatched_samples = list(event_matcher.unmatched_samples)
+    transactions = results.records_to_columns(event_matcher.items())
+    event_samples = [{"tx_id": tx_id, "event": tx_info.event_data}
+                     for tx_id, tx_info in event_matcher.finished.items()
+                     if tx_info.event_data is not None]
+    latency = latency_histogram.to_dict()
+    phases = {phase: histogram.to_dict()
+              for phase, histogram in phase_histograms.items()}
+    events_count = events_received_count
+    ws_stats = {connection_name: dict(stats, gaps=list(stats["gaps"]))
+                for connection_name, stats in ws_connection_stats.items()}
+
+    return {
+        "num_transactions": num_transactions,
+        "sent": sent_count,
+        "total_time": total_time,
+        "started_at": benchmark_start_time,
+        "duration": duration,
+        "rate": rate,
+        "arrival": arrival,
+        "concurrency": concurrency,
+        "achieved_rate": send_stats.achieved_rate,
+        "status_counts": status_counts,
+        "events_received": events_count,
+        "match_outcomes": match_outcomes,
+        "unmatched_samples": unmatched_samples,
+        "ws_connections": ws_stats,
+        "reconciled": dict(reconciled) if reconciled is not None else None,
+        "latency": latency,
+        "phases": phases,
+        "transactions": transactions,
+        "event_samples": event_samples,
+        "harness": harness,
+    }
+
+
+def print_results(result: Dict[str, Any]) -> None:
+    """Print the report for a result from collect_results() (or a merge of several)"""
+    num_transactions = result["num_transactions"]
+    sent_count = result["sent"]
+    total_time = result["total_time"]
+    status_counts = result["status_counts"]
+    completed_count = status_counts.get("completed", 0)
+    latency = LatencyHistogram.from_dict(result["latency"])
+    duration = result.get("duration")
+    mode = "closed loop" if result["concurrency"] else "open loop"
 
-    # Print results
     print(f"\n\n{'='*80}")
-    print(
-        f"📊 Benchmark Results - Target: {num_transactions} Completed Transactions")
+    if duration is None:
+        print(
+            f"📊 Benchmark Results - Target: {num_transactions} Completed Transactions")
+    else:
+        print(f"📊 Benchmark Results - {duration:.1f}s {mode} run")
     print(f"{'='*80}")
     print(f"Total Time: {total_time:.4f}s")
     print(f"End Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-    # Thread-safe access for final summary
-    with transaction_events_lock:
-        completed = [tx for tx in transaction_events.values()
-                     if tx["status"] == "completed"]
-        failed = [tx for tx in transaction_events.values() if tx["status"]
-                  == "failed"]
-        timeout = [tx for tx in transaction_events.values() if tx["status"]
-                   == "timeout"]
-        pending = [tx for tx in transaction_events.values() if tx["status"]
-                   == "pending"]
-
-    with events_received_count_lock:
-        events_count = events_received_count
-
     print(f"\n📊 Summary:")
-    print(f"  Target Completed: {num_transactions} ✅")
-    print(f"  Actually Completed: {len(completed)}/{num_transactions}")
-    print(f"  Failed: {len(failed)}")
-    print(f"  Timeout: {len(timeout)}")
-    print(f"  Pending: {len(pending)}")
+    if duration is None:
+        print(f"  Target Completed: {num_transactions} ✅")
+        print(f"  Actually Completed: {completed_count}/{num_transactions}")
+    else:
+        # A time-bounded run has no completion target; report what it issued
+        print(f"  Mode: {mode}, {duration:.1f}s")
+        print(f"  Issued: {sent_count}")
+        print(f"  Completed: {completed_count}/{sent_count}")
+    print(f"  Failed: {status_counts.get('failed', 0)}")
+    print(f"  Timeout: {status_counts.get('timeout', 0)}")
+    print(f"  Pending: {status_counts.get('pending', 0)}")
     print(f"  Total Sent: {sent_count}")
-    print(f"  Events Received: {events_count}")
+    if result.get("workers"):
+        print(f"  Worker Processes: {result['workers']}")
+    if result["concurrency"]:
+        print(f"  Concurrency: {result['concurrency']} in flight (closed loop)")
+    else:
+        print(
+            f"  Offered Load: {result['achieved_rate']:.2f} tx/s (target {result['rate']:.2f}, {result['arrival']})")
+    print(f"  Events Received: {result['events_received']}")
     if sent_count > 0:
         print(
-            f"  Event Loss Rate: {((sent_count - len(completed)) / sent_count * 100):.2f}%")
-
-    if completed:
-        times = [tx["elapsed_time"] for tx in completed]
-        avg_time = sum(times) / len(times)
-        min_time = min(times)
-        max_time = max(times)
+            f"  Event Loss Rate: {((sent_count - completed_count) / sent_count * 100):.2f}%")
+    print(f"  Event Matching: " +
+          ", ".join(f"{outcome} {count}" for outcome, count in result["match_outcomes"].items()))
+    unmatched_samples = result["unmatched_samples"]
+    if unmatched_samples:
+        print(f"  Unmatched Event Samples (last {len(unmatched_samples)}):")
+        for sample in unmatched_samples:
+            print(f"    {sample}")
+
+    for connection_name, stats in result["ws_connections"].items():
+        gaps = stats["gaps"]
+        print(f"\n🔌 WebSocket [{connection_name}]:")
+        print(f"  Events Delivered: {stats['events']}")
+        print(f"  Reconnects: {stats['reconnects']}")
+        if gaps:
+            print(
+                f"  Gap Duration: total {sum(gaps):.2f}s, max {max(gaps):.2f}s")
+        print(f"  Events Replayed After Reconnect: {stats['replayed']}")
+        print(f"  Duplicate Events: {stats.get('duplicates', 0)}")
+
+    reconciled = result["reconciled"]
+    if reconciled is not None:
+        unresolved_count = sum(reconciled.values())
+        truly_lost = reconciled["reverted"] + reconciled["never_executed"]
+        executed = completed_count + \
+            reconciled["late_delivered"] + reconciled["executed_event_missed"]
+        print(f"\n🔎 Reconciliation ({unresolved_count} timed out/failed):")
+        for cls in RECONCILE_CLASSES:
+            print(f"  {cls}: {reconciled[cls]}")
+        print(f"  Executed (incl. late/missed events): {executed}")
+        if sent_count > 0:
+            print(
+                f"  True Loss Rate: {truly_lost / sent_count * 100:.2f}% (reverted + never executed)")
+            print(f"  Executed Throughput: {executed / total_time:.2f} tx/s")
 
+    if latency.count:
         print(f"\n⏱️  Transaction Times:")
-        print(f"  Average: {avg_time:.4f}s")
-        print(f"  Min: {min_time:.4f}s")
-        print(f"  Max: {max_time:.4f}s")
-        print(f"  Throughput: {len(completed) / total_time:.2f} tx/s")
-
-    # Print individual transaction details (only completed ones) - thread-safe
-    print(f"\n📋 Completed Transactions:")
-    with transaction_events_lock:
-        for tx_id, tx_info in sorted(transaction_events.items()):
-            if tx_info["status"] == "completed":
-                elapsed = tx_info.get("elapsed_time")
-                print(
-                    f"  {tx_id}: {elapsed:.4f}s - Args: {tx_info['args'].hex()}")
+        print(f"  Average: {latency.mean:.4f}s")
+        print(f"  Min: {latency.min:.4f}s")
+        for percentile, value in latency.percentiles().items():
+            print(f"  p{percentile:g}: {value:.4f}s")
+        print(f"  Max: {latency.max:.4f}s")
+        print(f"  Throughput: {completed_count / total_time:.2f} tx/s")
+
+    print(f"\n⏱️  Phase Breakdown:")
+    for phase, (start_field, end_field) in LATENCY_PHASES.items():
+        histogram = LatencyHistogram.from_dict(result["phases"][phase])
+        if histogram.count:
+            print(f"  {phase:<9} ({start_field} -> {end_field}, n={histogram.count})")
+            print(f"    avg: {histogram.mean:.4f}s  {histogram.format_summary()}")
+        else:
+            print(f"  {phase:<9} ({start_field} -> {end_field}): no samples")
+
+    if result.get("harness"):
+        print_harness_report(result["harness"],
+                             None if result["concurrency"] else result["rate"],
+                             result["achieved_rate"])
 
     print(f"\n{'='*80}\n")
 
 
-def ws_listener_thread(ws_url: str, connection_name: str, send_events: Optional[list] = None):
+def build_consumer_pool(ws_url: str, connections: int, subscriptions: List[str],
+                        ephemeral: bool = False) -> List[Tuple[str, str, list]]:
     """
-    Run WebSocket listener in a separate thread with its own event loop.
-    This ensures the WebSocket listener is completely isolated from API calls.
+    Describe K WebSocket consumers for the shared event matcher
+
+    Subscriptions are assigned to connections round-robin. Connections that
+    start the same durable subscription share its event stream (FireFly
+    delivers each event to one of them); giving each connection its own
+    subscription, e.g. one per listener over a share of the key space,
+    splits the stream by subscription instead.
+
+    With `ephemeral` every connection starts its own ephemeral subscription
+    to blockchain events instead, and so sees every event. Worker processes
+    use this with a single connection (parse_args rejects more) and drop
+    the events of other workers by tx-id prefix.
 
     Args:
         ws_url: WebSocket URL to connect to
-        connection_name: Name of the connection
-        send_events: List of events to send
+        connections: Number of WebSocket connections (K)
+        subscriptions: Durable subscription names to start
+        ephemeral: Start one ephemeral subscription per connection instead
+
+    Returns:
+        (ws_url, connection_name, send_events) per connection
+    """
+    pool = []
+    for index in range(connections):
+        subscription = subscriptions[index % len(subscriptions)]
+        connection_name = "Network" if connections == 1 else f"Network-{index}"
+        if ephemeral:
+            start = {
+                "type": "start",
+                "namespace": NAMESPACE,
+                "ephemeral": True,
+                "autoack": True,
+                "filter": {"events": "blockchain_event_received"}
+            }
+        else:
+            start = {
+                "type": "start",
+                "name": subscription,
+                "namespace": NAMESPACE,
+                "autoack": True
+            }
+        send_events = [start]
+        pool.append((ws_url, connection_name, send_events))
+    return pool
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse benchmark command-line options"""
+    parser = argparse.ArgumentParser(
+        description="Cross-chain doCross benchmark against a FireFly network pair")
+    parser.add_argument("--target", type=int, default=DEFAULT_TARGET_COMPLETED,
+                        help="number of completed transactions to wait for")
+    parser.add_argument("--rate", type=float, default=DEFAULT_SEND_RATE,
+                        help="open-loop offered load in tx/s")
+    parser.add_argument("--arrival", choices=ARRIVAL_DISTRIBUTIONS, default=DEFAULT_ARRIVAL,
+                        help="inter-arrival distribution for open-loop sends")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="random seed for Poisson arrivals")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="closed-loop mode: keep this many transactions in flight "
+                             "(overrides --rate/--arrival)")
+    parser.add_argument("--histogram-out", default=None,
+                        help="save the latency histogram as JSON (mergeable with latency_histogram.py)")
+    parser.add_argument("--no-reconcile", action="store_true",
+                        help="skip the post-run lookup of timed-out/failed transactions")
+    parser.add_argument("--match-diagnostics", action="store_true",
+                        help="keep samples of unmatched events for the summary")
+    parser.add_argument("--ws-connections", type=int, default=1,
+                        help="number of WebSocket connections consuming events")
+    parser.add_argument("--ws-subscriptions", default="Changed",
+                        help="comma-separated durable subscriptions, assigned to connections round-robin")
+    parser.add_argument("--pool-size", type=int, default=HTTP_POOL_SIZE,
+                        help="max pooled HTTP connections")
+    parser.add_argument("--per-host-limit", type=int, default=HTTP_PER_HOST_LIMIT,
+                        help="max pooled HTTP connections per host (0 = no limit)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="split the load over this many worker processes "
+                             "(each with its own HTTP pool and tx-id prefix)")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="send for this many seconds instead of until --target completes")
+    parser.add_argument("--sweep", choices=("rate", "concurrency"), default=None,
+                        help="saturation sweep: step the offered rate or the closed-loop "
+                             "concurrency and report the throughput-latency curve")
+    parser.add_argument("--sweep-start", type=float, default=10.0,
+                        help="first sweep step (tx/s or transactions in flight)")
+    parser.add_argument("--sweep-stop", type=float, default=200.0,
+                        help="last sweep step")
+    parser.add_argument("--sweep-step", type=float, default=10.0,
+                        help="increment between sweep steps")
+    parser.add_argument("--step-duration", type=float, default=60.0,
+                        help="measured seconds per sweep step")
+    parser.add_argument("--warmup", type=float, default=10.0,
+                        help="seconds sent before each step's measurement window")
+    parser.add_argument("--max-p99", type=float, default=5.0,
+                        help="stop the sweep once p99 latency exceeds this (seconds)")
+    parser.add_argument("--max-timeout-rate", type=float, default=0.05,
+                        help="stop the sweep once this fraction of transactions times out or fails")
+    parser.add_argument("--sweep-csv", default="sweep.csv",
+                        help="CSV file for the throughput-latency curve")
+    parser.add_argument("--sample-events", type=int, default=EVENT_SAMPLE_EVERY,
+                        help="keep the raw blockchain event of every Nth completed "
+                             "transaction in the results (0 = none)")
+    parser.add_argument("--results-dir", default="results",
+                        help="directory for the run's summary JSON and per-transaction "
+                             "columns (empty to skip; compare runs with results.py)")
+    parser.add_argument("--run-label", default=None,
+                        help="file prefix for the saved run (default: run-<timestamp>)")
+    parser.add_argument("--journal", default=None,
+                        help="write per-event/per-transaction records to this NDJSON file")
+    parser.add_argument("--profile", default=None,
+                        help="run the benchmark under cProfile and write the stats to this file")
+    parser.add_argument("--uvloop", action="store_true",
+                        help="run on uvloop (pip install uvloop) instead of the default event loop")
+    parser.add_argument("--verbose", action="store_true",
+                        help="print every event and transaction (slows the hot path); "
+                             "default is periodic aggregates only")
+    options = parser.parse_args()
+    if options.sweep and options.workers > 1:
+        parser.error("--sweep runs in one process; it cannot be combined with --workers")
+    if options.workers > 1 and options.ws_connections > 1:
+        parser.error("--workers uses one ephemeral subscription per worker, which sees every "
+                     "event; more --ws-connections would deliver each event several times")
+    if options.workers > 1 and options.concurrency and options.concurrency < options.workers:
+        parser.error(f"--concurrency {options.concurrency} cannot be split over "
+                     f"{options.workers} workers; use at most {options.concurrency} workers")
+    return options
+
+
+async def start_listener(options: argparse.Namespace, ephemeral: bool = False) -> None:
     """
-    # Create a new event loop for this thread
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    Configure the HTTP pool and journal and start one Network WebSocket
+    listener task per connection on the running loop
 
-    try:
-        print(f"\n🧵 [{connection_name}] WebSocket listener thread started")
-        # Run the WebSocket listener in this thread's event loop
-        loop.run_until_complete(ws_listen_and_send(
-            ws_url, connection_name, send_events))
-    except Exception as e:
-        print(f"❌ [{connection_name}] Error in WebSocket thread: {e}")
-        import traceback
-        traceback.print_exc()
-    finally:
-        loop.close()
-        print(f"🧵 [{connection_name}] WebSocket listener thread ended")
+    Args:
+        options: Parsed command-line options
+        ephemeral: Use per-connection ephemeral subscriptions (worker processes)
+    """
 
+    # Consumer pool: one "start" message per Network connection
+    consumers = build_consumer_pool(
+        NETWORK_WS_URL, options.ws_connections, options.ws_subscriptions.split(","), ephemeral)
 
-async def main():
-    """Main execution with Network WebSocket listener in separate thread"""
+    http_client.configure(pool_size=options.pool_size,
+                          per_host_limit=options.per_host_limit)
+    event_matcher.diagnostics = options.match_diagnostics
 
-    # Create events to send to Network
-    network_events = [
-        {
-            "type": "start",
-            "name": "Changed",
-            "namespace": "default",
-            "autoack": True
-        }
-    ]
+    global EVENT_SAMPLE_EVERY
+    EVENT_SAMPLE_EVERY = options.sample_events
+
+    global VERBOSE
+    VERBOSE = options.verbose
+    journal.path = options.journal
+    journal.start()
 
     print("\n" + "="*80)
-    print("🚀 Starting WebSocket connection in separate thread...")
+    print(f"🚀 Starting WebSocket listeners ({len(consumers)} connection(s))...")
     print("="*80)
 
-    # Start WebSocket listener in a separate thread (completely isolated)
-    global ws_thread
-    ws_thread = threading.Thread(
-        target=ws_listener_thread,
-        args=(NETWORK_WS_URL, "Network", network_events),
-        daemon=True,  # Thread will exit when main program exits
-        name="WebSocketListener"
-    )
-    ws_thread.start()
-    print("✅ WebSocket listener thread started")
+    # Listeners share the benchmark's loop: events resolve transaction
+    # futures directly, with no cross-thread handoff
+    ws_listener_tasks[:] = [
+        asyncio.create_task(ws_listen_and_send(ws_url, connection_name, send_events))
+        for ws_url, connection_name, send_events in consumers]
 
     # Give WebSocket time to connect and verify connection
     print("\n⏳ Waiting for WebSocket to connect...")
     for i in range(30):  # Wait up to 3 seconds
         await asyncio.sleep(0.1)
-        if network_ws_connection is not None:
-            print("✅ WebSocket connection verified!")
+        if len(network_ws_connections) == len(consumers):
+            print(
+                f"✅ WebSocket connection verified! ({len(consumers)} connection(s))")
             break
     else:
-        print("⚠️  Warning: WebSocket connection not established after 3 seconds")
+        print(
+            f"⚠️  Warning: only {len(network_ws_connections)}/{len(consumers)} WebSocket connections established after 3 seconds")
         print("   Continuing anyway, but events may not be received...")
 
-    # Run benchmark - API calls won't block WebSocket listener since it's in a separate thread
-    await run_benchmark(2500)
 
-    # Cleanup - signal thread to stop
+async def stop_listener() -> None:
+    """Close the HTTP pool and journal and cancel the WebSocket listener tasks"""
+    await http_client.close_client()
+    journal.close()
+
     print("🛑 Shutting down...")
-    ws_thread_stop_event.set()
-
-    # Wait for thread to finish (with timeout)
-    if ws_thread.is_alive():
-        print("⏳ Waiting for WebSocket thread to finish...")
-        ws_thread.join(timeout=5.0)
-        if ws_thread.is_alive():
-            print("⚠️  WebSocket thread did not finish in time")
+    for task in ws_listener_tasks:
+        task.cancel()
+    await asyncio.gather(*ws_listener_tasks, return_exceptions=True)
+    ws_listener_tasks.clear()
+    print("✅ WebSocket listeners stopped")
+
+
+async def run_with_listener(options: argparse.Namespace, ephemeral: bool = False,
+                            report: bool = True) -> Dict[str, Any]:
+    """
+    Start the Network WebSocket listeners, run the benchmark and shut the
+    listeners down again
+
+    Args:
+        options: Parsed command-line options
+        ephemeral: Use per-connection ephemeral subscriptions (worker processes)
+        report: Print the results
+
+    Returns:
+        Run results (see collect_results)
+    """
+    await start_listener(options, ephemeral)
+
+    try:
+        with profiled(options.profile):
+            result = await run_benchmark(options.target, options.rate, options.arrival,
+                                         options.seed, options.concurrency, options.histogram_out,
+                                         not options.no_reconcile, report, options.duration)
+    finally:
+        await stop_listener()
+
+    return result
+
+
+async def main(options: argparse.Namespace):
+    """Main execution: benchmark and Network WebSocket listeners on one event loop"""
+    if options.sweep:
+        from saturation_sweep import run_sweep
+        await run_sweep(options)
+    else:
+        if options.workers > 1:
+            from multiprocess_benchmark import run_multiprocess
+            result = await run_multiprocess(options)
         else:
-            print("✅ WebSocket thread finished cleanly")
+            result = await run_with_listener(options)
+
+        if options.results_dir:
+            summary_path, tx_path = results.save_run(
+                results.run_prefix(options.results_dir, options.run_label), result)
+            print(f"💾 Run saved: {summary_path}, {tx_path}")
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        options = parse_args()
+        if options.uvloop and uvloop is None:
+            print("⚠️  uvloop is not installed (pip install uvloop), using the default event loop")
+        if options.uvloop and uvloop is not None:
+            uvloop.run(main(options))
+        else:
+            asyncio.run(main(options))
     except KeyboardInterrupt:
         print("\n\n👋 Application closed")
@@ -0,0 +1,316 @@
+"""
+Async client for cross-chain doCross calls with awaitable completion
+
+CrossChainClient wraps what the benchmark does by hand: it builds the
+doCross payload, registers the Changed event the call is expected to
+produce, and matches that event when it arrives. submit() returns a future
+that resolves once the transaction reaches a terminal state, so callers
+can drive thousands of cross-chain calls concurrently:
+
+    async with CrossChainClient("http://localhost:5000/api/v1",
+                                "ws://localhost:5003/ws") as client:
+        futures = [client.submit(os.urandom(2)) for _ in range(1000)]
+        records = await asyncio.gather(*futures, return_exceptions=True)
+
+Submissions are queued and sent by one sender task, one doCross request
+each as soon as an in-flight slot is free (FireFly has no batch invoke);
+in-flight transactions are capped by a semaphore, and every transaction is
+matched through one shared WebSocket subscription.
+
+Prerequisites:
+- aiohttp library: pip install aiohttp
+- websockets library: pip install websockets
+"""
+
+import asyncio
+import json
+import random
+import string
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import websockets
+
+from event_decoder import DECODE_ERRORS, decode_event
+from event_matcher import MATCHED, EventMatcher
+from http_client import REQUEST_ERRORS, HttpClient
+from tx_records import COMPLETED, FAILED, TxRecord
+
+DEFAULT_MAX_IN_FLIGHT = 1000
+DEFAULT_TIMEOUT = 60.0  # seconds from submit to the Changed event
+EXPIRY_INTERVAL = 0.5   # seconds between timeout sweeps
+
+WS_RECONNECT_INITIAL_DELAY = 0.5
+WS_RECONNECT_MAX_DELAY = 10.0
+
+
+def encode_tx_id(tx_id: str) -> str:
+    """Hex form of a tx id, as carried in the Changed event's key"""
+    return '0x' + tx_id.encode('utf-8').hex()
+
+
+def decode_tx_id(tx_key: str) -> str:
+    """Inverse of encode_tx_id"""
+    return bytes.fromhex(tx_key[2:]).decode('utf-8', errors='replace')
+
+
+def docross_payload(tx_id: str, args: bytes, invocation_id: str = "iv-1",
+                    network_id: str = "20", primary_network_id: str = "10") -> Dict[str, Any]:
+    """Body of POST /apis/cross-chain/invoke/doCross"""
+    return {
+        "input": {
+            "args": [encode_tx_id(tx_id), '0x' + args.hex()],  # Two hex arguments
+            "invocationId": invocation_id,
+            "networkId": network_id,
+            "primaryNetworkId": primary_network_id,
+            "txId": tx_id
+        }
+    }
+
+
+class CrossChainError(Exception):
+    """A submitted transaction failed or timed out; the record is kept on the exception"""
+
+    def __init__(self, tx_id: str, record: TxRecord, cause: Optional[BaseException] = None) -> None:
+        super().__init__(f"Cross-chain transaction {tx_id} {record.status_name}"
+                         + (f": {cause}" if cause else ""))
+        self.tx_id = tx_id
+        self.record = record
+        self.cause = cause
+
+
+class CrossChainClient:
+    """
+    Submit doCross calls and await their Changed events
+
+    Args:
+        primary_base_url: Primary FireFly REST API (where doCross is invoked)
+        network_ws_url: Network FireFly WebSocket (where Changed is emitted)
+        namespace: FireFly namespace
+        subscription: Durable subscription to start, or None for an
+            ephemeral subscription to every blockchain event
+        invocation_id: Registered invocation doCross targets
+        network_id: Target network id
+        primary_network_id: Primary network id
+        max_in_flight: Transactions submitted but not yet terminal
+        timeout: Seconds a transaction may wait for its event
+        http: HTTP client to send with (a private pool by default)
+        event_name: Blockchain event that completes a transaction
+        tx_id_prefix: Prefix for generated tx ids
+        retain_finished: Keep finished records indexed so late and
+            duplicate events are classified (grows with every transaction)
+    """
+
+    def __init__(
+        self,
+        primary_base_url: str,
+        network_ws_url: str,
+        namespace: str = "default",
+        subscription: Optional[str] = "Changed",
+        invocation_id: str = "iv-1",
+        network_id: str = "20",
+        primary_network_id: str = "10",
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        timeout: float = DEFAULT_TIMEOUT,
+        http: Optional[HttpClient] = None,
+        event_name: str = "Changed",
+        tx_id_prefix: str = "tx-",
+        retain_finished: bool = False,
+    ) -> None:
+        self.primary_base_url = primary_base_url
+        self.network_ws_url = network_ws_url
+        self.namespace = namespace
+        self.subscription = subscription
+        self.invocation_id = invocation_id
+        self.network_id = network_id
+        self.primary_network_id = primary_network_id
+        self.timeout = timeout
+        self.tx_id_prefix = tx_id_prefix
+        self.retain_finished = retain_finished
+        self.matcher = EventMatcher(event_name)
+        self.connected = asyncio.Event()
+        self.reconnects = 0
+        self._http = http or HttpClient(pool_size=min(max_in_flight, 1000))
+        self._owns_http = http is None
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._queue: "asyncio.Queue[Tuple[str, bytes, TxRecord]]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._sends: set = set()
+
+    # Lifecycle
+
+    async def start(self, connect_timeout: float = 10.0) -> "CrossChainClient":
+        """Open the shared subscription and start the sender and expiry tasks"""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._listen()),
+                           asyncio.create_task(self._dispatch()),
+                           asyncio.create_task(self._expire())]
+            try:
+                await asyncio.wait_for(self.connected.wait(), connect_timeout)
+            except asyncio.TimeoutError:
+                await self._stop_tasks()
+                raise
+        return self
+
+    async def _stop_tasks(self) -> None:
+        for task in self._tasks + list(self._sends):
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._sends, return_exceptions=True)
+        self._tasks = []
+
+    async def close(self) -> None:
+        """Stop all tasks and fail whatever is still pending"""
+        await self._stop_tasks()
+        for tx_key, record in self.matcher.expire_all():
+            self._settle(tx_key, record)
+        # Never sent: still queued for an in-flight slot
+        unsent = []
+        while not self._queue.empty():
+            unsent.append(self._queue.get_nowait())
+        for tx_id, _, record in unsent:
+            record.status = FAILED
+            record.mark_end(time.time())
+            if not record.completion.done():
+                record.completion.set_exception(CrossChainError(
+                    tx_id, record, RuntimeError("client closed before the call was sent")))
+            record.completion = None
+        if self._owns_http:
+            await self._http.close()
+
+    async def __aenter__(self) -> "CrossChainClient":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    # Submission
+
+    def submit(self, args: bytes, tx_id: Optional[str] = None) -> "asyncio.Future[TxRecord]":
+        """
+        Queue one doCross call
+
+        Args:
+            args: Raw args for the target invocation
+            tx_id: Transaction id (generated when omitted)
+
+        Returns:
+            Future resolving to the completed TxRecord, or raising
+            CrossChainError if the call failed or its event never arrived
+        """
+        tx_id = tx_id or self.tx_id_prefix + ''.join(
+            random.choices(string.ascii_lowercase + string.digits, k=8))
+        record = TxRecord('0x' + args.hex(), len(args), time.time(),
+                          completion=asyncio.get_running_loop().create_future())
+        self._queue.put_nowait((tx_id, args, record))
+        return record.completion
+
+    async def _dispatch(self) -> None:
+        """Send each queued submission as soon as an in-flight slot is free"""
+        while True:
+            # The slot is taken first, so a submission leaves the queue only
+            # when it can be sent
+            await self._in_flight.acquire()
+            try:
+                tx_id, args, record = await self._queue.get()
+            except asyncio.CancelledError:
+                self._in_flight.release()
+                raise
+            # Registered before the call so an early event still matches, and
+            # so close() times out sends cancelled before they ran. The
+            # deadline counts from submit(), including time spent queued.
+            self.matcher.register(encode_tx_id(tx_id), record,
+                                  deadline=record.start_time + self.timeout)
+            task = asyncio.create_task(self._send(tx_id, args, record))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _send(self, tx_id: str, args: bytes, record: TxRecord) -> None:
+        tx_key = encode_tx_id(tx_id)
+        try:
+            # start_time stays the submit time; this is the dispatch time
+            record.http_send_time = time.time()
+            response = await self._http.request(
+                "POST",
+                f"{self.primary_base_url}/namespaces/{self.namespace}/apis/cross-chain/invoke/doCross",
+                data=docross_payload(tx_id, args, self.invocation_id,
+                                     self.network_id, self.primary_network_id))
+            response.raise_for_status()
+            record.http_ack_time = time.time()
+            operation = response.json()
+            record.operation_id = operation.get("id") if isinstance(operation, dict) else None
+        except REQUEST_ERRORS + (ValueError,) as e:
+            if self.matcher.finish(tx_key, FAILED) is not None:
+                self._settle(tx_key, record, e)
+
+    def _settle(self, tx_key: str, record: TxRecord, cause: Optional[BaseException] = None) -> None:
+        """Resolve a terminal transaction's future and free its in-flight slot"""
+        if record.end_time is None:
+            record.mark_end(time.time())
+        self._in_flight.release()
+        future = record.completion
+        if future is not None and not future.done():
+            if record.status == COMPLETED:
+                future.set_result(record)
+            else:
+                future.set_exception(CrossChainError(decode_tx_id(tx_key), record, cause))
+        record.completion = None
+        # Finished records are only needed to classify late/duplicate events
+        if not self.retain_finished:
+            self.matcher.finished.pop(tx_key, None)
+
+    # Events
+
+    def _start_message(self) -> Dict[str, Any]:
+        if self.subscription is None:
+            return {"type": "start", "namespace": self.namespace, "ephemeral": True,
+                    "autoack": True, "filter": {"events": "blockchain_event_received"}}
+        return {"type": "start", "name": self.subscription,
+                "namespace": self.namespace, "autoack": True}
+
+    def _handle_message(self, message: str) -> None:
+        try:
+            event = decode_event(message)
+        except DECODE_ERRORS:
+            return
+        if event is None or not event.is_blockchain_event:
+            return
+        outcome, record = self.matcher.match(event.key, event.value, event.name)
+        if outcome == MATCHED:
+            record.mark_end(time.time())
+            record.block_number = event.block_number
+            record.tx_hash = event.tx_hash
+            self._settle(event.key, record)
+
+    async def _listen(self) -> None:
+        """One shared subscription, reconnected with backoff until close()"""
+        delay = WS_RECONNECT_INITIAL_DELAY
+        while True:
+            try:
+                async with websockets.connect(self.network_ws_url, ping_interval=20,
+                                              ping_timeout=10) as websocket:
+                    await websocket.send(json.dumps(self._start_message()))
+                    if self.connected.is_set():
+                        self.reconnects += 1
+                    self.connected.set()
+                    delay = WS_RECONNECT_INITIAL_DELAY
+                    async for message in websocket:
+                        self._handle_message(message)
+            except (websockets.exceptions.WebSocketException, OSError, asyncio.TimeoutError):
+                pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WS_RECONNECT_MAX_DELAY)
+
+    async def _expire(self) -> None:
+        while True:
+            await asyncio.sleep(EXPIRY_INTERVAL)
+            for tx_key, record in self.matcher.expire_due(time.time()):
+                self._settle(tx_key, record)
+
+    # Introspection
+
+    def stats(self) -> Dict[str, Any]:
+        """Status counts, event match outcomes and queue depth"""
+        return {"status": dict(self.matcher.status_counts),
+                "events": self.matcher.summary(),
+                "queued": self._queue.qsize(),
+                "reconnects": self.reconnects}
@@ -0,0 +1,226 @@
+"""
+Dependency-graph executor for the deploy scripts
+
+A deployment is a set of named steps, each an async call that needs the
+results of some other steps (a constructor argument, an interface id, a
+listener id). DeployGraph starts every step as soon as the steps it depends
+on have finished, so independent chains (interface generation, SimpleStorage,
+the Register -> LockManager -> TransactionManager -> CrossChain deploys)
+overlap instead of queueing behind each other's confirmation waits.
+
+A step fails if it raises or returns None. Steps that depend on a failed
+step are skipped; every other step still runs, and run() raises
+DeployGraphError listing the failures once the graph has drained.
+
+With a DeployManifest, steps added with a fingerprint are skipped when the
+manifest holds a result for the same fingerprint and dependency results,
+and recorded when they run. A step added with a verify check only reuses
+a recorded result the check still finds on the node.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from deploy_manifest import DeployManifest
+
+# A step receives the results of every finished step, by name
+StepFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+# A verify check receives a recorded result and tells whether it still exists
+VerifyFunc = Callable[[Any], Awaitable[bool]]
+
+
+class DeployGraphError(Exception):
+    """One or more steps failed or were skipped; results holds the steps that finished"""
+
+    def __init__(self, failed: Dict[str, BaseException], skipped: List[str],
+                 results: Dict[str, Any]) -> None:
+        super().__init__(
+            "Deployment failed: " +
+            "; ".join(f"{name}: {error}" for name, error in failed.items()) +
+            (f" (skipped: {', '.join(skipped)})" if skipped else ""))
+        self.failed = failed
+        self.skipped = skipped
+        self.results = results
+
+
+class DeployGraph:
+    """
+    Named async steps with dependencies, run as concurrently as they allow
+
+    Usage:
+        graph = DeployGraph()
+        graph.add("register", lambda r: deploy_contract("Register", ...))
+        graph.add("lock_manager", lambda r: deploy_contract(
+            "LockManager", ..., [r["register"]]), "register")
+        results = await graph.run()
+
+    Args:
+        manifest: Reuse and record step results (see deploy_manifest);
+            steps can name their own manifest instead, e.g. one per node
+    """
+
+    def __init__(self, manifest: Optional[DeployManifest] = None) -> None:
+        self.manifest = manifest
+        self._steps: Dict[str, Tuple[StepFunc, Tuple[str, ...], Optional[str]]] = {}
+        self._manifests: Dict[str, DeployManifest] = {}
+        self._verifiers: Dict[str, VerifyFunc] = {}
+        # name -> (start, end) offsets from the start of run()
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self.reused: List[str] = []
+
+    def add(self, name: str, func: StepFunc, *deps: str, fingerprint: Optional[str] = None,
+            manifest: Optional[DeployManifest] = None,
+            verify: Optional[VerifyFunc] = None) -> None:
+        """
+        Add a step
+
+        Args:
+            name: Unique step name; its result is results[name]
+            func: Called with the results so far once every dependency has
+                finished
+            deps: Names of the steps whose results func needs
+            fingerprint: Everything besides deps the step's result depends
+                on (e.g. an artifact hash); makes the step reusable from
+                the manifest
+            manifest: Manifest for this step (default: the graph's)
+            verify: Checks a recorded result still exists on the node before
+                it is reused; a result that does not is dropped and the
+                step runs
+        """
+        if name in self._steps:
+            raise ValueError(f"Duplicate deploy step: {name}")
+        self._steps[name] = (func, deps, fingerprint)
+        if manifest is not None:
+            self._manifests[name] = manifest
+        if verify is not None:
+            self._verifiers[name] = verify
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._steps
+
+    def _check(self) -> None:
+        """Reject unknown dependencies and cycles before anything is sent"""
+        for name, (_, deps, _) in self._steps.items():
+            for dep in deps:
+                if dep not in self._steps:
+                    raise ValueError(f"Deploy step {name} depends on unknown step {dep}")
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str, path: List[str]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Deploy steps form a cycle: {' -> '.join(path + [name])}")
+            state[name] = 1
+            for dep in self._steps[name][1]:
+                visit(dep, path + [name])
+            state[name] = 2
+
+        for name in self._steps:
+            visit(name, [])
+
+    def critical_path(self) -> Tuple[float, List[str]]:
+        """Longest chain of dependent steps by measured duration (seconds, step names)"""
+        memo: Dict[str, Tuple[float, List[str]]] = {}
+
+        def longest(name: str) -> Tuple[float, List[str]]:
+            if name not in memo:
+                start, end = self.timings.get(name, (0.0, 0.0))
+                best = max((longest(dep) for dep in self._steps[name][1]),
+                           key=lambda item: item[0], default=(0.0, []))
+                memo[name] = (best[0] + end - start, best[1] + [name])
+            return memo[name]
+
+        return max((longest(name) for name in self._steps), key=lambda item: item[0],
+                   default=(0.0, []))
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run every step, each as soon as its dependencies have finished
+
+        Returns:
+            Result of every step, by name
+
+        Raises:
+            DeployGraphError: A step failed (its dependents are skipped)
+        """
+        self._check()
+        results: Dict[str, Any] = {}
+        failed: Dict[str, BaseException] = {}
+        skipped: List[str] = []
+        done: Dict[str, asyncio.Future] = {
+            name: asyncio.get_running_loop().create_future() for name in self._steps}
+        started = time.time()
+        self.timings = {}
+        self.reused = []
+
+        async def run_step(name: str) -> None:
+            func, deps, fingerprint = self._steps[name]
+            ok = True
+            for dep in deps:
+                ok = await done[dep] and ok
+            if not ok:
+                skipped.append(name)
+                done[name].set_result(False)
+                return
+            step_start = time.time() - started
+            key = None
+            manifest = self._manifests.get(name, self.manifest)
+            if manifest is not None and fingerprint is not None:
+                key = DeployManifest.step_key(fingerprint, {dep: results[dep] for dep in deps})
+                recorded = manifest.lookup(name, key)
+                if recorded is not None and not await self._still_exists(name, recorded):
+                    manifest.forget(name)
+                    recorded = None
+                if recorded is not None:
+                    results[name] = recorded
+                    self.reused.append(name)
+                    self.timings[name] = (step_start, step_start)
+                    done[name].set_result(True)
+                    return
+            try:
+                result = await func(results)
+                if result is None:
+                    raise ValueError("step returned no result")
+                results[name] = result
+                if key is not None:
+                    manifest.record(name, key, result)
+            except Exception as e:
+                print(f"\n❌ Deploy step {name} failed: {e}")
+                failed[name] = e
+            self.timings[name] = (step_start, time.time() - started)
+            done[name].set_result(name in results)
+
+        await asyncio.gather(*(run_step(name) for name in self._steps))
+        if failed or skipped:
+            raise DeployGraphError(failed, skipped, results)
+        return results
+
+    async def _still_exists(self, name: str, recorded: Any) -> bool:
+        verify = self._verifiers.get(name)
+        if verify is None:
+            return True
+        try:
+            if await verify(recorded):
+                return True
+            print(f"♻️  Recorded {name} ({recorded}) no longer exists on the node, re-running")
+        except Exception as e:
+            print(f"⚠️  Could not verify recorded {name}, re-running: {e}")
+        return False
+
+    def print_timings(self) -> None:
+        """Per-step start/end offsets, wall-clock total and the critical path"""
+        if not self.timings:
+            return
+        wall = max(end for _, end in self.timings.values())
+        serial = sum(end - start for start, end in self.timings.values())
+        path_time, path = self.critical_path()
+        print(f"\n⏱️  Deployment Timeline:")
+        for name, (start, end) in sorted(self.timings.items(), key=lambda item: item[1]):
+            print(f"  {start:>7.2f}s -> {end:>7.2f}s  {name}")
+        print(f"  Wall Clock: {wall:.2f}s (steps run one by one: {serial:.2f}s)")
+        print(f"  Critical Path ({path_time:.2f}s): {' -> '.join(path)}")
+        if self.reused:
+            print(f"  Reused from manifest ({len(self.reused)}/{len(self._steps)}): "
+                  f"{', '.join(self.reused)}")
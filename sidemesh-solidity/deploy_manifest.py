@@ -0,0 +1,116 @@
+"""
+Local manifest of what the deploy scripts already created
+
+Every deploy step that completes is recorded with its result (contract
+address, interface/API/listener/subscription id) under the FireFly node
+URL and namespace it ran against. The record is keyed by a hash of
+everything the step's outcome depends on: the contract artifact's bytecode
+and ABI (or the event/topic/version it was created with) and the results
+of the steps it consumed. A re-run whose key matches reuses the result
+without calling FireFly. A changed artifact changes its key, and its new
+address changes the keys of everything downstream, so exactly the affected
+steps run again.
+
+Results are scoped by namespace and node URL. A stack recreated on the
+same URL is caught two ways: the scope remembers the node identity FireFly
+reported (/status) and drops its records when the identity changes, and
+steps that can be checked cheaply (interfaces, APIs and the contract
+addresses behind them, listeners, subscriptions, registration operations)
+are looked up on the node before a recorded result is
+reused (see DeployGraph.add(verify=...)).
+
+The manifest is plain JSON, rewritten atomically after every recorded step.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+DEFAULT_MANIFEST_PATH = "deploy-manifest.json"
+
+# Loaded manifest documents, by absolute path
+_documents: Dict[str, Dict[str, Any]] = {}
+
+
+def artifact_hash(artifact: Dict[str, Any]) -> str:
+    """Hash of a build/contracts/*.json artifact's bytecode and ABI"""
+    digest = hashlib.sha256()
+    digest.update((artifact.get("bytecode") or "").encode("utf-8"))
+    digest.update(json.dumps(artifact.get("abi") or [], sort_keys=True,
+                             separators=(",", ":")).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class DeployManifest:
+    """
+    Recorded deploy step results for one FireFly node and namespace
+
+    Args:
+        base_url: FireFly node the deployment targets
+        namespace: FireFly namespace
+        path: Manifest file (shared by every node and namespace)
+        redeploy: Ignore recorded results (and overwrite them)
+        identity: Identity the node reports now; records made under a
+            different identity are dropped
+    """
+
+    def __init__(self, base_url: str, namespace: str = "default",
+                 path: str = DEFAULT_MANIFEST_PATH, redeploy: bool = False,
+                 identity: Optional[str] = None) -> None:
+        self.path = path
+        self.scope = f"{namespace}@{base_url}"
+        self.redeploy = redeploy
+        # Manifests for other nodes in the same process share the document, so
+        # each save writes every node's records
+        document_key = os.path.abspath(path)
+        if document_key not in _documents:
+            _documents[document_key] = {"deployments": {}}
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    _documents[document_key] = json.load(f)
+        self._data: Dict[str, Any] = _documents[document_key]
+        self._steps: Dict[str, Dict[str, Any]] = self._data["deployments"].setdefault(
+            self.scope, {})
+        identities = self._data.setdefault("identities", {})
+        if identity is not None:
+            if identities.get(self.scope) not in (None, identity) and self._steps:
+                print(f"♻️  {self.scope} reports a new node identity (stack reset?); "
+                      f"dropping its {len(self._steps)} recorded steps")
+                self._steps.clear()
+            identities[self.scope] = identity
+
+    @staticmethod
+    def step_key(fingerprint: str, inputs: Dict[str, Any]) -> str:
+        """Key of a step from its own fingerprint and the results it consumes"""
+        return hashlib.sha256(json.dumps([fingerprint, inputs], sort_keys=True,
+                                         default=str).encode("utf-8")).hexdigest()
+
+    def lookup(self, name: str, key: str) -> Optional[Any]:
+        """Recorded result of step `name`, if it was recorded with this key"""
+        if self.redeploy:
+            return None
+        entry = self._steps.get(name)
+        if entry is not None and entry.get("key") == key:
+            return entry.get("result")
+        return None
+
+    def result(self, name: str) -> Optional[Any]:
+        """Last recorded result of step `name`, whatever its key"""
+        entry = self._steps.get(name)
+        return entry.get("result") if entry is not None else None
+
+    def forget(self, name: str) -> None:
+        """Drop a recorded step whose result no longer exists on the node"""
+        if self._steps.pop(name, None) is not None:
+            self.save()
+
+    def record(self, name: str, key: str, result: Any) -> None:
+        self._steps[name] = {"key": key, "result": result}
+        self.save()
+
+    def save(self) -> None:
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self._data, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,115 @@
+"""
+Typed decoding of FireFly WebSocket event frames
+
+Every consumer frame used to go through json.loads followed by chains of
+.get() calls to reach blockchainEvent.output.key/value/name. decode_event()
+does the same work once per frame:
+
+- parses with orjson when it is installed (pip install orjson), falling
+  back to the standard json module; bytes frames are parsed as bytes,
+  without decoding them to str first
+- checks the raw frame for substrings before parsing, so frames that cannot
+  match are dropped unparsed: every frame that is not a blockchain event,
+  and (with `require`) another worker's transactions
+- projects the fields the matcher and report need into a __slots__
+  ChainEvent instead of handing the nested dicts around
+"""
+
+import json
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Both json.JSONDecodeError and orjson.JSONDecodeError subclass ValueError
+DECODE_ERRORS = (ValueError,)
+
+BLOCKCHAIN_EVENT_RECEIVED = "blockchain_event_received"
+_BLOCKCHAIN_EVENT_MARKER = f'"{BLOCKCHAIN_EVENT_RECEIVED}"'
+_BLOCKCHAIN_EVENT_MARKER_BYTES = _BLOCKCHAIN_EVENT_MARKER.encode("utf-8")
+
+
+class ChainEvent:
+    """
+    Fields of one event frame
+
+    Only `type` is set for frames that are not blockchain events (see
+    decode_event(keep_other=True)).
+
+    Args:
+        type: FireFly event type
+        created: FireFly's RFC3339 processing timestamp
+        blockchain_event: The parsed blockchainEvent object (kept for
+            sampling; never copied)
+    """
+
+    __slots__ = ("type", "created", "key", "value", "name", "block_number", "tx_hash",
+                 "blockchain_event")
+
+    def __init__(self, type: Optional[str], created: Optional[str] = None,
+                 blockchain_event: Optional[Dict[str, Any]] = None) -> None:
+        self.type = type
+        self.created = created
+        self.blockchain_event = blockchain_event
+        self.key: Optional[str] = None
+        self.value: Optional[str] = None
+        self.name: Optional[str] = None
+        self.block_number: Optional[str] = None
+        self.tx_hash: Optional[str] = None
+        if blockchain_event:
+            self.name = blockchain_event.get("name")
+            output = blockchain_event.get("output")
+            if output:
+                self.key = output.get("key")
+                self.value = output.get("value")
+            info = blockchain_event.get("info")
+            if info:
+                self.block_number = info.get("blockNumber")
+                self.tx_hash = info.get("transactionHash")
+
+    @property
+    def is_blockchain_event(self) -> bool:
+        return self.type == BLOCKCHAIN_EVENT_RECEIVED
+
+
+def decode_event(message: Union[str, bytes], require: Optional[str] = None,
+                 keep_other: bool = False) -> Optional[ChainEvent]:
+    """
+    Decode one WebSocket frame
+
+    Args:
+        message: Raw frame
+        require: Substring every relevant blockchain event frame contains
+            (e.g. this worker's hex tx-id prefix); blockchain event frames
+            without it are dropped before parsing
+        keep_other: Parse frames that are not blockchain events too, and
+            return them with only their type set
+
+    Returns:
+        The projected event, or None for a dropped frame
+
+    Raises:
+        ValueError: The frame is not a JSON object
+    """
+    if isinstance(message, bytes):
+        marker = _BLOCKCHAIN_EVENT_MARKER_BYTES
+        required = require.encode("utf-8") if require is not None else None
+    else:
+        marker, required = _BLOCKCHAIN_EVENT_MARKER, require
+    if marker not in message:
+        if not keep_other:
+            return None
+    elif required is not None and required not in message:
+        return None
+    data = _loads(message)
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object, got {type(data).__name__}")
+    event_type = data.get("type")
+    if event_type != BLOCKCHAIN_EVENT_RECEIVED:
+        return ChainEvent(event_type) if keep_other else None
+    return ChainEvent(event_type, data.get("created"), data.get("blockchainEvent") or {})
@@ -0,0 +1,194 @@
+"""
+Indexed matching of blockchain events to benchmark transactions
+
+Pending transactions and finished (completed, failed or timed-out) ones
+live in separate dicts keyed by the hex tx id, so matching an event, and
+classifying one that does not match, are constant-time lookups regardless
+of how many transactions the run has registered.
+
+Per-status counts are updated on every transition, and pending deadlines
+sit in a min-heap, so progress checks are O(1) and expiry work is
+proportional to the number of transactions that actually expire.
+
+The matcher is not thread-safe; callers serialize access to it.
+"""
+
+import heapq
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from tx_records import COMPLETED, PENDING, STATUS_NAMES, TIMEOUT, TxRecord
+
+# Match outcomes
+MATCHED = "matched"
+LATE = "late"                    # tx already timed out or failed
+DUPLICATE = "duplicate"          # tx already completed
+ARGS_MISMATCH = "args_mismatch"  # pending tx, but the value differs
+WRONG_EVENT = "wrong_event"      # key matches, but not the expected event
+UNKNOWN = "unknown"              # key was never registered
+
+UNMATCHED_OUTCOMES = (LATE, DUPLICATE, ARGS_MISMATCH, WRONG_EVENT, UNKNOWN)
+
+
+class EventMatcher:
+    """
+    Pending/finished indices over transaction records
+
+    Records are TxRecords created by the caller; the matcher is their only
+    index, moves them between pending and finished and updates their
+    status code. status_counts always reflects how many records are in
+    each status, by status name.
+
+    Args:
+        event_name: Blockchain event that completes a transaction
+        diagnostics: Keep samples of unmatched events for debugging
+        diagnostics_samples: Maximum number of unmatched samples kept
+    """
+
+    def __init__(self, event_name: str = "Changed", diagnostics: bool = False,
+                 diagnostics_samples: int = 20) -> None:
+        self.event_name = event_name
+        self.diagnostics = diagnostics
+        self.pending: Dict[str, TxRecord] = {}
+        self.finished: Dict[str, TxRecord] = {}
+        self.outcomes: Counter = Counter()
+        self.status_counts: Counter = Counter()
+        # (deadline, key) for pending transactions; entries for transactions
+        # that finished early are discarded lazily when they reach the top
+        self._deadlines: List[Tuple[float, str]] = []
+        self.unmatched_samples: Deque[Dict[str, Any]] = deque(
+            maxlen=diagnostics_samples)
+
+    def clear(self) -> None:
+        self.pending.clear()
+        self.finished.clear()
+        self.outcomes.clear()
+        self.status_counts.clear()
+        self._deadlines.clear()
+        self.unmatched_samples.clear()
+
+    def __len__(self) -> int:
+        return len(self.pending) + len(self.finished)
+
+    def get(self, key: str) -> Optional[TxRecord]:
+        """Record registered under key, pending or finished"""
+        record = self.pending.get(key)
+        return record if record is not None else self.finished.get(key)
+
+    def items(self) -> Iterator[Tuple[str, TxRecord]]:
+        """Every registered (key, record), pending first"""
+        yield from self.pending.items()
+        yield from self.finished.items()
+
+    def register(self, key: str, record: TxRecord,
+                 deadline: Optional[float] = None) -> None:
+        """
+        Index a new pending transaction under its hex tx id
+
+        Args:
+            key: Hex tx id the completing event will carry
+            record: Transaction record
+            deadline: Time after which expire_due() times the transaction out
+        """
+        record.status = PENDING
+        self.pending[key] = record
+        self.status_counts["pending"] += 1
+        if deadline is not None:
+            heapq.heappush(self._deadlines, (deadline, key))
+
+    def finish(self, key: str, status: int) -> Optional[TxRecord]:
+        """
+        Move a pending transaction to the finished index with a terminal
+        status code (COMPLETED, FAILED or TIMEOUT)
+
+        Returns:
+            The record, or None if the transaction was not pending
+        """
+        record = self.pending.pop(key, None)
+        if record is None:
+            return None
+        record.status = status
+        self.finished[key] = record
+        self.status_counts["pending"] -= 1
+        self.status_counts[STATUS_NAMES[status]] += 1
+        return record
+
+    def expire_due(self, now: float) -> List[Tuple[str, TxRecord]]:
+        """
+        Time out every pending transaction whose deadline is at or before now
+
+        Returns:
+            (key, record) for each transaction marked as timeout
+        """
+        expired = []
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            _, key = heapq.heappop(deadlines)
+            record = self.finish(key, TIMEOUT)
+            if record is not None:
+                expired.append((key, record))
+        return expired
+
+    def expire_all(self) -> List[Tuple[str, TxRecord]]:
+        """Time out every remaining pending transaction"""
+        expired = [(key, self.finish(key, TIMEOUT))
+                   for key in list(self.pending)]
+        self._deadlines.clear()
+        return expired
+
+    def match(self, key: Optional[str], value: Optional[str],
+              name: Optional[str]) -> Tuple[str, Optional[TxRecord]]:
+        """
+        Match an event against the pending index
+
+        A matching event moves the transaction to the finished index with
+        status COMPLETED. Events that do not match leave the indices
+        untouched and are classified instead.
+
+        Returns:
+            (outcome, record) where record is the transaction the event's
+            key refers to, if any
+        """
+        record = self.pending.get(key)
+        if record is not None:
+            if name != self.event_name:
+                outcome = WRONG_EVENT
+            elif value != record.args_hex:
+                outcome = ARGS_MISMATCH
+            else:
+                self.finish(key, COMPLETED)
+                self.outcomes[MATCHED] += 1
+                return MATCHED, record
+        else:
+            record = self.finished.get(key)
+            if record is None:
+                outcome = UNKNOWN
+            elif record.status == COMPLETED:
+                outcome = DUPLICATE
+            else:
+                outcome = LATE
+
+        self.outcomes[outcome] += 1
+        if self.diagnostics:
+            self._sample(outcome, key, value, name, record)
+        return outcome, record
+
+    def _sample(self, outcome: str, key: Optional[str], value: Optional[str],
+                name: Optional[str], record: Optional[TxRecord]) -> None:
+        sample = {"outcome": outcome, "key": key,
+                  "value": value, "name": name}
+        if record is not None:
+            sample["status"] = record.status_name
+            sample["expected_value"] = record.args_hex
+        elif key:
+            # Registered keys are lowercase hex, so one lookup of the
+            # lowered key catches case-only differences
+            alias = key.lower()
+            if alias != key and (alias in self.pending or alias in self.finished):
+                sample["case_insensitive_match"] = alias
+        self.unmatched_samples.append(sample)
+
+    def summary(self) -> Dict[str, int]:
+        """Outcome counts, including zeros for outcomes never seen"""
+        return {outcome: self.outcomes[outcome]
+                for outcome in (MATCHED,) + UNMATCHED_OUTCOMES}
@@ -0,0 +1,190 @@
+"""
+FireFly REST calls used by the deploy and registration tooling
+
+FireFlyNode wraps one node's namespace: contract deploys, interface and
+API definitions, event listeners and subscriptions, and API invocations.
+topology.py drives it for every network in topology.json; the
+deploy_network.py, deploy_primary_network.py and register.py entry
+points go through topology.py.
+
+Deploys are submitted without confirm and waited for through the node's
+OperationTracker, so deploys submitted together are polled together.
+
+Prerequisites:
+- aiohttp library: pip install aiohttp
+"""
+
+from typing import Any, Dict, List, Optional
+
+import http_client
+from http_client import HttpError, REQUEST_ERRORS
+from operation_tracker import OperationTracker
+
+
+class FireFlyNode:
+    """
+    The deploy-time REST calls against one FireFly node
+
+    Args:
+        label: Network name, for log lines
+        base_url: FireFly REST API base URL (…/api/v1)
+        namespace: FireFly namespace
+        confirm: Block every deploy request until its block is mined (the
+            original mode) instead of polling operations together
+    """
+
+    def __init__(self, label: str, base_url: str, namespace: str = "default",
+                 confirm: bool = False) -> None:
+        self.label = label
+        self.base_url = base_url
+        self.namespace = namespace
+        self.confirm = confirm
+        self.tracker = OperationTracker(base_url, namespace)
+
+    async def call(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                   params: Optional[Dict] = None) -> Any:
+        """Request a namespace endpoint and return the parsed body"""
+        response = await http_client.get_client().request(
+            method, f"{self.base_url}/namespaces/{self.namespace}{endpoint}", data=data, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_or_none(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """GET an endpoint; None when FireFly answers 404"""
+        try:
+            return await self.call("GET", endpoint)
+        except HttpError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+
+    async def identity(self) -> Optional[str]:
+        """
+        Id the node reports on /status (its org's id if it has none); a
+        recreated stack reports a new one. None if the node cannot tell.
+        """
+        try:
+            status = await self.call("GET", "/status")
+        except REQUEST_ERRORS + (ValueError,):
+            return None
+        return (status.get("node") or {}).get("id") or (status.get("org") or {}).get("id")
+
+    async def exists(self, endpoint: str) -> bool:
+        """Whether a GET of the endpoint finds something"""
+        return await self.get_or_none(endpoint) is not None
+
+    async def api_matches(self, name: str, api_id: Optional[str] = None,
+                          address: Optional[str] = None) -> bool:
+        """Whether API `name` exists with this id and/or contract address"""
+        api = await self.get_or_none(f"/apis/{name}")
+        return api is not None \
+            and (api_id is None or api.get("id") == api_id) \
+            and (address is None or (api.get("location") or {}).get("address") == address)
+
+    # Contracts
+
+    async def deploy(self, name: str, artifact: Dict[str, Any], inputs: List[Any]) -> Optional[str]:
+        """
+        Endpoint: POST /namespaces/{namespace}/contracts/deploy
+
+        Returns:
+            Address of the deployed contract
+        """
+        operation = await self.call("POST", "/contracts/deploy", {
+            "contract": artifact["bytecode"], "definition": artifact["abi"], "input": inputs},
+            params={"confirm": "true"} if self.confirm else None)
+        if not self.confirm:
+            operation = await self.tracker.wait(operation["id"])
+        address = await self.tracker.contract_address(operation)
+        print(f"✅ [{self.label}] {name} deployed at {address}")
+        return address
+
+    async def ensure_interface(self, name: str, version: str, abi: List[Any]) -> Optional[str]:
+        """
+        Generate the FireFly interface for an ABI and broadcast it unless it
+        already exists
+
+        Endpoints: POST /namespaces/{namespace}/contracts/interfaces/generate,
+        POST /namespaces/{namespace}/contracts/interfaces
+        """
+        existing = await self.get_or_none(f"/contracts/interfaces/{name}/{version}")
+        if existing:
+            return existing["id"]
+        interface = await self.call("POST", "/contracts/interfaces/generate",
+                                    {"name": name, "version": version, "input": {"abi": abi}},
+                                    params={"confirm": "true"})
+        created = await self.call("POST", "/contracts/interfaces", interface,
+                                  params={"confirm": "true", "publish": "true"})
+        print(f"✅ [{self.label}] Interface {name} {version}: {created.get('id')}")
+        return created.get("id")
+
+    async def ensure_api(self, name: str, interface_id: Optional[str],
+                         address: Optional[str]) -> Optional[str]:
+        """
+        Create the HTTP API for a deployed contract unless it already exists
+
+        Endpoint: POST /namespaces/{namespace}/apis
+
+        Raises:
+            ValueError: The interface id or contract address is missing
+        """
+        existing = await self.get_or_none(f"/apis/{name}")
+        if existing:
+            return existing["id"]
+        if not interface_id or not address:
+            raise ValueError(f"API {name} needs an interface id and a contract address "
+                             f"(got {interface_id!r}, {address!r})")
+        created = await self.call("POST", "/apis", {
+            "name": name, "interface": {"id": interface_id}, "location": {"address": address}},
+            params={"confirm": "true", "publish": "true"})
+        print(f"✅ [{self.label}] API {name}: {created.get('id')}")
+        return created.get("id")
+
+    # Events
+
+    async def create_listener(self, interface_id: str, address: str, event: str,
+                              topic: str) -> Optional[str]:
+        """Endpoint: POST /namespaces/{namespace}/contracts/listeners"""
+        listener = await self.call("POST", "/contracts/listeners", {
+            "interface": {"id": interface_id},
+            "location": {"address": address},
+            "eventPath": event,
+            "options": {"firstEvent": "newest"},
+            "topic": topic,
+        })
+        print(f"✅ [{self.label}] Listener {event}: {listener.get('id')}")
+        return listener.get("id")
+
+    async def create_subscription(self, listener_id: str, name: str) -> Optional[str]:
+        """Endpoint: POST /namespaces/{namespace}/subscriptions (WebSocket transport)"""
+        subscription = await self.call("POST", "/subscriptions", {
+            "namespace": self.namespace,
+            "name": name,
+            "transport": "websockets",
+            "filter": {
+                "events": "blockchain_event_received",
+                "blockchainevent": {"listener": listener_id},
+            },
+            "options": {"firstEvent": "newest"},
+        })
+        print(f"✅ [{self.label}] Subscription {name}: {subscription.get('id')}")
+        return subscription.get("id")
+
+    # Invocation
+
+    async def invoke(self, api: str, method: str, inputs: Dict[str, Any]) -> Optional[str]:
+        """
+        Invoke an API method and wait until its transaction has Succeeded
+
+        Endpoint: POST /namespaces/{namespace}/apis/{api}/invoke/{method}
+
+        Returns:
+            The operation id
+        """
+        operation = await self.call("POST", f"/apis/{api}/invoke/{method}", {"input": inputs})
+        await self.tracker.wait(operation["id"])
+        print(f"✅ [{self.label}] {api}.{method}: {operation['id']}")
+        return operation["id"]
+
+    async def close(self) -> None:
+        await self.tracker.close()
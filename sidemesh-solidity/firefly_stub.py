@@ -0,0 +1,634 @@
+"""
+Local FireFly stand-in for offline benchmarking and tests
+
+Serves the parts of the FireFly REST API and WebSocket event stream this kit
+uses, for a primary node (doCross, Register) and a network node (Changed
+events), backed by a simulated chain instead of a real stack:
+
+- invokes and deploys become operations that are mined into the next block
+  every --block-interval seconds; an operation is Pending until then
+- a mined doCross emits Changed(key=txId hex, value=args) on the network
+  node, which stores it (blockchainevents, contracts/query) and delivers it
+  to the WebSocket consumers after --delivery-latency
+- every REST response is delayed by --api-latency
+
+Faults can be injected to check the harness's loss accounting: --error-rate
+rejects invokes with HTTP 500, --failed-rate mines operations as Failed
+(no event), --drop-rate stores an event but never delivers it, and
+--dup-rate delivers it twice. What was injected is counted and served at
+GET /stub/stats, and printed on exit.
+
+Latency specs are a number of seconds or <distribution>:<params>:
+fixed:S, uniform:LO,HI, exp:MEAN, normal:MEAN,SD or lognormal:MEDIAN,SIGMA.
+
+Usage:
+    python firefly_stub.py --block-interval 1 --drop-rate 0.01 --dup-rate 0.01
+    python benchmark.py --target 1000 --rate 200
+
+Prerequisites:
+- aiohttp library: pip install aiohttp
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import signal
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from aiohttp import WSMsgType, web
+
+DEFAULT_PRIMARY_PORT = 5000
+DEFAULT_NETWORK_PORT = 5003
+DEFAULT_BLOCK_INTERVAL = 1.0  # seconds
+DEFAULT_API_LATENCY = "0.005"
+DEFAULT_DELIVERY_LATENCY = "0.01"
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exp", "normal", "lognormal")
+
+
+def parse_latency(spec: str, rng: random.Random) -> Callable[[], float]:
+    """
+    Sampler for a latency spec (see module docstring)
+
+    Args:
+        spec: Seconds, or <distribution>:<comma-separated params>
+        rng: Random source the sampler draws from
+
+    Returns:
+        Function returning one non-negative latency in seconds
+    """
+    name, _, params = spec.partition(":")
+    if not params:
+        name, params = "fixed", spec
+    try:
+        values = [float(value) for value in params.split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec}")
+    expected = {"fixed": 1, "uniform": 2, "exp": 1, "normal": 2, "lognormal": 2}
+    if name not in expected or len(values) != expected[name]:
+        raise ValueError(f"Invalid latency spec: {spec} "
+                         f"(expected one of {', '.join(LATENCY_DISTRIBUTIONS)})")
+
+    if name == "fixed":
+        return lambda: values[0]
+    if name == "uniform":
+        return lambda: rng.uniform(values[0], values[1])
+    if name == "exp":
+        return lambda: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    if name == "normal":
+        return lambda: max(0.0, rng.gauss(values[0], values[1]))
+    return lambda: rng.lognormvariate(math.log(values[0]), values[1])
+
+
+def firefly_time(timestamp: float) -> str:
+    """Epoch seconds as a FireFly RFC3339 timestamp"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def parse_firefly_time(value: str) -> float:
+    """FireFly RFC3339 timestamp as epoch seconds"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def time_filter(spec: str) -> Callable[[float], bool]:
+    """
+    Predicate for a FireFly timestamp query filter (">=2024-01-01T00:00:00Z")
+
+    Raises:
+        ValueError: Not an optional comparison operator and an RFC3339 time
+    """
+    for operator, compare in ((">=", float.__ge__), ("<=", float.__le__),
+                              (">", float.__gt__), ("<", float.__lt__)):
+        if spec.startswith(operator):
+            bound = parse_firefly_time(spec[len(operator):])
+            return lambda timestamp: compare(timestamp, bound)
+    bound = parse_firefly_time(spec)
+    return lambda timestamp: timestamp == bound
+
+
+def random_hex(num_bytes: int, rng: random.Random) -> str:
+    return "0x" + rng.getrandbits(num_bytes * 8).to_bytes(num_bytes, "big").hex()
+
+
+class StubNode:
+    """
+    One FireFly node: its operations, definitions, stored events and
+    WebSocket consumers
+
+    Args:
+        name: Label used in logs and stats
+        namespace: FireFly namespace served
+    """
+
+    def __init__(self, name: str, namespace: str) -> None:
+        self.name = name
+        self.namespace = namespace
+        # Reported on /status; a restarted stub is a recreated stack
+        self.id = str(uuid.uuid4())
+        self.operations: Dict[str, Dict[str, Any]] = {}
+        self.interfaces: Dict[str, Dict[str, Any]] = {}
+        self.apis: Dict[str, Dict[str, Any]] = {}
+        self.listeners: Dict[str, Dict[str, Any]] = {}
+        self.subscriptions: Dict[str, Dict[str, Any]] = {}
+        self.events: List[Dict[str, Any]] = []
+        self.storage: Dict[str, str] = {}
+        # Durable subscription name -> connections sharing it (round-robin)
+        self.durable: Dict[str, List[web.WebSocketResponse]] = {}
+        self.ephemeral: List[web.WebSocketResponse] = []
+        self.next_consumer: Counter = Counter()
+
+    def consumers(self) -> List[web.WebSocketResponse]:
+        """Connections that receive the next event: one per durable subscription, all ephemerals"""
+        targets = list(self.ephemeral)
+        for name, connections in self.durable.items():
+            if connections:
+                index = self.next_consumer[name] % len(connections)
+                self.next_consumer[name] += 1
+                targets.append(connections[index])
+        return targets
+
+    def drop_consumer(self, ws: web.WebSocketResponse) -> None:
+        if ws in self.ephemeral:
+            self.ephemeral.remove(ws)
+        for connections in self.durable.values():
+            if ws in connections:
+                connections.remove(ws)
+
+
+NODE_KEY = web.AppKey("node", StubNode)
+
+
+class FireFlyStub:
+    """
+    Primary and network stand-in nodes over one simulated chain
+
+    Args:
+        namespace: FireFly namespace served by both nodes
+        block_interval: Seconds between blocks (0 mines every operation at once)
+        api_latency: Latency spec for every REST response
+        delivery_latency: Latency spec from block to WebSocket delivery
+        error_rate: Fraction of invokes rejected with HTTP 500
+        failed_rate: Fraction of operations mined as Failed
+        drop_rate: Fraction of events stored but never delivered
+        dup_rate: Fraction of events delivered twice
+        seed: Random seed for latencies and fault injection
+    """
+
+    def __init__(
+        self,
+        namespace: str = "default",
+        block_interval: float = DEFAULT_BLOCK_INTERVAL,
+        api_latency: str = DEFAULT_API_LATENCY,
+        delivery_latency: str = DEFAULT_DELIVERY_LATENCY,
+        error_rate: float = 0.0,
+        failed_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        dup_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.namespace = namespace
+        self.block_interval = block_interval
+        self.error_rate = error_rate
+        self.failed_rate = failed_rate
+        self.drop_rate = drop_rate
+        self.dup_rate = dup_rate
+        self.rng = random.Random(seed)
+        self.api_latency = parse_latency(api_latency, self.rng)
+        self.delivery_latency = parse_latency(delivery_latency, self.rng)
+        self.primary = StubNode("primary", namespace)
+        self.network = StubNode("network", namespace)
+        self.block_number = 0
+        self.stats: Counter = Counter()
+        # (node, operation, effect run once the operation is mined)
+        self._mempool: List[tuple] = []
+        self._mempool_ready = asyncio.Event()
+        self._block_mined = asyncio.Event()
+        self._runners: List[web.AppRunner] = []
+        self._miner: Optional[asyncio.Task] = None
+        self._deliveries: set = set()
+
+    # Lifecycle
+
+    async def start(self, host: str = "127.0.0.1", primary_port: int = DEFAULT_PRIMARY_PORT,
+                    network_port: int = DEFAULT_NETWORK_PORT) -> "FireFlyStub":
+        """Serve the primary and network nodes and start mining"""
+        for node, port in ((self.primary, primary_port), (self.network, network_port)):
+            runner = web.AppRunner(self.create_app(node))
+            await runner.setup()
+            await web.TCPSite(runner, host, port).start()
+            self._runners.append(runner)
+        self._miner = asyncio.create_task(self._mine())
+        return self
+
+    async def close(self) -> None:
+        if self._miner is not None:
+            self._miner.cancel()
+            await asyncio.gather(self._miner, return_exceptions=True)
+        for task in list(self._deliveries):
+            task.cancel()
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners = []
+
+    async def __aenter__(self) -> "FireFlyStub":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def create_app(self, node: StubNode) -> web.Application:
+        """aiohttp application serving `node`"""
+
+        @web.middleware
+        async def api_latency(request: web.Request, handler):
+            if request.path.startswith("/api/"):
+                await asyncio.sleep(self.api_latency())
+            return await handler(request)
+
+        app = web.Application(middlewares=[api_latency])
+        app[NODE_KEY] = node
+        prefix = "/api/v1/namespaces/{namespace}"
+        app.router.add_post(prefix + "/apis/{api}/invoke/{method}", self.handle_invoke)
+        app.router.add_post(prefix + "/contracts/deploy", self.handle_deploy)
+        app.router.add_get(prefix + "/operations", self.handle_list_operations)
+        app.router.add_get(prefix + "/operations/{id}", self.handle_get_operation)
+        app.router.add_post(prefix + "/contracts/interfaces/generate", self.handle_generate_interface)
+        app.router.add_post(prefix + "/contracts/interfaces", self.handle_create_interface)
+        app.router.add_get(prefix + "/contracts/interfaces/{name}/{version}", self.handle_get_interface)
+        app.router.add_get(prefix + "/contracts/interfaces/{id}", self.handle_get_interface_by_id)
+        app.router.add_post(prefix + "/apis", self.handle_create_api)
+        app.router.add_get(prefix + "/apis/{api}", self.handle_get_api)
+        app.router.add_post(prefix + "/contracts/listeners", self.handle_create_listener)
+        app.router.add_get(prefix + "/contracts/listeners/{id}", self.handle_get_listener)
+        app.router.add_post(prefix + "/subscriptions", self.handle_create_subscription)
+        app.router.add_get(prefix + "/subscriptions/{id}", self.handle_get_subscription)
+        app.router.add_get(prefix + "/status", self.handle_status)
+        app.router.add_get(prefix + "/blockchainevents", self.handle_get_events)
+        app.router.add_post(prefix + "/contracts/query", self.handle_query)
+        app.router.add_get("/ws", self.handle_ws)
+        app.router.add_get("/stub/stats", self.handle_stats)
+        return app
+
+    # Chain
+
+    def _submit(self, node: StubNode, op_type: str,
+                effect: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None
+                ) -> Dict[str, Any]:
+        """
+        Create a Pending operation that the next block settles
+
+        Args:
+            node: Node the operation was submitted to
+            op_type: FireFly operation type
+            effect: Run with the receipt when the operation succeeds; may
+                return the receipt's extraInfo
+
+        Returns:
+            The operation
+        """
+        operation = {
+            "id": str(uuid.uuid4()),
+            "namespace": node.namespace,
+            "type": op_type,
+            "status": "Pending",
+            "created": firefly_time(time.time()),
+        }
+        node.operations[operation["id"]] = operation
+        self._mempool.append((node, operation, effect))
+        self._mempool_ready.set()
+        self.stats["operations"] += 1
+        return operation
+
+    async def _mine(self) -> None:
+        while True:
+            if self.block_interval > 0:
+                await asyncio.sleep(self.block_interval)
+            else:
+                await self._mempool_ready.wait()
+            self._mempool_ready.clear()
+            batch, self._mempool = self._mempool, []
+            self.block_number += 1
+            self.stats["blocks"] += 1
+            for node, operation, effect in batch:
+                tx_hash = random_hex(32, self.rng)
+                receipt = {"blockNumber": str(self.block_number), "transactionHash": tx_hash}
+                if self.rng.random() < self.failed_rate:
+                    operation["status"] = "Failed"
+                    operation["error"] = "stub: injected transaction failure"
+                    self.stats["failed"] += 1
+                else:
+                    operation["status"] = "Succeeded"
+                    if effect is not None:
+                        effect_receipt = effect(receipt)
+                        if effect_receipt:
+                            receipt["extraInfo"] = effect_receipt
+                            if "contractAddress" in effect_receipt:
+                                operation["output"] = {"contractLocation": {
+                                    "address": effect_receipt["contractAddress"]}}
+                operation["detailedStatus"] = {"receipt": receipt}
+                operation["updated"] = firefly_time(time.time())
+            # Wake deploys waiting on confirm=true
+            self._block_mined.set()
+            self._block_mined = asyncio.Event()
+
+    async def _confirmed(self, operation: Dict[str, Any]) -> None:
+        while operation["status"] == "Pending":
+            await self._block_mined.wait()
+
+    def _emit(self, node: StubNode, name: str, output: Dict[str, Any],
+              receipt: Dict[str, Any]) -> None:
+        """Store a blockchain event on `node` and deliver it, subject to drop/dup injection"""
+        now = time.time()
+        blockchain_event = {
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "namespace": node.namespace,
+            "output": output,
+            "info": dict(receipt),
+            "timestamp": firefly_time(now),
+        }
+        node.events.append(blockchain_event)
+        self.stats["events"] += 1
+
+        if self.rng.random() < self.drop_rate:
+            self.stats["dropped"] += 1
+            return
+        copies = 2 if self.rng.random() < self.dup_rate else 1
+        if copies == 2:
+            self.stats["duplicated"] += 1
+        for _ in range(copies):
+            event = {
+                "id": str(uuid.uuid4()),
+                "type": "blockchain_event_received",
+                "namespace": node.namespace,
+                "created": firefly_time(now),
+                "blockchainEvent": blockchain_event,
+            }
+            task = asyncio.create_task(self._deliver(node, event, self.delivery_latency()))
+            self._deliveries.add(task)
+            task.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(self, node: StubNode, event: Dict[str, Any], delay: float) -> None:
+        await asyncio.sleep(delay)
+        message = json.dumps(event)
+        for ws in node.consumers():
+            try:
+                await ws.send_str(message)
+                self.stats["delivered"] += 1
+            except ConnectionError:
+                node.drop_consumer(ws)
+
+    # REST handlers
+
+    async def handle_invoke(self, request: web.Request) -> web.Response:
+        node: StubNode = request.app[NODE_KEY]
+        api, method = request.match_info["api"], request.match_info["method"]
+        body = await request.json()
+        self.stats[f"invoke:{api}.{method}"] += 1
+        if self.rng.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response({"error": "stub: injected server error"}, status=500)
+
+        effect = None
+        if api == "cross-chain" and method == "doCross":
+            args = body.get("input", {}).get("args")
+            if not isinstance(args, list) or len(args) < 2:
+                return web.json_response(
+                    {"error": "stub: doCross input.args needs [key, value]"}, status=400)
+            tx_key, value = args[:2]
+
+            def effect(receipt: Dict[str, Any]) -> None:
+                self.network.storage[tx_key] = value
+                self._emit(self.network, "Changed", {"key": tx_key, "value": value}, receipt)
+
+        operation = self._submit(node, "blockchain_invoke", effect)
+        if request.query.get("confirm") == "true":
+            await self._confirmed(operation)
+        return web.json_response(operation, status=202 if operation["status"] == "Pending" else 200)
+
+    async def handle_deploy(self, request: web.Request) -> web.Response:
+        node: StubNode = request.app[NODE_KEY]
+        await request.json()
+        self.stats["deploys"] += 1
+        address = random_hex(20, self.rng)
+        operation = self._submit(node, "blockchain_deploy",
+                                 lambda receipt: {"contractAddress": address})
+        if request.query.get("confirm") == "true":
+            await self._confirmed(operation)
+        return web.json_response(operation, status=202 if operation["status"] == "Pending" else 200)
+
+    async def handle_list_operations(self, request: web.Request) -> web.Response:
+        """Operations by id; repeated id parameters are ORed, as in FireFly"""
+        node: StubNode = request.app[NODE_KEY]
+        ids = request.query.getall("id", [])
+        operations = [node.operations[op_id] for op_id in ids if op_id in node.operations] \
+            if ids else list(node.operations.values())
+        self.stats["operation_polls"] += 1
+        return web.json_response(operations[:int(request.query.get("limit", 25))])
+
+    async def handle_get_operation(self, request: web.Request) -> web.Response:
+        operation = request.app[NODE_KEY].operations.get(request.match_info["id"])
+        if operation is None:
+            return web.json_response({"error": "FF10109: Operation not found"}, status=404)
+        return web.json_response(operation)
+
+    async def handle_generate_interface(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        abi = (body.get("input") or {}).get("abi") or []
+        return web.json_response({
+            "name": body.get("name"),
+            "version": body.get("version"),
+            "methods": [{"name": item.get("name")} for item in abi if item.get("type") == "function"],
+            "events": [{"name": item.get("name")} for item in abi if item.get("type") == "event"],
+        })
+
+    async def handle_create_interface(self, request: web.Request) -> web.Response:
+        node: StubNode = request.app[NODE_KEY]
+        interface = dict(await request.json(), id=str(uuid.uuid4()))
+        node.interfaces[f"{interface.get('name')}/{interface.get('version')}"] = interface
+        return web.json_response(interface)
+
+    async def handle_get_interface(self, request: web.Request) -> web.Response:
+        node: StubNode = request.app[NODE_KEY]
+        interface = node.interfaces.get(
+            f"{request.match_info['name']}/{request.match_info['version']}")
+        if interface is None:
+            return web.json_response({"error": "FF10109: Interface not found"}, status=404)
+        return web.json_response(interface)
+
+    async def handle_get_interface_by_id(self, request: web.Request) -> web.Response:
+        node: StubNode = request.app[NODE_KEY]
+        for interface in node.interfaces.values():
+            if interface.get("id") == request.match_info["id"]:
+                return web.json_response(interface)
+        return web.json_response({"error": "FF10109: Interface not found"}, status=404)
+
+    async def handle_create_api(self, request: web.Request) -> web.Response:
+        node: StubNode = request.app[NODE_KEY]
+        api = dict(await request.json(), id=str(uuid.uuid4()))
+        node.apis[api.get("name")] = api
+        return web.json_response(api)
+
+    async def handle_get_api(self, request: web.Request) -> web.Response:
+        api = request.app[NODE_KEY].apis.get(request.match_info["api"])
+        if api is None:
+            return web.json_response({"error": "FF10109: API not found"}, status=404)
+        return web.json_response(api)
+
+    async def handle_create_listener(self, request: web.Request) -> web.Response:
+        node: StubNode = request.app[NODE_KEY]
+        listener = dict(await request.json(), id=str(uuid.uuid4()))
+        node.listeners[listener["id"]] = listener
+        return web.json_response(listener)
+
+    async def handle_get_listener(self, request: web.Request) -> web.Response:
+        listener = request.app[NODE_KEY].listeners.get(request.match_info["id"])
+        if listener is None:
+            return web.json_response({"error": "FF10109: Listener not found"}, status=404)
+        return web.json_response(listener)
+
+    async def handle_create_subscription(self, request: web.Request) -> web.Response:
+        node: StubNode = request.app[NODE_KEY]
+        subscription = dict(await request.json(), id=str(uuid.uuid4()))
+        node.subscriptions[subscription.get("name")] = subscription
+        return web.json_response(subscription)
+
+    async def handle_get_subscription(self, request: web.Request) -> web.Response:
+        node: StubNode = request.app[NODE_KEY]
+        for subscription in node.subscriptions.values():
+            if subscription.get("id") == request.match_info["id"]:
+                return web.json_response(subscription)
+        return web.json_response({"error": "FF10109: Subscription not found"}, status=404)
+
+    async def handle_status(self, request: web.Request) -> web.Response:
+        node: StubNode = request.app[NODE_KEY]
+        return web.json_response({"namespace": {"name": node.namespace},
+                                  "node": {"name": node.name, "registered": True, "id": node.id}})
+
+    async def handle_get_events(self, request: web.Request) -> web.Response:
+        """Stored blockchain events, filtered by name and timestamp, paged by skip/limit"""
+        node: StubNode = request.app[NODE_KEY]
+        name = request.query.get("name")
+        try:
+            in_range = time_filter(request.query["timestamp"]) \
+                if "timestamp" in request.query else None
+        except ValueError:
+            return web.json_response(
+                {"error": f"stub: invalid timestamp filter {request.query['timestamp']!r}"},
+                status=400)
+        events = [event for event in node.events
+                  if (name is None or event["name"] == name)
+                  and (in_range is None or in_range(parse_firefly_time(event["timestamp"])))]
+        skip = int(request.query.get("skip", 0))
+        limit = int(request.query.get("limit", 25))
+        return web.json_response(events[skip:skip + limit])
+
+    async def handle_query(self, request: web.Request) -> web.Response:
+        """SimpleStorage.get(key) against the values doCross events wrote"""
+        node: StubNode = request.app[NODE_KEY]
+        body = await request.json()
+        key = (body.get("input") or {}).get("key")
+        return web.json_response({"output": node.storage.get(key, "")})
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats, block_number=self.block_number))
+
+    # WebSocket
+
+    async def handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        """Event stream: a "start" message joins a durable or ephemeral subscription"""
+        node: StubNode = request.app[NODE_KEY]
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    command = json.loads(message.data)
+                except json.JSONDecodeError:
+                    continue
+                if command.get("type") != "start":
+                    continue  # acks are implied by autoack
+                if command.get("ephemeral"):
+                    node.ephemeral.append(ws)
+                else:
+                    node.durable.setdefault(command.get("name"), []).append(ws)
+        finally:
+            node.drop_consumer(ws)
+        return ws
+
+
+def print_stats(stats: Counter) -> None:
+    print(f"\n{'='*80}")
+    print(f"📊 FireFly Stub Statistics")
+    print(f"{'='*80}")
+    for key in sorted(stats):
+        print(f"  {key}: {stats[key]}")
+    print(f"{'='*80}\n")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse stub command-line options"""
+    parser = argparse.ArgumentParser(
+        description="Local FireFly stand-in (primary + network node over a simulated chain)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind")
+    parser.add_argument("--primary-port", type=int, default=DEFAULT_PRIMARY_PORT,
+                        help="primary node port (doCross, Register)")
+    parser.add_argument("--network-port", type=int, default=DEFAULT_NETWORK_PORT,
+                        help="network node port (Changed events)")
+    parser.add_argument("--namespace", default="default", help="FireFly namespace served")
+    parser.add_argument("--block-interval", type=float, default=DEFAULT_BLOCK_INTERVAL,
+                        help="seconds between blocks (0 = mine each operation immediately)")
+    parser.add_argument("--api-latency", default=DEFAULT_API_LATENCY,
+                        help="REST response latency spec, e.g. 0.005 or lognormal:0.005,0.5")
+    parser.add_argument("--delivery-latency", default=DEFAULT_DELIVERY_LATENCY,
+                        help="block-to-WebSocket delivery latency spec")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of invokes rejected with HTTP 500")
+    parser.add_argument("--failed-rate", type=float, default=0.0,
+                        help="fraction of operations mined as Failed (no event)")
+    parser.add_argument("--drop-rate", type=float, default=0.0,
+                        help="fraction of events stored but never delivered")
+    parser.add_argument("--dup-rate", type=float, default=0.0,
+                        help="fraction of events delivered twice")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="random seed for latencies and fault injection")
+    return parser.parse_args()
+
+
+async def main(options: argparse.Namespace) -> None:
+    stub = FireFlyStub(
+        namespace=options.namespace,
+        block_interval=options.block_interval,
+        api_latency=options.api_latency,
+        delivery_latency=options.delivery_latency,
+        error_rate=options.error_rate,
+        failed_rate=options.failed_rate,
+        drop_rate=options.drop_rate,
+        dup_rate=options.dup_rate,
+        seed=options.seed,
+    )
+    await stub.start(options.host, options.primary_port, options.network_port)
+    print(f"🚀 FireFly stub serving primary on {options.host}:{options.primary_port}, "
+          f"network on {options.host}:{options.network_port} "
+          f"(block interval {options.block_interval:g}s)")
+    stop = asyncio.Event()
+    # Ctrl-C or a CI job's SIGTERM both end with the stats report
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(signum, stop.set)
+    try:
+        await stop.wait()
+    finally:
+        await stub.close()
+        print_stats(stub.stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
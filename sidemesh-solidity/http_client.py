@@ -0,0 +1,165 @@
+"""
+Shared async HTTP client for the FireFly REST API
+
+All scripts in this kit (benchmark, register and both deploy scripts) talk
+to FireFly through one pooled aiohttp session, so requests reuse keep-alive
+connections instead of opening a fresh TCP connection per call.
+
+Prerequisites:
+- aiohttp library: pip install aiohttp
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import aiohttp
+
+# Pool defaults (0 means "no limit" for the per-host cap, as in aiohttp)
+DEFAULT_POOL_SIZE = 100
+DEFAULT_PER_HOST_LIMIT = 0
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+DEFAULT_REQUEST_TIMEOUT = 120.0
+
+
+class ApiResponse:
+    """Fully-read HTTP response, usable after the connection is released"""
+
+    def __init__(self, status_code: int, url: str, body: bytes) -> None:
+        self.status_code = status_code
+        self.url = url
+        self.content = body
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise HttpError(
+                f"{self.status_code} Error for url: {self.url}", self)
+
+
+class HttpError(Exception):
+    """Raised for 4xx/5xx responses; the response is kept on the exception"""
+
+    def __init__(self, message: str, response: ApiResponse) -> None:
+        super().__init__(message)
+        self.response = response
+
+
+# Everything api_call() wrappers should treat as a failed request
+REQUEST_ERRORS = (HttpError, aiohttp.ClientError, asyncio.TimeoutError)
+
+
+class HttpClient:
+    """
+    Pooled keep-alive HTTP client
+
+    The underlying session is created lazily on first use, so it binds to
+    the event loop that actually issues the requests.
+
+    Args:
+        pool_size: Maximum number of open connections across all hosts
+        per_host_limit: Maximum open connections per host (0 = no limit)
+        keepalive_timeout: Seconds an idle connection stays in the pool
+        request_timeout: Total timeout for a single request in seconds
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ) -> None:
+        self.pool_size = pool_size
+        self.per_host_limit = per_host_limit
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.per_host_limit,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                headers={"Content-Type": "application/json"},
+            )
+        return self._session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict] = None,
+        params: Optional[Union[Dict, List[Tuple[str, str]]]] = None,
+    ) -> ApiResponse:
+        """
+        Send a request and read the whole body
+
+        Args:
+            method: HTTP method (GET, POST, DELETE)
+            url: Absolute request URL
+            data: JSON request body
+            params: Query parameters (a list of pairs to repeat a key)
+
+        Returns:
+            ApiResponse (not yet checked for HTTP errors)
+        """
+        session = self._get_session()
+        async with session.request(method, url, json=data, params=params) as response:
+            body = await response.read()
+            return ApiResponse(response.status, str(response.url), body)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "HttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+# Process-wide client shared by every api_call() in this kit
+_shared_client: Optional[HttpClient] = None
+
+
+def configure(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+) -> HttpClient:
+    """Replace the shared client with one using the given pool settings"""
+    global _shared_client
+    _shared_client = HttpClient(
+        pool_size, per_host_limit, keepalive_timeout, request_timeout)
+    return _shared_client
+
+
+def get_client() -> HttpClient:
+    """Return the shared client, creating it with defaults if needed"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = HttpClient()
+    return _shared_client
+
+
+async def close_client() -> None:
+    """Close the shared client's connection pool"""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
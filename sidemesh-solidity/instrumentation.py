@@ -0,0 +1,246 @@
+"""
+Harness self-overhead instrumentation
+
+When throughput plateaus, the limit can be FireFly or the benchmark process
+itself. HarnessMonitor runs alongside a benchmark and measures the client:
+
+- event-loop lag: a probe task sleeps for a fixed interval and records how
+  late it wakes up; a busy or blocked loop delays every send and event
+- queue depths: gauges such as the loop's default executor backlog, the
+  journal backlog and the number of live asyncio tasks, sampled every second
+- process CPU and RSS, sampled every second from /proc/self (falling back
+  to os.times() and resource where /proc is unavailable)
+
+diagnose() turns the summary into a verdict: the client was the bottleneck
+if the loop lagged, one core was saturated, a queue kept growing or the
+open-loop sender fell behind its offered rate.
+
+profiled() wraps a block in cProfile and writes a .prof file (open it
+with `python -m pstats FILE` or snakeviz).
+"""
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from latency_histogram import LatencyHistogram
+
+LAG_PROBE_INTERVAL = 0.05  # seconds between loop lag probes
+SAMPLE_INTERVAL = 1.0      # seconds between CPU/RSS/queue samples
+
+# Client-bottleneck thresholds
+MAX_LOOP_LAG_P99 = 0.05    # seconds
+MAX_CPU_PERCENT = 85.0     # % of one core (the event loop is single-threaded)
+MAX_QUEUE_DEPTH = 100      # items left in a queue at a sample
+MIN_ACHIEVED_RATE = 0.95   # fraction of the offered open-loop rate
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def read_process_cpu() -> float:
+    """CPU seconds (user + system) used by this process so far"""
+    try:
+        with open("/proc/self/stat", "r") as f:
+            # Fields after the parenthesised command name; utime and stime are 14 and 15
+            fields = f.read().rpartition(")")[2].split()
+        return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    except (OSError, IndexError, ValueError):
+        times = os.times()
+        return times.user + times.system
+
+
+def read_process_rss() -> int:
+    """Resident set size of this process in bytes (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except ImportError:
+            return 0
+
+
+def default_executor_depth() -> int:
+    """Work items queued on the running loop's default thread pool (DNS lookups, to_thread)"""
+    executor = getattr(asyncio.get_running_loop(), "_default_executor", None)
+    work_queue = getattr(executor, "_work_queue", None)
+    return work_queue.qsize() if work_queue is not None else 0
+
+
+def task_count() -> int:
+    """Live asyncio tasks on the running loop"""
+    return len(asyncio.all_tasks())
+
+
+class HarnessMonitor:
+    """
+    Loop lag probe and per-second process/queue sampler
+
+    Args:
+        gauges: Queue depths to sample, by name (each returns the current depth)
+        lag_interval: Seconds between lag probes
+        sample_interval: Seconds between CPU/RSS/gauge samples
+    """
+
+    def __init__(self, gauges: Optional[Dict[str, Callable[[], int]]] = None,
+                 lag_interval: float = LAG_PROBE_INTERVAL,
+                 sample_interval: float = SAMPLE_INTERVAL) -> None:
+        self.gauges = {"default_executor": default_executor_depth, "tasks": task_count}
+        self.gauges.update(gauges or {})
+        self.lag_interval = lag_interval
+        self.sample_interval = sample_interval
+        self.loop_lag = LatencyHistogram()
+        # One sample per interval: elapsed, cpu_percent, rss (bytes), queues
+        self.samples: List[Dict[str, Any]] = []
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> "HarnessMonitor":
+        self.loop_lag = LatencyHistogram()
+        self.samples = []
+        self._tasks = [asyncio.create_task(self._probe_lag()),
+                       asyncio.create_task(self._sample())]
+        return self
+
+    async def stop(self) -> Dict[str, Any]:
+        """Stop probing and return the summary"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        return self.summary()
+
+    async def _probe_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            self.loop_lag.record(max(0.0, loop.time() - expected))
+
+    async def _sample(self) -> None:
+        start = last_wall = time.monotonic()
+        last_cpu = read_process_cpu()
+        while True:
+            await asyncio.sleep(self.sample_interval)
+            wall, cpu = time.monotonic(), read_process_cpu()
+            self.samples.append({
+                "elapsed": wall - start,
+                "cpu_percent": (cpu - last_cpu) / (wall - last_wall) * 100 if wall > last_wall else 0.0,
+                "rss": read_process_rss(),
+                "queues": {name: gauge() for name, gauge in self.gauges.items()},
+            })
+            last_wall, last_cpu = wall, cpu
+
+    def summary(self) -> Dict[str, Any]:
+        """Plain, mergeable snapshot of everything measured (see merge_summaries)"""
+        cpu = [sample["cpu_percent"] for sample in self.samples]
+        return {
+            "loop_lag": self.loop_lag.to_dict(),
+            "cpu_percent_avg": sum(cpu) / len(cpu) if cpu else 0.0,
+            "cpu_percent_max": max(cpu, default=0.0),
+            "rss_max": max((sample["rss"] for sample in self.samples), default=read_process_rss()),
+            "queue_max": {name: max((sample["queues"][name] for sample in self.samples), default=0)
+                          for name in self.gauges},
+            "samples": self.samples,
+        }
+
+
+def merge_summaries(summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine worker processes' monitor summaries
+
+    Loop lag histograms merge; CPU, RSS and queue depths keep the worst
+    worker, since each worker has its own loop and core.
+    """
+    loop_lag = LatencyHistogram.from_dict(summaries[0]["loop_lag"])
+    for summary in summaries[1:]:
+        loop_lag.merge(LatencyHistogram.from_dict(summary["loop_lag"]))
+    return {
+        "loop_lag": loop_lag.to_dict(),
+        "cpu_percent_avg": max(summary["cpu_percent_avg"] for summary in summaries),
+        "cpu_percent_max": max(summary["cpu_percent_max"] for summary in summaries),
+        "rss_max": max(summary["rss_max"] for summary in summaries),
+        "queue_max": {name: max(summary["queue_max"].get(name, 0) for summary in summaries)
+                      for name in summaries[0]["queue_max"]},
+        "samples": [],
+    }
+
+
+def diagnose(harness: Dict[str, Any], offered_rate: Optional[float] = None,
+             achieved_rate: Optional[float] = None) -> List[str]:
+    """
+    Reasons to believe the client, not FireFly, limited the run
+
+    Args:
+        harness: HarnessMonitor summary (or a merge of several)
+        offered_rate: Target open-loop rate in tx/s (None for closed loop)
+        achieved_rate: Rate the sender actually achieved in tx/s
+
+    Returns:
+        One line per threshold crossed; empty if the client kept up
+    """
+    reasons = []
+    lag_p99 = LatencyHistogram.from_dict(harness["loop_lag"]).percentile(99)
+    if lag_p99 > MAX_LOOP_LAG_P99:
+        reasons.append(f"event-loop lag p99 {lag_p99 * 1000:.1f}ms "
+                       f"(> {MAX_LOOP_LAG_P99 * 1000:g}ms)")
+    if harness["cpu_percent_avg"] > MAX_CPU_PERCENT:
+        reasons.append(f"process CPU averaged {harness['cpu_percent_avg']:.0f}% of one core "
+                       f"(> {MAX_CPU_PERCENT:g}%)")
+    for name, depth in harness["queue_max"].items():
+        if name != "tasks" and depth > MAX_QUEUE_DEPTH:
+            reasons.append(f"{name} queue reached {depth} items (> {MAX_QUEUE_DEPTH})")
+    if offered_rate and achieved_rate is not None and achieved_rate < offered_rate * MIN_ACHIEVED_RATE:
+        reasons.append(f"sender achieved {achieved_rate:.2f} of {offered_rate:.2f} tx/s offered")
+    return reasons
+
+
+def print_harness_report(harness: Dict[str, Any], offered_rate: Optional[float] = None,
+                         achieved_rate: Optional[float] = None) -> None:
+    loop_lag = LatencyHistogram.from_dict(harness["loop_lag"])
+    print(f"\n🩺 Harness Overhead:")
+    if loop_lag.count:
+        print(f"  Event-Loop Lag: avg {loop_lag.mean * 1000:.2f}ms  "
+              f"p99 {loop_lag.percentile(99) * 1000:.2f}ms  max {loop_lag.max * 1000:.2f}ms")
+    print(f"  CPU: avg {harness['cpu_percent_avg']:.1f}%  max {harness['cpu_percent_max']:.1f}% "
+          f"of one core")
+    print(f"  RSS: max {harness['rss_max'] / (1024 * 1024):.1f} MiB")
+    print(f"  Queue Depth (max): " +
+          ", ".join(f"{name} {depth}" for name, depth in harness["queue_max"].items()))
+    reasons = diagnose(harness, offered_rate, achieved_rate)
+    if reasons:
+        print(f"  ⚠️  Client was the bottleneck:")
+        for reason in reasons:
+            print(f"     - {reason}")
+    else:
+        print(f"  ✅ Client kept up; limits measured here are the network's")
+
+
+@contextmanager
+def profiled(path: Optional[str], top: int = 20) -> Iterator[None]:
+    """
+    Run the enclosed block under cProfile and write the stats to `path`
+
+    Prints the `top` functions by cumulative time. A no-op when path is None.
+    """
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+        print(f"\n🔬 Profile saved to {path} (top {top} by cumulative time):")
+        print(out.getvalue())
@@ -0,0 +1,93 @@
+"""
+Asynchronous structured event journal
+
+Hot-path code calls EventJournal.record(), which only appends a fixed-schema
+tuple to a queue. A background thread drains the queue in batches and
+writes one JSON object per line (NDJSON), so file I/O and serialization
+never run on the benchmark's event loops.
+"""
+
+import json
+import queue
+import threading
+import time
+from typing import Any, List, Optional
+
+# Every journal line has exactly these keys
+JOURNAL_FIELDS = ("ts", "kind", "conn", "tx", "value", "elapsed", "detail")
+
+_STOP = object()
+
+
+class EventJournal:
+    """
+    Batched NDJSON journal written by a background thread
+
+    A journal without a path is disabled: record() returns immediately.
+
+    Args:
+        path: NDJSON output file (None disables the journal)
+        batch_size: Maximum records written per batch
+        flush_interval: Seconds between flushes while records trickle in
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: int = 1024,
+                 flush_interval: float = 0.5) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = False
+        self.written = 0
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "EventJournal":
+        if self.path and self._thread is None:
+            self.enabled = True
+            self._thread = threading.Thread(
+                target=self._run, daemon=True, name="EventJournal")
+            self._thread.start()
+        return self
+
+    def record(self, kind: str, conn: Optional[str] = None, tx: Optional[str] = None,
+               value: Optional[str] = None, elapsed: Optional[float] = None,
+               detail: Any = None) -> None:
+        """Queue one record; never blocks and never touches the file"""
+        if self.enabled:
+            self._queue.put(
+                (time.time(), kind, conn, tx, value, elapsed, detail))
+
+    def backlog(self) -> int:
+        """Records queued but not yet written"""
+        return self._queue.qsize()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write out everything queued so far and stop the writer thread"""
+        if self._thread is not None:
+            self.enabled = False
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        with open(self.path, "a") as f:
+            stopping = False
+            while not stopping:
+                batch: List[tuple] = []
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                    while item is not _STOP:
+                        batch.append(item)
+                        if len(batch) >= self.batch_size:
+                            break
+                        item = self._queue.get_nowait()
+                    else:
+                        stopping = True
+                except queue.Empty:
+                    pass
+
+                if batch:
+                    f.write("".join(json.dumps(dict(zip(JOURNAL_FIELDS, record)), default=str) + "\n"
+                                    for record in batch))
+                    f.flush()
+                    self.written += len(batch)
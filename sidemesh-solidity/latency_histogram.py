@@ -0,0 +1,205 @@
+"""
+Fixed-memory latency histogram with HDR-style log-linear buckets
+
+Latencies are recorded as integer microseconds into buckets whose width
+grows with the value, so every recorded value keeps the configured number
+of significant figures while memory stays constant however many samples
+are recorded. Histograms serialize to plain dicts and merge bucket by
+bucket, so results from several runs or processes combine exactly.
+
+Usage:
+    python latency_histogram.py run1.json run2.json ...
+"""
+
+import json
+import math
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+_US_PER_SECOND = 1_000_000
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram
+
+    Args:
+        highest_seconds: Largest trackable latency; larger values are clamped
+        significant_figures: Decimal precision kept for every value (1-5)
+    """
+
+    def __init__(self, highest_seconds: float = 3600.0, significant_figures: int = 3) -> None:
+        if not 1 <= significant_figures <= 5:
+            raise ValueError(
+                f"significant_figures must be between 1 and 5, got {significant_figures}")
+        self.highest_seconds = highest_seconds
+        self.significant_figures = significant_figures
+
+        self._highest = int(highest_seconds * _US_PER_SECOND)
+        largest_single_unit = 2 * 10 ** significant_figures
+        sub_bucket_count_magnitude = math.ceil(math.log2(largest_single_unit))
+        self._sub_bucket_half_count_magnitude = sub_bucket_count_magnitude - 1
+        self._sub_bucket_count = 1 << sub_bucket_count_magnitude
+        self._sub_bucket_half_count = self._sub_bucket_count // 2
+        self._sub_bucket_mask = self._sub_bucket_count - 1
+
+        bucket_count = 1
+        smallest_untrackable = self._sub_bucket_count
+        while smallest_untrackable <= self._highest:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        self._counts = array(
+            "Q", bytes(8 * (bucket_count + 1) * self._sub_bucket_half_count))
+
+        self.count = 0
+        self._sum = 0
+        self._min: Optional[int] = None
+        self._max = 0
+
+    # Bucket arithmetic (integer microseconds)
+
+    def _index_for(self, value: int) -> int:
+        bucket_index = (value | self._sub_bucket_mask).bit_length() - \
+            (self._sub_bucket_half_count_magnitude + 1)
+        sub_bucket_index = value >> bucket_index
+        return ((bucket_index + 1) << self._sub_bucket_half_count_magnitude) + \
+            (sub_bucket_index - self._sub_bucket_half_count)
+
+    def _highest_equivalent(self, index: int) -> int:
+        bucket_index = (index >> self._sub_bucket_half_count_magnitude) - 1
+        sub_bucket_index = (index & (self._sub_bucket_half_count - 1)) + \
+            self._sub_bucket_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self._sub_bucket_half_count
+            bucket_index = 0
+        return (sub_bucket_index << bucket_index) + (1 << bucket_index) - 1
+
+    # Recording
+
+    def record(self, seconds: float, count: int = 1) -> None:
+        """Record a latency given in seconds"""
+        value = min(max(int(round(seconds * _US_PER_SECOND)), 0), self._highest)
+        self._counts[self._index_for(value)] += count
+        self.count += count
+        self._sum += value * count
+        if self._min is None or value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add another histogram's samples into this one"""
+        if (other.highest_seconds, other.significant_figures) != \
+                (self.highest_seconds, self.significant_figures):
+            raise ValueError("Cannot merge histograms with different layouts")
+        counts = self._counts
+        for index, bucket in enumerate(other._counts):
+            if bucket:
+                counts[index] += bucket
+        self.count += other.count
+        self._sum += other._sum
+        if other._min is not None and (self._min is None or other._min < self._min):
+            self._min = other._min
+        self._max = max(self._max, other._max)
+        return self
+
+    # Queries (seconds)
+
+    @property
+    def min(self) -> float:
+        return (self._min or 0) / _US_PER_SECOND
+
+    @property
+    def max(self) -> float:
+        return self._max / _US_PER_SECOND
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.count / _US_PER_SECOND if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """Latency at or below which `percentile` percent of samples fall"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(percentile / 100.0 * self.count))
+        running = 0
+        for index, bucket in enumerate(self._counts):
+            running += bucket
+            if running >= target:
+                value = min(self._highest_equivalent(index), self._max)
+                return value / _US_PER_SECOND
+        return self.max
+
+    def percentiles(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[float, float]:
+        return {p: self.percentile(p) for p in percentiles}
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, min, max and the default percentiles, in seconds"""
+        result = {"count": self.count, "mean": self.mean,
+                  "min": self.min, "max": self.max}
+        for p, value in self.percentiles().items():
+            result[f"p{p:g}"] = value
+        return result
+
+    def format_summary(self) -> str:
+        percentiles = "  ".join(f"p{p:g}: {value:.4f}s"
+                                for p, value in self.percentiles().items())
+        return f"{percentiles}  max: {self.max:.4f}s"
+
+    # Serialization
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sparse, JSON-friendly representation (only non-empty buckets)"""
+        return {
+            "highest_seconds": self.highest_seconds,
+            "significant_figures": self.significant_figures,
+            "count": self.count,
+            "sum_us": self._sum,
+            "min_us": self._min,
+            "max_us": self._max,
+            "buckets": [[index, bucket] for index, bucket in enumerate(self._counts) if bucket],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(data["highest_seconds"], data["significant_figures"])
+        for index, bucket in data["buckets"]:
+            histogram._counts[index] = bucket
+        histogram.count = data["count"]
+        histogram._sum = data["sum_us"]
+        histogram._min = data["min_us"]
+        histogram._max = data["max_us"]
+        return histogram
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "LatencyHistogram":
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+
+def main() -> None:
+    """Merge saved histograms and print the combined latency summary"""
+    paths = sys.argv[1:]
+    if not paths:
+        print(__doc__)
+        sys.exit(1)
+
+    merged = LatencyHistogram.load(paths[0])
+    for path in paths[1:]:
+        merged.merge(LatencyHistogram.load(path))
+
+    print(f"Merged {len(paths)} histogram(s), {merged.count} samples")
+    print(f"  Average: {merged.mean:.4f}s")
+    print(f"  Min: {merged.min:.4f}s")
+    print(f"  {merged.format_summary()}")
+
+
+if __name__ == "__main__":
+    main()
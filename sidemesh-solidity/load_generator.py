@@ -0,0 +1,169 @@
+"""
+Load generation schedules for the cross-chain benchmark
+
+Open-loop sends follow absolute deadlines computed from the start of the
+run, so scheduler jitter on one send never shifts the ones after it.
+Closed-loop runs keep a fixed number of transactions in flight instead.
+"""
+
+import asyncio
+import random
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional, Tuple
+
+ARRIVAL_DISTRIBUTIONS = ("constant", "poisson")
+
+
+class ArrivalSchedule:
+    """
+    Inter-arrival offsets for a target send rate
+
+    Args:
+        rate: Target offered load in transactions per second
+        distribution: "constant" (fixed spacing) or "poisson" (exponential gaps)
+        rng: Random source for Poisson gaps (seeded for reproducible runs)
+    """
+
+    def __init__(self, rate: float, distribution: str = "constant",
+                 rng: Optional[random.Random] = None) -> None:
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        if distribution not in ARRIVAL_DISTRIBUTIONS:
+            raise ValueError(f"Unsupported arrival distribution: {distribution}")
+        self.rate = rate
+        self.distribution = distribution
+        self.rng = rng or random.Random()
+        self._offset = 0.0
+        self._count = 0
+
+    def next_offset(self) -> float:
+        """Seconds from the start of the run at which the next send is due"""
+        if self.distribution == "poisson":
+            self._offset += self.rng.expovariate(self.rate)
+            return self._offset
+        # Constant spacing is computed from the index, not accumulated,
+        # so float rounding cannot drift over long runs
+        offset = self._count / self.rate
+        self._count += 1
+        return offset
+
+
+class OpenLoopStats:
+    """How closely the generator kept to its schedule"""
+
+    def __init__(self) -> None:
+        self.sent = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+
+    @property
+    def achieved_rate(self) -> float:
+        if not self.started_at or not self.finished_at or self.sent < 2:
+            return 0.0
+        duration = self.finished_at - self.started_at
+        return (self.sent - 1) / duration if duration > 0 else 0.0
+
+    @property
+    def avg_lag(self) -> float:
+        return self.total_lag / self.sent if self.sent else 0.0
+
+
+async def open_loop(
+    count: Optional[int],
+    rate: float,
+    distribution: str = "constant",
+    rng: Optional[random.Random] = None,
+    stats: Optional[OpenLoopStats] = None,
+    duration: Optional[float] = None,
+) -> AsyncIterator[Tuple[int, float]]:
+    """
+    Yield once per send, at each absolute send deadline
+
+    The caller must not block between iterations (start the transaction as
+    a task) or the offered load will fall behind the target rate. When the
+    loop is already late, the send is released immediately and the lag is
+    recorded in stats rather than pushing later deadlines back.
+
+    Args:
+        count: Number of sends (None for no limit)
+        rate: Target offered load in transactions per second
+        distribution: Inter-arrival distribution ("constant" or "poisson")
+        rng: Random source for Poisson gaps
+        stats: Optional OpenLoopStats to fill in
+        duration: Stop once the next deadline is this many seconds after
+            the start (None for no limit)
+
+    Yields:
+        (index, intended wall-clock send time)
+    """
+    schedule = ArrivalSchedule(rate, distribution, rng)
+    loop = asyncio.get_running_loop()
+    start_mono = loop.time()
+    start_wall = time.time()
+    if stats is not None:
+        stats.started_at = start_mono
+
+    index = 0
+    while count is None or index < count:
+        offset = schedule.next_offset()
+        if duration is not None and offset >= duration:
+            return
+        deadline = start_mono + offset
+        delay = deadline - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if stats is not None:
+            lag = max(0.0, loop.time() - deadline)
+            stats.sent += 1
+            stats.total_lag += lag
+            stats.max_lag = max(stats.max_lag, lag)
+            stats.finished_at = loop.time()
+
+        yield index, start_wall + offset
+        index += 1
+
+
+async def closed_loop(
+    count: Optional[int],
+    concurrency: int,
+    run_one: Callable[[int], Awaitable[None]],
+    duration: Optional[float] = None,
+) -> None:
+    """
+    Keep a fixed number of transactions in flight
+
+    Each of the `concurrency` slots starts its next transaction only once
+    run_one() for its previous one has returned, so the in-flight count is
+    exactly `concurrency` until fewer than that remain to be sent.
+
+    Args:
+        count: Total number of transactions to run (None for no limit)
+        concurrency: Number of slots (transactions in flight)
+        run_one: Coroutine function that runs transaction `index` to its
+            terminal state (completed, failed or timed out)
+        duration: Stop starting transactions this many seconds after the
+            start (None for no limit)
+    """
+    if concurrency <= 0:
+        raise ValueError(f"Concurrency must be positive, got {concurrency}")
+
+    if count is None and duration is None:
+        raise ValueError("Closed loop needs a count or a duration")
+
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + duration if duration is not None else None
+    next_index = 0
+
+    async def slot() -> None:
+        nonlocal next_index
+        while (count is None or next_index < count) and \
+                (stop_at is None or loop.time() < stop_at):
+            index = next_index
+            next_index += 1
+            await run_one(index)
+
+    slots = concurrency if count is None else min(concurrency, count)
+    await asyncio.gather(*(slot() for _ in range(slots)))
@@ -0,0 +1,159 @@
+"""
+Multi-process load generation for the cross-chain benchmark
+
+One interpreter runs every sender on a single event loop, so the harness is
+capped at one core. The coordinator here splits the run over W worker
+processes. Each worker has its share of the target and of the offered
+rate (or of the closed-loop concurrency), its own HTTP pool and its own
+tx-id prefix. Each worker consumes events through its own ephemeral
+subscription, which sees every Changed event, and drops events whose key
+carries another worker's prefix. The coordinator merges the workers'
+counters, histograms and per-transaction records into one report.
+"""
+
+import argparse
+import asyncio
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, List
+
+import benchmark
+from instrumentation import merge_summaries
+from latency_histogram import LatencyHistogram
+
+
+def split_evenly(total: int, parts: int, index: int) -> int:
+    """Share `index` of `total` split over `parts` (earlier parts get the remainder)"""
+    return total // parts + (1 if index < total % parts else 0)
+
+
+def worker_options(options: argparse.Namespace, index: int, workers: int) -> Dict[str, Any]:
+    """Command-line options for worker `index`, with its share of the load"""
+    share = dict(vars(options))
+    share["workers"] = 1
+    share["target"] = split_evenly(options.target, workers, index)
+    share["rate"] = options.rate / workers
+    if options.concurrency:
+        share["concurrency"] = split_evenly(options.concurrency, workers, index)
+    share["pool_size"] = max(1, -(-options.pool_size // workers))
+    if options.seed is not None:
+        share["seed"] = options.seed + index
+    # The coordinator saves the merged histogram
+    share["histogram_out"] = None
+    if options.journal:
+        root, ext = os.path.splitext(options.journal)
+        share["journal"] = f"{root}.w{index}{ext}"
+    if options.profile:
+        root, ext = os.path.splitext(options.profile)
+        share["profile"] = f"{root}.w{index}{ext}"
+    return share
+
+
+def run_worker(index: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Worker process entry point
+
+    Args:
+        index: Worker number, used as the tx-id namespace
+        options: Worker options from worker_options()
+
+    Returns:
+        The worker's run results (see benchmark.collect_results)
+    """
+    benchmark.TX_ID_PREFIX = f"tx-{index}-"
+    benchmark.TX_KEY_PREFIX = "0x" + benchmark.TX_ID_PREFIX.encode("utf-8").hex()
+    run = benchmark.uvloop.run if options["uvloop"] and benchmark.uvloop is not None \
+        else asyncio.run
+    return run(benchmark.run_with_listener(
+        argparse.Namespace(**options), ephemeral=True, report=False))
+
+
+def merge_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the results of several workers into one
+
+    Counts, rates and histograms add up; the run time is the longest
+    worker's. WebSocket connections are reported per worker; harness
+    overhead keeps the worst worker (see instrumentation.merge_summaries).
+    """
+    merged = {
+        "num_transactions": sum(r["num_transactions"] for r in results),
+        "sent": sum(r["sent"] for r in results),
+        "total_time": max(r["total_time"] for r in results),
+        "started_at": min(r["started_at"] for r in results),
+        "duration": results[0]["duration"],
+        "rate": sum(r["rate"] for r in results),
+        "arrival": results[0]["arrival"],
+        "concurrency": sum(r["concurrency"] or 0 for r in results) or None,
+        "achieved_rate": sum(r["achieved_rate"] for r in results),
+        "events_received": sum(r["events_received"] for r in results),
+        "unmatched_samples": [sample for r in results for sample in r["unmatched_samples"]],
+        "workers": len(results),
+    }
+
+    status_counts: Counter = Counter()
+    match_outcomes: Counter = Counter()
+    reconciled: Counter = Counter()
+    for r in results:
+        status_counts.update(r["status_counts"])
+        match_outcomes.update(r["match_outcomes"])
+        if r["reconciled"] is not None:
+            reconciled.update(r["reconciled"])
+    merged["status_counts"] = dict(status_counts)
+    merged["match_outcomes"] = {outcome: match_outcomes[outcome]
+                                for outcome in results[0]["match_outcomes"]}
+    reconciled_any = any(r["reconciled"] is not None for r in results)
+    merged["reconciled"] = {cls: reconciled[cls] for cls in benchmark.RECONCILE_CLASSES} \
+        if reconciled_any else None
+
+    latency = LatencyHistogram.from_dict(results[0]["latency"])
+    for r in results[1:]:
+        latency.merge(LatencyHistogram.from_dict(r["latency"]))
+    merged["latency"] = latency.to_dict()
+
+    merged["phases"] = {}
+    for phase in results[0]["phases"]:
+        histogram = LatencyHistogram.from_dict(results[0]["phases"][phase])
+        for r in results[1:]:
+            histogram.merge(LatencyHistogram.from_dict(r["phases"][phase]))
+        merged["phases"][phase] = histogram.to_dict()
+
+    merged["ws_connections"] = {f"w{index}/{connection_name}": stats
+                                for index, r in enumerate(results)
+                                for connection_name, stats in r["ws_connections"].items()}
+    merged["transactions"] = {column: [value for r in results for value in r["transactions"][column]]
+                              for column in results[0]["transactions"]}
+    merged["event_samples"] = [sample for r in results for sample in r["event_samples"]]
+    merged["harness"] = merge_summaries([r["harness"] for r in results])
+    return merged
+
+
+async def run_multiprocess(options: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run the benchmark over options.workers processes and print the merged report
+
+    Returns:
+        Merged results
+    """
+    workers = options.workers
+    print(f"\n🧵 Starting {workers} worker processes "
+          f"({options.target} target, {options.rate:.2f} tx/s total)")
+
+    loop = asyncio.get_running_loop()
+    # spawn: workers must not inherit the coordinator's event loop or threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as executor:
+        results = await asyncio.gather(*(
+            loop.run_in_executor(executor, run_worker, index,
+                                 worker_options(options, index, workers))
+            for index in range(workers)))
+
+    merged = merge_results(list(results))
+    benchmark.VERBOSE = options.verbose
+    benchmark.print_results(merged)
+
+    if options.histogram_out:
+        LatencyHistogram.from_dict(merged["latency"]).save(options.histogram_out)
+        print(f"\n💾 Merged latency histogram saved to {options.histogram_out}")
+    return merged
@@ -0,0 +1,159 @@
+"""
+Batched tracking of outstanding FireFly operations
+
+Deploying with confirm=true holds an HTTP request open until the block is
+mined and then needs a second round trip for the receipt, one contract at
+a time. Submitting without confirm returns the operation at once; an
+OperationTracker then waits for every outstanding operation together: one
+poll loop lists all of them per request (GET /operations?id=..&id=.., which
+FireFly ORs) until each one leaves Pending. Deploys submitted together can
+land in the same block, and the poll cost does not grow per contract.
+
+Prerequisites:
+- aiohttp library: pip install aiohttp
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import http_client
+from http_client import REQUEST_ERRORS
+
+DEFAULT_POLL_INTERVAL = 0.5  # seconds between polls
+DEFAULT_BATCH_SIZE = 50      # operation ids per list request
+DEFAULT_TIMEOUT = 300.0      # seconds an operation may stay Pending
+
+
+class OperationFailedError(Exception):
+    """A tracked operation finished as Failed; the operation is kept on the exception"""
+
+    def __init__(self, operation: Dict[str, Any]) -> None:
+        super().__init__(f"Operation {operation.get('id')} failed: {operation.get('error')}")
+        self.operation = operation
+
+
+class OperationTracker:
+    """
+    Wait for many FireFly operations with one poll loop
+
+    Args:
+        base_url: FireFly REST API base URL (…/api/v1)
+        namespace: FireFly namespace
+        poll_interval: Seconds between polls
+        batch_size: Operation ids per list request
+        timeout: Seconds wait() allows an operation to stay Pending
+    """
+
+    def __init__(self, base_url: str, namespace: str = "default",
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 timeout: float = DEFAULT_TIMEOUT) -> None:
+        self.base_url = base_url
+        self.namespace = namespace
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.polls = 0
+        self._waiting: Dict[str, asyncio.Future] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+    async def wait(self, operation_id: str) -> Dict[str, Any]:
+        """
+        Wait until an operation has Succeeded
+
+        Returns:
+            The operation
+
+        Raises:
+            OperationFailedError: The operation Failed
+            asyncio.TimeoutError: Still Pending after `timeout` seconds
+        """
+        future = self._waiting.get(operation_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._waiting[operation_id] = future
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        finally:
+            if not future.done():
+                self._waiting.pop(operation_id, None)
+
+    async def _poll(self) -> None:
+        """
+        Poll until nothing is outstanding
+
+        Request errors and unparseable responses are retried on the next
+        poll. If polling stops on any other error, every outstanding waiter
+        fails with it instead of waiting out its timeout.
+        """
+        try:
+            while self._waiting:
+                await asyncio.sleep(self.poll_interval)
+                ids = list(self._waiting)
+                for start in range(0, len(ids), self.batch_size):
+                    batch = ids[start:start + self.batch_size]
+                    try:
+                        operations = await self._list(batch)
+                    except REQUEST_ERRORS + (ValueError,) as e:
+                        print(f"⚠️  Operation poll failed, retrying: {e}")
+                        continue
+                    for operation in operations:
+                        self._settle(operation)
+        except Exception as e:
+            print(f"❌ Operation poller stopped: {e!r}")
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(e)
+            self._waiting.clear()
+
+    async def _list(self, operation_ids: List[str]) -> List[Dict[str, Any]]:
+        self.polls += 1
+        response = await http_client.get_client().request(
+            "GET",
+            f"{self.base_url}/namespaces/{self.namespace}/operations",
+            params=[("id", operation_id) for operation_id in operation_ids]
+            + [("limit", str(len(operation_ids)))],
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _settle(self, operation: Dict[str, Any]) -> None:
+        status = operation.get("status")
+        if status not in ("Succeeded", "Failed"):
+            return
+        future = self._waiting.pop(operation.get("id"), None)
+        if future is None or future.done():
+            return
+        if status == "Succeeded":
+            future.set_result(operation)
+        else:
+            future.set_exception(OperationFailedError(operation))
+
+    async def contract_address(self, operation: Dict[str, Any]) -> Optional[str]:
+        """
+        Address of the contract a Succeeded deploy operation created
+
+        Read from the operation's output when FireFly includes it there,
+        otherwise from the receipt (one GET with fetchstatus).
+        """
+        address = ((operation.get("output") or {}).get("contractLocation") or {}).get("address")
+        if address:
+            return address
+        response = await http_client.get_client().request(
+            "GET", f"{self.base_url}/namespaces/{self.namespace}/operations/{operation['id']}",
+            params={"fetchstatus": "true"})
+        response.raise_for_status()
+        return ((response.json().get("detailedStatus") or {}).get("receipt") or {}).get(
+            "extraInfo", {}).get("contractAddress")
+
+    async def close(self) -> None:
+        """Stop polling; waiters still outstanding are cancelled"""
+        if self._poller is not None:
+            self._poller.cancel()
+            await asyncio.gather(self._poller, return_exceptions=True)
+            self._poller = None
+        for future in self._waiting.values():
+            future.cancel()
+        self._waiting.clear()
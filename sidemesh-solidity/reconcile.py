@@ -0,0 +1,197 @@
+"""
+Post-run reconciliation of transactions that never completed
+
+A transaction that timed out or failed in the benchmark is not
+necessarily lost. For each one this module checks, in bulk, what actually
+happened on the networks and classifies it as:
+
+- late_delivered:        its Changed event reached the harness after the
+                         transaction had already been marked timeout
+- executed_event_missed: SimpleStorage on the network holds its value (found
+                         through the blockchain-events API or a get(key)
+                         query), but the event never reached the harness
+- reverted:              the doCross operation on the primary node failed
+- never_executed:        no trace of it on either network, and its doCross
+                         operation Succeeded or does not exist
+- unverified:            the lookups themselves failed, or the doCross
+                         operation is still in flight
+"""
+
+import asyncio
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import http_client
+from http_client import HttpError, REQUEST_ERRORS
+from tx_records import TxRecord
+
+LATE_DELIVERED = "late_delivered"
+EXECUTED_EVENT_MISSED = "executed_event_missed"
+REVERTED = "reverted"
+NEVER_EXECUTED = "never_executed"
+UNVERIFIED = "unverified"
+
+RECONCILE_CLASSES = (LATE_DELIVERED, EXECUTED_EVENT_MISSED,
+                     REVERTED, NEVER_EXECUTED, UNVERIFIED)
+
+# FireFly method definition for SimpleStorage.get(bytes) returns (bytes)
+SIMPLE_STORAGE_GET_METHOD = {
+    "name": "get",
+    "params": [{"name": "key", "schema": {"type": "string", "details": {"type": "bytes"}}}],
+    "returns": [{"name": "", "schema": {"type": "string", "details": {"type": "bytes"}}}],
+}
+
+
+async def fetch_blockchain_events(
+    base_url: str,
+    namespace: str,
+    event_name: str,
+    since: float,
+    page_size: int = 200,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Page through the blockchain-events API for events emitted since a time
+
+    Returns:
+        Blockchain event by output key (hex tx id)
+    """
+    since_rfc3339 = datetime.fromtimestamp(since, timezone.utc).isoformat()
+    events: Dict[str, Dict[str, Any]] = {}
+    skip = 0
+    while True:
+        response = await http_client.get_client().request(
+            "GET",
+            f"{base_url}/namespaces/{namespace}/blockchainevents",
+            params={
+                "name": event_name,
+                "timestamp": f">={since_rfc3339}",
+                "sort": "timestamp",
+                "limit": str(page_size),
+                "skip": str(skip),
+            },
+        )
+        response.raise_for_status()
+        page = response.json()
+        for event in page:
+            key = (event.get("output") or {}).get("key")
+            if key:
+                events[key] = event
+        if len(page) < page_size:
+            return events
+        skip += page_size
+
+
+async def query_stored_value(base_url: str, namespace: str,
+                             contract_address: str, key: str) -> Optional[str]:
+    """Read SimpleStorage.get(key) through the FireFly contract query API"""
+    response = await http_client.get_client().request(
+        "POST",
+        f"{base_url}/namespaces/{namespace}/contracts/query",
+        data={
+            "location": {"address": contract_address},
+            "method": SIMPLE_STORAGE_GET_METHOD,
+            "input": {"key": key},
+        },
+    )
+    response.raise_for_status()
+    result = response.json()
+    if isinstance(result, dict):
+        value = result.get("output", next(iter(result.values()), None))
+    else:
+        value = result
+    return value or None
+
+
+async def fetch_operation_status(base_url: str, namespace: str, operation_id: str) -> Optional[str]:
+    """Status of a FireFly operation (Pending, Succeeded or Failed)"""
+    response = await http_client.get_client().request(
+        "GET", f"{base_url}/namespaces/{namespace}/operations/{operation_id}")
+    response.raise_for_status()
+    return response.json().get("status")
+
+
+async def reconcile(
+    unresolved: Dict[str, TxRecord],
+    primary_base_url: str,
+    network_base_url: str,
+    namespace: str,
+    contract_address: str,
+    since: float,
+    event_name: str = "Changed",
+    concurrency: int = 20,
+) -> Counter:
+    """
+    Classify timed-out and failed transactions
+
+    Each record's reconciled attribute is set to its class.
+
+    Args:
+        unresolved: Records of timed-out/failed transactions by hex tx id
+        primary_base_url: Primary FireFly node (where doCross was invoked)
+        network_base_url: Network FireFly node (where SimpleStorage lives)
+        namespace: FireFly namespace
+        contract_address: SimpleStorage address on the network node
+        since: Benchmark start time; older blockchain events are ignored
+        event_name: Event that completes a transaction
+        concurrency: Maximum per-transaction lookups in flight
+
+    Returns:
+        Count of transactions per class
+    """
+    counts: Counter = Counter({cls: 0 for cls in RECONCILE_CLASSES})
+    remaining = {}
+    for key, record in unresolved.items():
+        if record.late_event_time is not None:
+            record.reconciled = LATE_DELIVERED
+            counts[LATE_DELIVERED] += 1
+        else:
+            remaining[key] = record
+
+    if not remaining:
+        return counts
+
+    try:
+        emitted = await fetch_blockchain_events(
+            network_base_url, namespace, event_name, since)
+    except REQUEST_ERRORS + (ValueError,) as e:
+        print(f"⚠️  Could not page blockchain events, falling back to queries: {e}")
+        emitted = {}
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def classify(key: str, record: TxRecord) -> str:
+        event = emitted.get(key)
+        if event is not None and (event.get("output") or {}).get("value") == record.args_hex:
+            return EXECUTED_EVENT_MISSED
+        async with semaphore:
+            try:
+                stored = await query_stored_value(
+                    network_base_url, namespace, contract_address, key)
+                if stored == record.args_hex:
+                    return EXECUTED_EVENT_MISSED
+                operation_id = record.operation_id
+                if not operation_id:
+                    return NEVER_EXECUTED
+                try:
+                    status = await fetch_operation_status(
+                        primary_base_url, namespace, operation_id)
+                except HttpError as e:
+                    if e.response.status_code == 404:
+                        return NEVER_EXECUTED
+                    raise
+                if status == "Failed":
+                    return REVERTED
+                if status == "Succeeded":
+                    return NEVER_EXECUTED
+                # Still Pending (or no status): it may yet execute
+                return UNVERIFIED
+            except REQUEST_ERRORS + (ValueError,):
+                return UNVERIFIED
+
+    keys = list(remaining)
+    classes = await asyncio.gather(*(classify(key, remaining[key]) for key in keys))
+    for key, cls in zip(keys, classes):
+        remaining[key].reconciled = cls
+        counts[cls] += 1
+    return counts
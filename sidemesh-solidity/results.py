@@ -0,0 +1,200 @@
+"""
+Saved benchmark runs and run-to-run regression comparison
+
+Every run is written as two files sharing a prefix:
+
+- <prefix>.summary.json: counters, throughput, latency and phase
+  percentiles, plus the histograms themselves so runs stay mergeable
+- <prefix>.tx.json.gz:   per-transaction table stored column by column
+  (one array per TX_COLUMNS entry), gzip-compressed
+
+Usage:
+    python results.py compare BASE.summary.json NEW.summary.json
+        [--max-throughput-drop PCT] [--max-latency-increase PCT]
+        [--max-timeout-increase PCT_POINTS]
+
+compare exits with status 1 when any check fails.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from latency_histogram import DEFAULT_PERCENTILES, LatencyHistogram
+from tx_records import STATUS_NAMES, TxRecord
+
+# Per-transaction columns, in file order
+TX_COLUMNS = ("tx_id", "status", "args_hex", "payload_bytes", "intended_time", "start_time",
+              "http_send_time", "http_ack_time", "event_created_time", "end_time",
+              "elapsed_time", "operation_id", "block_number", "tx_hash", "reconciled")
+
+# Default compare thresholds
+DEFAULT_MAX_THROUGHPUT_DROP = 5.0     # % below the base run
+DEFAULT_MAX_LATENCY_INCREASE = 10.0   # % above the base run, per percentile
+DEFAULT_MAX_TIMEOUT_INCREASE = 1.0    # percentage points above the base run
+
+
+def run_prefix(directory: str, label: Optional[str] = None) -> str:
+    """File prefix for a new run in `directory`, timestamped unless labelled"""
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, label or f"run-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+
+
+def summarize(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summary of a run result (see benchmark.collect_results)
+
+    Keeps every field except the per-transaction records, and adds the
+    derived numbers compare works from.
+    """
+    summary = {key: value for key, value in result.items() if key != "transactions"}
+    status_counts = result["status_counts"]
+    sent = result["sent"]
+    total_time = result["total_time"]
+    completed = status_counts.get("completed", 0)
+
+    latency = LatencyHistogram.from_dict(result["latency"])
+    summary["throughput"] = completed / total_time if total_time > 0 else 0.0
+    summary["timeout_rate"] = status_counts.get("timeout", 0) / sent if sent else 0.0
+    summary["failure_rate"] = status_counts.get("failed", 0) / sent if sent else 0.0
+    summary["latency_summary"] = latency.summary()
+    summary["phase_summary"] = {phase: LatencyHistogram.from_dict(histogram).summary()
+                                for phase, histogram in result["phases"].items()}
+    return summary
+
+
+def records_to_columns(records: Iterable[Tuple[str, TxRecord]]) -> Dict[str, List[Any]]:
+    """Turn (tx_id, record) pairs into one list per TX_COLUMNS entry, in start order"""
+    rows = sorted(records, key=lambda item: item[1].start_time)
+    columns: Dict[str, List[Any]] = {"tx_id": [tx_id for tx_id, _ in rows],
+                                     "status": [STATUS_NAMES[record.status] for _, record in rows]}
+    for column in TX_COLUMNS[2:]:
+        columns[column] = [getattr(record, column) for _, record in rows]
+    return columns
+
+
+def save_run(prefix: str, result: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Write a run's summary JSON and columnar per-transaction file
+
+    Returns:
+        (summary path, per-transaction path)
+    """
+    summary_path = f"{prefix}.summary.json"
+    tx_path = f"{prefix}.tx.json.gz"
+    with open(summary_path, "w") as f:
+        json.dump(summarize(result), f, indent=2, default=str)
+    with gzip.open(tx_path, "wt") as f:
+        json.dump({"columns": TX_COLUMNS, "data": result["transactions"]},
+                  f, separators=(",", ":"), default=str)
+    return summary_path, tx_path
+
+
+def load_summary(path: str) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def load_transactions(path: str) -> Dict[str, List[Any]]:
+    """Columns of a saved per-transaction file"""
+    with gzip.open(path, "rt") as f:
+        return json.load(f)["data"]
+
+
+def _percent_change(base: float, new: float) -> float:
+    if base == 0:
+        return 0.0 if new == 0 else float("inf")
+    return (new - base) / base * 100
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any],
+            max_throughput_drop: float = DEFAULT_MAX_THROUGHPUT_DROP,
+            max_latency_increase: float = DEFAULT_MAX_LATENCY_INCREASE,
+            max_timeout_increase: float = DEFAULT_MAX_TIMEOUT_INCREASE) -> List[Dict[str, Any]]:
+    """
+    Compare two run summaries
+
+    Args:
+        base: Summary of the reference run
+        new: Summary of the run under test
+        max_throughput_drop: Allowed throughput drop, % of base
+        max_latency_increase: Allowed increase per latency percentile, % of base
+        max_timeout_increase: Allowed increase of timeout + failure rate,
+            in percentage points
+
+    Returns:
+        One check per metric: metric, base, new, delta, limit, passed
+    """
+    checks = []
+
+    delta = _percent_change(base["throughput"], new["throughput"])
+    checks.append({"metric": "throughput (tx/s)", "base": base["throughput"],
+                   "new": new["throughput"], "delta": f"{delta:+.1f}%",
+                   "limit": f"-{max_throughput_drop:g}%",
+                   "passed": delta >= -max_throughput_drop})
+
+    for percentile in DEFAULT_PERCENTILES:
+        key = f"p{percentile:g}"
+        base_value = base["latency_summary"][key]
+        new_value = new["latency_summary"][key]
+        delta = _percent_change(base_value, new_value)
+        checks.append({"metric": f"{key} latency (s)", "base": base_value,
+                       "new": new_value, "delta": f"{delta:+.1f}%",
+                       "limit": f"+{max_latency_increase:g}%",
+                       "passed": delta <= max_latency_increase})
+
+    base_rate = (base["timeout_rate"] + base["failure_rate"]) * 100
+    new_rate = (new["timeout_rate"] + new["failure_rate"]) * 100
+    checks.append({"metric": "timeout+failed (%)", "base": base_rate, "new": new_rate,
+                   "delta": f"{new_rate - base_rate:+.2f}pp",
+                   "limit": f"+{max_timeout_increase:g}pp",
+                   "passed": new_rate - base_rate <= max_timeout_increase})
+    return checks
+
+
+def print_comparison(base_path: str, new_path: str, checks: List[Dict[str, Any]]) -> None:
+    print(f"\n{'='*80}")
+    print(f"📊 Run Comparison")
+    print(f"  Base: {base_path}")
+    print(f"  New:  {new_path}")
+    print(f"{'='*80}")
+    print(f"  {'metric':<20} {'base':>10} {'new':>10} {'delta':>10} {'limit':>8}")
+    for check in checks:
+        verdict = "✅ PASS" if check["passed"] else "❌ FAIL"
+        print(f"  {check['metric']:<20} {check['base']:>10.4f} {check['new']:>10.4f} "
+              f"{check['delta']:>10} {check['limit']:>8}  {verdict}")
+    print(f"{'='*80}\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Saved benchmark run tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compare_parser = commands.add_parser(
+        "compare", help="compare two runs' summaries with pass/fail thresholds")
+    compare_parser.add_argument("base", help="reference run summary JSON")
+    compare_parser.add_argument("new", help="run under test summary JSON")
+    compare_parser.add_argument("--max-throughput-drop", type=float,
+                                default=DEFAULT_MAX_THROUGHPUT_DROP,
+                                help="allowed throughput drop, %% of base")
+    compare_parser.add_argument("--max-latency-increase", type=float,
+                                default=DEFAULT_MAX_LATENCY_INCREASE,
+                                help="allowed latency increase per percentile, %% of base")
+    compare_parser.add_argument("--max-timeout-increase", type=float,
+                                default=DEFAULT_MAX_TIMEOUT_INCREASE,
+                                help="allowed timeout+failure rate increase, percentage points")
+    args = parser.parse_args()
+
+    checks = compare(load_summary(args.base), load_summary(args.new),
+                     args.max_throughput_drop, args.max_latency_increase,
+                     args.max_timeout_increase)
+    print_comparison(args.base, args.new, checks)
+    if not all(check["passed"] for check in checks):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Saturation sweep: the throughput-latency curve of a FireFly network pair
+
+Steps the open-loop offered rate (or the closed-loop concurrency) through a
+range. Every step sends for warmup + step duration seconds; only the
+transactions sent inside the measurement window count towards the step's
+throughput, latency percentiles and timeout/failure rate. The sweep stops
+at the first step whose p99 latency or timeout/failure rate passes its
+threshold.
+
+The knee is the step with the highest power (throughput / mean latency):
+past it, extra offered load buys less throughput than it costs in latency.
+The step that breached a threshold is overloaded by definition and is
+never reported as the knee.
+
+Usage:
+    python benchmark.py --sweep rate --sweep-start 10 --sweep-stop 200 --sweep-step 10
+    python benchmark.py --sweep concurrency --sweep-start 5 --sweep-stop 100 --sweep-step 5
+"""
+
+import argparse
+import csv
+from typing import Any, Dict, List, Optional
+
+import benchmark
+import results
+from latency_histogram import LatencyHistogram
+
+SWEEP_COLUMNS = ("step", "offered", "throughput", "sent", "completed", "timeout_rate",
+                 "failure_rate", "p50", "p99", "mean", "knee")
+
+
+def sweep_steps(start: float, stop: float, step: float) -> List[float]:
+    """Values from start to stop (inclusive) in increments of step"""
+    if step <= 0:
+        raise ValueError(f"Sweep step must be positive, got {step}")
+    steps = []
+    index = 0
+    # Computed from the index so float rounding cannot skip the last step
+    while start + index * step <= stop + step * 1e-9:
+        steps.append(start + index * step)
+        index += 1
+    return steps
+
+
+def step_metrics(result: Dict[str, Any], warmup: float, duration: float) -> Dict[str, Any]:
+    """
+    Measure one sweep step from a fixed-duration run's per-tx records
+
+    Args:
+        result: Results of run_benchmark(duration=warmup + duration)
+        warmup: Seconds at the start of the run that are not measured
+        duration: Length of the measurement window in seconds
+
+    Returns:
+        One row of the throughput-latency curve (SWEEP_COLUMNS, minus
+        step and knee)
+    """
+    window_start = result["started_at"] + warmup
+    window_end = window_start + duration
+    latency = LatencyHistogram()
+    sent = completed = timeouts = failures = 0
+    transactions = result["transactions"]
+    for intended_time, status, elapsed_time in zip(
+            transactions["intended_time"], transactions["status"], transactions["elapsed_time"]):
+        if intended_time is None or not window_start <= intended_time < window_end:
+            continue
+        sent += 1
+        if status == "completed":
+            completed += 1
+            latency.record(elapsed_time)
+        elif status == "timeout":
+            timeouts += 1
+        elif status == "failed":
+            failures += 1
+
+    return {
+        "offered": sent / duration,
+        "throughput": completed / duration,
+        "sent": sent,
+        "completed": completed,
+        "timeout_rate": timeouts / sent if sent else 0.0,
+        "failure_rate": failures / sent if sent else 0.0,
+        "p50": latency.percentile(50),
+        "p99": latency.percentile(99),
+        "mean": latency.mean,
+    }
+
+
+def find_knee(rows: List[Dict[str, Any]]) -> Optional[int]:
+    """Index of the row with the highest throughput / mean latency"""
+    best, best_power = None, 0.0
+    for index, row in enumerate(rows):
+        if row["mean"] > 0:
+            power = row["throughput"] / row["mean"]
+            if power > best_power:
+                best, best_power = index, power
+    return best
+
+
+def print_sweep_table(mode: str, rows: List[Dict[str, Any]]) -> None:
+    unit = "tx/s" if mode == "rate" else "tx in flight"
+    print(f"\n\n{'='*80}")
+    print(f"📈 Throughput-Latency Curve ({mode} sweep, step in {unit})")
+    print(f"{'='*80}")
+    print(f"  {'step':>10}  {'offered':>8}  {'tput':>8}  {'p50':>8}  {'p99':>8}  "
+          f"{'timeout':>8}  {'failed':>8}")
+    for row in rows:
+        marker = "  ◀ knee" if row["knee"] else ""
+        print(f"  {row['step']:>10g}  {row['offered']:>8.2f}  {row['throughput']:>8.2f}  "
+              f"{row['p50']:>7.3f}s  {row['p99']:>7.3f}s  {row['timeout_rate'] * 100:>7.2f}%  "
+              f"{row['failure_rate'] * 100:>7.2f}%{marker}")
+    print(f"{'='*80}\n")
+
+
+def write_sweep_csv(path: str, rows: List[Dict[str, Any]]) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SWEEP_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({column: row[column] for column in SWEEP_COLUMNS})
+
+
+async def run_sweep(options: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    Run the sweep described by the --sweep options and report the curve
+
+    Every step reuses one WebSocket listener and HTTP pool. With
+    --results-dir, each step's run is saved as <run prefix>-<mode>-<step>.
+
+    Returns:
+        One row per step that ran, the knee marked with knee=True
+    """
+    mode = options.sweep
+    run_seconds = options.warmup + options.step_duration
+    rows: List[Dict[str, Any]] = []
+    breached = False
+    prefix = results.run_prefix(options.results_dir, options.run_label) \
+        if options.results_dir else None
+
+    await benchmark.start_listener(options)
+    try:
+        for value in sweep_steps(options.sweep_start, options.sweep_stop, options.sweep_step):
+            print(f"\n🔬 Sweep step: {mode} = {value:g} "
+                  f"({options.warmup:g}s warmup + {options.step_duration:g}s measured)")
+            if mode == "rate":
+                result = await benchmark.run_benchmark(
+                    0, rate=value, arrival=options.arrival, seed=options.seed,
+                    reconcile_unresolved=False, report=False, duration=run_seconds)
+            else:
+                result = await benchmark.run_benchmark(
+                    0, concurrency=int(value), reconcile_unresolved=False,
+                    report=False, duration=run_seconds)
+
+            row = dict(step=value, knee=False,
+                       **step_metrics(result, options.warmup, options.step_duration))
+            rows.append(row)
+            if prefix is not None:
+                results.save_run(f"{prefix}-{mode}-{value:g}", result)
+            print(f"   offered {row['offered']:.2f} tx/s, throughput {row['throughput']:.2f} tx/s, "
+                  f"p50 {row['p50']:.3f}s, p99 {row['p99']:.3f}s, "
+                  f"timeout {row['timeout_rate'] * 100:.2f}%, failed {row['failure_rate'] * 100:.2f}%")
+
+            if row["p99"] > options.max_p99:
+                print(f"🛑 p99 {row['p99']:.3f}s exceeds {options.max_p99:g}s, stopping sweep")
+                breached = True
+                break
+            if row["timeout_rate"] + row["failure_rate"] > options.max_timeout_rate:
+                print(f"🛑 Timeout/failure rate exceeds {options.max_timeout_rate * 100:g}%, "
+                      f"stopping sweep")
+                breached = True
+                break
+    finally:
+        await benchmark.stop_listener()
+
+    # The breaching step is excluded from the knee search
+    knee = find_knee(rows[:-1] if breached else rows)
+    if knee is not None:
+        rows[knee]["knee"] = True
+
+    print_sweep_table(mode, rows)
+    if options.sweep_csv:
+        write_sweep_csv(options.sweep_csv, rows)
+        print(f"💾 Sweep curve saved to {options.sweep_csv}")
+    if prefix is not None:
+        print(f"💾 Sweep step runs saved: {prefix}-{mode}-*")
+    return rows
@@ -0,0 +1,77 @@
+"""
+CrossChainClient against the in-process FireFly stub
+
+Run from sidemesh-solidity/: python -m pytest tests
+"""
+
+import asyncio
+import os
+import socket
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crosschain_client import CrossChainClient, CrossChainError  # noqa: E402
+from tx_records import COMPLETED  # noqa: E402
+from firefly_stub import FireFlyStub  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_submissions_complete_on_their_events():
+    async def scenario():
+        primary_port, network_port = free_port(), free_port()
+        stub = await FireFlyStub(block_interval=0.05).start("127.0.0.1", primary_port, network_port)
+        try:
+            async with CrossChainClient(
+                    f"http://127.0.0.1:{primary_port}/api/v1", f"ws://127.0.0.1:{network_port}/ws",
+                    subscription=None, max_in_flight=3) as client:
+                records = await asyncio.wait_for(
+                    asyncio.gather(*(client.submit(os.urandom(2)) for _ in range(10))), 10)
+            assert all(record.status == COMPLETED for record in records)
+            assert all(record.operation_id for record in records)
+        finally:
+            await stub.close()
+
+    asyncio.run(scenario())
+
+
+def test_close_fails_every_pending_future():
+    async def scenario():
+        primary_port, network_port = free_port(), free_port()
+        # Blocks are never mined, so no submission can complete
+        stub = await FireFlyStub(block_interval=3600).start("127.0.0.1", primary_port, network_port)
+        try:
+            client = await CrossChainClient(
+                f"http://127.0.0.1:{primary_port}/api/v1", f"ws://127.0.0.1:{network_port}/ws",
+                subscription=None, max_in_flight=2).start()
+            futures = [client.submit(os.urandom(2)) for _ in range(20)]
+            await asyncio.sleep(0.2)  # some sent, the rest queued for a slot
+            await client.close()
+            assert all(future.done() for future in futures)
+            for future in futures:
+                assert isinstance(future.exception(), CrossChainError)
+            assert client.stats()["queued"] == 0
+        finally:
+            await stub.close()
+
+    asyncio.run(scenario())
+
+
+def test_start_timeout_stops_tasks():
+    async def scenario():
+        client = CrossChainClient("http://127.0.0.1:1/api/v1", f"ws://127.0.0.1:{free_port()}/ws")
+        try:
+            await client.start(connect_timeout=0.1)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            raise AssertionError("start() should time out without a WebSocket server")
+        assert client._tasks == []
+        await client.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,374 @@
+"""
+Declarative multi-network deployment
+
+One topology spec (JSON) describes the whole cross-chain mesh: every
+network's FireFly node, the contracts to deploy on it with their
+constructor arguments, interfaces, APIs and event subscriptions, and the
+invocations to register. The deployer turns the spec into one dependency
+graph (see deploy_graph.py) covering all networks, so every network is
+provisioned concurrently. It then cross-registers the mesh through each
+node's Register API: every network learns about every network
+(registerNetwork) and about every invocation (registerInvocation).
+
+Spec layout (see topology.json):
+
+    {
+      "namespace": "default",
+      "register_contract": "Register",
+      "contract_sets": {"<set>": [<contract>, ...]},
+      "networks": [{"id", "name", "role", "url", "public_url",
+                    "contracts": "<set>" | [...]}],
+      "invocations": [{"id", "network", "contract" | "address", "function"}]
+    }
+
+A contract is {"name", "artifact", "args", "version", "api", "events"}:
+- artifact: build/contracts/<artifact>.json (default: name), read through
+  the compact artifact cache
+- args: constructor arguments; "$Name" is the address of contract Name on
+  the same network
+- api: true (named after the contract) or an API name
+- an interface is generated for contracts with an API or events
+- events: [{"name", "topic"}], each wired to a listener and a
+  subscription named after the event
+
+A network's role is "primary" or "network" (the default). An invocation
+targets a contract deployed by the topology, or a fixed address.
+
+Steps are recorded in the deployment manifest per node (see
+deploy_manifest.py), so re-runs only touch what changed. Step names are
+the same whichever entry point runs them, so deploy_network.py,
+deploy_primary_network.py, register.py and this script reuse each other's
+results.
+
+Usage:
+    python topology.py [topology.json] [--networks 10,20] [--manifest PATH] [--redeploy]
+    python deploy_primary_network.py   # provision the primary network only
+    python deploy_network.py           # provision the other networks only
+    python register.py                 # cross-register already provisioned networks
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+import http_client
+from artifact_cache import load_artifact
+from deploy_graph import DeployGraph, DeployGraphError
+from deploy_manifest import DEFAULT_MANIFEST_PATH, DeployManifest, artifact_hash
+from firefly_api import FireFlyNode
+
+DEFAULT_SPEC_PATH = "topology.json"
+DEFAULT_VERSION = "v1.0.0"
+PRIMARY = "primary"
+NETWORK = "network"
+
+
+# ============================================================================
+# Spec
+# ============================================================================
+
+
+def load_topology(path: str) -> Dict[str, Any]:
+    """
+    Read a topology spec and resolve every network's contract list
+
+    Raises:
+        ValueError: The spec is inconsistent (unknown set, contract or network)
+    """
+    with open(path, "r") as f:
+        spec = json.load(f)
+    contract_sets = spec.get("contract_sets", {})
+    network_ids = set()
+    for network in spec["networks"]:
+        for field in ("id", "name", "url"):
+            if field not in network:
+                raise ValueError(f"Network {network} has no {field}")
+        if network["id"] in network_ids:
+            raise ValueError(f"Duplicate network id {network['id']}")
+        network_ids.add(network["id"])
+        contracts = network.get("contracts", [])
+        if isinstance(contracts, str):
+            if contracts not in contract_sets:
+                raise ValueError(f"Network {network['id']} uses unknown contract set {contracts}")
+            contracts = contract_sets[contracts]
+        network["contracts"] = contracts
+        names = {contract["name"] for contract in contracts}
+        for contract in contracts:
+            for arg in contract.get("args", []):
+                if isinstance(arg, str) and arg.startswith("$") and arg[1:] not in names:
+                    raise ValueError(f"{contract['name']} on network {network['id']} refers to "
+                                     f"unknown contract {arg[1:]}")
+        network.setdefault("public_url", network["url"].split("/api/")[0])
+        if network.setdefault("role", NETWORK) not in (PRIMARY, NETWORK):
+            raise ValueError(f"Network {network['id']} has unknown role {network['role']}")
+
+    register = spec.setdefault("register_contract", "Register")
+    for network in spec["networks"]:
+        if not any(contract["name"] == register and contract.get("api")
+                   for contract in network["contracts"]):
+            raise ValueError(f"Network {network['id']} has no {register} contract with an API")
+    for invocation in spec.get("invocations", []):
+        target = next((network for network in spec["networks"]
+                       if network["id"] == invocation["network"]), None)
+        if target is None:
+            raise ValueError(f"Invocation {invocation['id']} targets unknown network "
+                             f"{invocation['network']}")
+        if "address" in invocation:
+            continue
+        if not any(contract["name"] == invocation.get("contract")
+                   for contract in target["contracts"]):
+            raise ValueError(f"Invocation {invocation['id']} targets unknown contract "
+                             f"{invocation['contract']} on network {invocation['network']}")
+    return spec
+
+
+def api_name(contract: Dict[str, Any]) -> Optional[str]:
+    api = contract.get("api")
+    return contract["name"] if api is True else api or None
+
+
+
+
+# ============================================================================
+# Graph
+# ============================================================================
+
+
+def add_provision_steps(graph: DeployGraph, network: Dict[str, Any], node: FireFlyNode,
+                        manifest: Optional[DeployManifest]) -> None:
+    """
+    Contracts, interfaces, APIs, listeners and subscriptions of one network
+
+    Step names are "<network id>/<contract>/address|interface|api" and
+    "<network id>/<event>/listener|subscription".
+    """
+    net = network["id"]
+    for contract in network["contracts"]:
+        name = contract["name"]
+        artifact = load_artifact(contract.get("artifact", name))
+        version = contract.get("version", DEFAULT_VERSION)
+        refs = [f"{net}/{arg[1:]}/address" for arg in contract.get("args", [])
+                if isinstance(arg, str) and arg.startswith("$")]
+
+        def deploy(r, name=name, artifact=artifact, args=contract.get("args", [])):
+            inputs = [r[f"{net}/{arg[1:]}/address"]
+                      if isinstance(arg, str) and arg.startswith("$") else arg for arg in args]
+            return node.deploy(name, artifact, inputs)
+
+        # A contract with an API is checked through the API's location;
+        # other addresses rely on the manifest's node identity check
+        graph.add(f"{net}/{name}/address", deploy, *refs,
+                  fingerprint=artifact_hash(artifact), manifest=manifest,
+                  verify=(lambda address, api=api_name(contract):
+                          node.api_matches(api, address=address)) if api_name(contract) else None)
+        if not api_name(contract) and not contract.get("events"):
+            continue
+        graph.add(f"{net}/{name}/interface",
+                  lambda r, name=name, version=version, abi=artifact["abi"]:
+                  node.ensure_interface(name, version, abi),
+                  fingerprint=version + artifact_hash(artifact), manifest=manifest,
+                  verify=lambda interface_id: node.exists(f"/contracts/interfaces/{interface_id}"))
+
+        if api_name(contract):
+            graph.add(f"{net}/{name}/api",
+                      lambda r, api=api_name(contract), name=name:
+                      node.ensure_api(api, r[f"{net}/{name}/interface"],
+                                      r[f"{net}/{name}/address"]),
+                      f"{net}/{name}/interface", f"{net}/{name}/address",
+                      fingerprint=f"api:{api_name(contract)}", manifest=manifest,
+                      verify=lambda api_id, api=api_name(contract):
+                      node.api_matches(api, api_id=api_id))
+
+        for event in contract.get("events", []):
+            event_name, topic = event["name"], event["topic"]
+            graph.add(f"{net}/{event_name}/listener",
+                      lambda r, name=name, event_name=event_name, topic=topic:
+                      node.create_listener(r[f"{net}/{name}/interface"],
+                                           r[f"{net}/{name}/address"], event_name, topic),
+                      f"{net}/{name}/interface", f"{net}/{name}/address",
+                      fingerprint=f"listener:{event_name}:{topic}", manifest=manifest,
+                      verify=lambda listener_id: node.exists(f"/contracts/listeners/{listener_id}"))
+            graph.add(f"{net}/{event_name}/subscription",
+                      lambda r, event_name=event_name:
+                      node.create_subscription(r[f"{net}/{event_name}/listener"], event_name),
+                      f"{net}/{event_name}/listener",
+                      fingerprint=f"subscription:{event_name}", manifest=manifest,
+                      verify=lambda subscription_id:
+                      node.exists(f"/subscriptions/{subscription_id}"))
+
+
+def add_register_steps(graph: DeployGraph, spec: Dict[str, Any], network: Dict[str, Any],
+                       node: FireFlyNode, manifests: Dict[str, Optional[DeployManifest]]) -> None:
+    """
+    Cross-registration through one network's Register API: every network
+    of the spec, then every invocation
+
+    Steps are "<network id>/registerNetwork/<id>" and
+    "<network id>/registerInvocation/<id>". They depend on the Register
+    API and the invocation targets, which are read from the manifest when
+    this run does not provision them.
+    """
+    net, manifest = network["id"], manifests[network["id"]]
+    register = spec["register_contract"]
+    register_api = api_name(next(contract for contract in network["contracts"]
+                                 if contract["name"] == register))
+    register_deps = [f"{net}/{register}/api", f"{net}/{register}/address"]
+    for step in register_deps:
+        add_recorded_step(graph, step, manifests)
+
+    for peer in spec["networks"]:
+        peer_input = {"id": peer["id"], "name": peer["name"], "url": peer["public_url"]}
+        graph.add(f"{net}/registerNetwork/{peer['id']}",
+                  lambda r, peer_input=peer_input:
+                  node.invoke(register_api, "registerNetwork", peer_input),
+                  *register_deps,
+                  fingerprint=json.dumps(peer_input, sort_keys=True), manifest=manifest,
+                  verify=lambda operation_id: node.exists(f"/operations/{operation_id}"))
+
+    for invocation in spec.get("invocations", []):
+        deps = register_deps + [f"{net}/registerNetwork/{invocation['network']}"]
+        target = f"{invocation['network']}/{invocation.get('contract')}/address"
+        if "address" not in invocation:
+            add_recorded_step(graph, target, manifests)
+            deps.append(target)
+        graph.add(f"{net}/registerInvocation/{invocation['id']}",
+                  lambda r, invocation=invocation, target=target:
+                  node.invoke(register_api, "registerInvocation", {
+                      "contractAddress": invocation.get("address") or r[target],
+                      "functionSignature": invocation["function"],
+                      "id": invocation["id"],
+                      "networkId": invocation["network"],
+                  }),
+                  *deps,
+                  fingerprint=json.dumps(invocation, sort_keys=True), manifest=manifest,
+                  verify=lambda operation_id: node.exists(f"/operations/{operation_id}"))
+
+
+def add_recorded_step(graph: DeployGraph, step: str,
+                      manifests: Dict[str, Optional[DeployManifest]]) -> None:
+    """
+    Stand in for a provisioning step this run does not include, with the
+    result an earlier run recorded (so dependent step keys stay the same)
+    """
+    if step in graph:
+        return
+
+    async def recorded(r) -> Any:
+        manifest = manifests.get(step.split("/")[0])
+        result = manifest.result(step) if manifest is not None else None
+        if result is None:
+            raise ValueError(f"{step} is not provisioned in this run or recorded in the "
+                             f"manifest; provision its network first")
+        return result
+
+    graph.add(step, recorded)
+
+
+def print_topology_summary(networks: List[Dict[str, Any]], results: Dict[str, Any],
+                           provision: bool) -> None:
+    print("\n\n" + "="*80)
+    print(f"✅ TOPOLOGY {'DEPLOYED' if provision else 'REGISTERED'} ({len(networks)} networks)")
+    print("="*80)
+    for network in networks:
+        net = network["id"]
+        print(f"\n  Network {net} ({network['name']}, {network['url']}):")
+        if provision:
+            for contract in network["contracts"]:
+                name = contract["name"]
+                api = f", API {api_name(contract)}" if api_name(contract) else ""
+                print(f"    • {name}: {results.get(f'{net}/{name}/address')}{api}")
+        registered = sum(1 for step in results if step.startswith(f"{net}/register"))
+        if registered:
+            print(f"    • Register calls: {registered}")
+
+
+# ============================================================================
+# Main Execution Flow
+# ============================================================================
+
+
+def parse_args(description: str = "Deploy and cross-register a multi-network topology "
+                                  "concurrently") -> argparse.Namespace:
+    """Command-line options shared by every topology entry point"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("spec", nargs="?", default=DEFAULT_SPEC_PATH,
+                        help="topology spec (JSON)")
+    parser.add_argument("--networks", default=None,
+                        help="comma-separated network ids to act on (default: every network "
+                             "the entry point covers)")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST_PATH,
+                        help="deployment manifest; unchanged steps recorded there are "
+                             "skipped (empty to disable)")
+    parser.add_argument("--redeploy", action="store_true",
+                        help="ignore the manifest's recorded results and run every step")
+    parser.add_argument("--confirm", action="store_true",
+                        help="block every deploy request until its block is mined instead of "
+                             "polling operations together")
+    return parser.parse_args()
+
+
+async def main(options: argparse.Namespace, role: Optional[str] = None,
+               provision: bool = True, register: bool = True) -> Dict[str, Any]:
+    """
+    Provision and/or cross-register the networks of a topology spec
+
+    Args:
+        options: Parsed command-line options (see parse_args)
+        role: Only networks with this role, unless --networks names them
+        provision: Deploy contracts and definitions
+        register: Register every network and invocation on each network
+
+    Returns:
+        Result of every step, by name
+    """
+    spec = load_topology(options.spec)
+    namespace = spec.get("namespace", "default")
+    selected = set(options.networks.split(",")) if options.networks else None
+    networks = [network for network in spec["networks"]
+                if (network["id"] in selected if selected is not None
+                    else role is None or network["role"] == role)]
+    if not networks:
+        raise ValueError(f"No network in {options.spec} matches "
+                         f"{options.networks or f'role {role}'}")
+
+    nodes = {network["id"]: FireFlyNode(network["name"], network["url"],
+                                        network.get("namespace", namespace), options.confirm)
+             for network in networks}
+    # Node identities let the manifest drop records of a reset stack
+    identities = dict(zip(nodes, await asyncio.gather(*(node.identity()
+                                                         for node in nodes.values()))))
+    manifests = {network["id"]: DeployManifest(network["url"], network.get("namespace", namespace),
+                                               options.manifest, options.redeploy,
+                                               identities.get(network["id"]))
+                 if options.manifest else None
+                 for network in spec["networks"]}
+
+    action = " and ".join(word for word, enabled in (("Deploying", provision),
+                                                     ("registering", register)) if enabled)
+    print(f"\n🚀 {action.capitalize()} {len(networks)} network(s): " +
+          ", ".join(f"{network['id']} ({network['name']})" for network in networks))
+    graph = DeployGraph()
+    try:
+        if provision:
+            for network in networks:
+                add_provision_steps(graph, network, nodes[network["id"]],
+                                    manifests[network["id"]])
+        if register:
+            for network in networks:
+                add_register_steps(graph, spec, network, nodes[network["id"]], manifests)
+        results = await graph.run()
+        print_topology_summary(networks, results, provision)
+        return results
+    except DeployGraphError as e:
+        print(f"\n❌ Execution failed: {e}")
+        raise
+    finally:
+        graph.print_timings()
+        for node in nodes.values():
+            await node.close()
+        await http_client.close_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,69 @@
+"""
+Compact per-transaction records for long benchmark runs
+
+A record is a __slots__ object with a small-int status, so a transaction
+costs a few hundred bytes however long the run is: no per-record dict,
+no copy of the raw args bytes, and the blockchain event payload only for
+the sampled transactions that keep one (event_data).
+"""
+
+from typing import Any, Optional
+
+# Status codes
+PENDING = 0
+COMPLETED = 1
+FAILED = 2
+TIMEOUT = 3
+
+STATUS_NAMES = ("pending", "completed", "failed", "timeout")
+
+
+class TxRecord:
+    """
+    One benchmark transaction
+
+    Timestamps are epoch seconds and stay None until the phase is reached;
+    see benchmark.LATENCY_PHASES for which pairs make up each phase.
+
+    Args:
+        args_hex: Hex args sent with doCross (the value the event must carry)
+        payload_bytes: Size of the raw args
+        start_time: When the transaction was registered
+        intended_time: When the load generator scheduled the send
+        completion: Future resolved with the terminal status name, for
+            callers that wait on the transaction (closed-loop slots)
+    """
+
+    __slots__ = ("args_hex", "payload_bytes", "status", "intended_time", "start_time",
+                 "http_send_time", "http_ack_time", "event_created_time", "end_time",
+                 "elapsed_time", "operation_id", "block_number", "tx_hash",
+                 "late_event_time", "reconciled", "completion", "event_data")
+
+    def __init__(self, args_hex: str, payload_bytes: int, start_time: float,
+                 intended_time: Optional[float] = None, completion: Any = None) -> None:
+        self.args_hex = args_hex
+        self.payload_bytes = payload_bytes
+        self.status = PENDING
+        self.intended_time = intended_time if intended_time is not None else start_time
+        self.start_time = start_time
+        self.http_send_time: Optional[float] = None
+        self.http_ack_time: Optional[float] = None
+        self.event_created_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.elapsed_time: Optional[float] = None
+        self.operation_id: Optional[str] = None
+        self.block_number: Optional[str] = None
+        self.tx_hash: Optional[str] = None
+        self.late_event_time: Optional[float] = None
+        self.reconciled: Optional[str] = None
+        self.completion = completion
+        self.event_data: Optional[dict] = None
+
+    @property
+    def status_name(self) -> str:
+        return STATUS_NAMES[self.status]
+
+    def mark_end(self, end_time: float) -> None:
+        """Set end_time and elapsed_time for a transaction that just finished"""
+        self.end_time = end_time
+        self.elapsed_time = end_time - self.start_time